@@ -5,13 +5,26 @@
 Script de Análise de Performance - Google Ads (Versão Corrigida)
 Lê 'googleads_dataset.csv', ignora 2 linhas.
 Salva 5 abas (YoY, Completo, 2023, 2024, 2025) em 'google_dashboard.xlsx'.
+
+Engines:
+    --engine pandas (padrão)
+    --engine polars  -> LazyFrame com leitura multi-thread (ver engine_polars.py)
+    --dry-run        -> só lê o cabeçalho e mostra as colunas detectadas
 """
 
-import pandas as pd
+from __future__ import annotations
+
 import sys
 from pathlib import Path
 import re
-import numpy as np
+
+import cabecalhos
+import datas
+from importacao_tardia import importar_tardio
+
+# pandas/numpy só são carregados no primeiro uso (inspect/--dry-run não usam)
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
 
 # --- Constantes ---
 try:
@@ -28,6 +41,19 @@ SKIP_ROWS = 2 # Ignora as 2 primeiras linhas (título, período)
 # --- Caminhos de Saída ---
 OUT_EXCEL_FILE = OUTPUT_DIR / "google_dashboard.xlsx"
 
+# --- Mapeamento de Colunas ---
+COL_MAPPING = {
+    'Campanha': 'Nome_Campanha',
+    'Tipo de campanha': 'Tipo_Campanha',
+    'Dia': 'Data',
+    'Custo': 'Investimento',
+    'Conversões': 'Conversoes',
+    'Converses': 'Conversoes',
+    'Conversoes': 'Conversoes',
+    'Custo / conv.': 'CPL'
+}
+COLUNAS_OBRIGATORIAS = ['Data', 'Investimento', 'Conversoes', 'Tipo_Campanha']
+
 # --- Função Utilitária para Números ---
 def parse_number(x):
     """Converte valores monetários brasileiros para float"""
@@ -37,7 +63,7 @@ def parse_number(x):
         return float(x)
     s = str(x).strip()
     s = s.replace(" ", "").replace('"', '')
-    
+
     if "." in s and "," in s:
         s = s.replace(".", "").replace(",", ".")
     else:
@@ -47,194 +73,275 @@ def parse_number(x):
     except:
         return 0.0
 
-print("="*80)
-print("📊 PROCESSAMENTO DE DADOS - GOOGLE ADS (Versão Corrigida)")
-print("="*80)
+def normalizar_nome_coluna(c):
+    """Normaliza um nome de coluna (espaços, aspas, caracteres não-ASCII, \\r e \\n literais)."""
+    c = str(c).strip().strip('"')
+    # Remove caracteres não-ASCII
+    c = re.sub(r'[^\x00-\x7F]+', '', c)
+    return c.replace('\\r', '').replace('\\n', '')
 
 # --- 1. Carregar Dados ---
-print(f"\n📂 Carregando dados de: {FILE_PATH}")
-try:
-    # Lendo o CSV com separador ','
-    df = pd.read_csv(FILE_PATH, skiprows=SKIP_ROWS, encoding='utf-8', sep=',')
-    
-    if df.empty:
-        raise ValueError("O DataFrame está vazio após o carregamento.")
-    
-    print(f"✅ {len(df)} linhas brutas carregadas")
-
-except FileNotFoundError:
-    print(f"❌ ERRO: Arquivo não encontrado em: {FILE_PATH.resolve()}")
-    print("   Verifique se o caminho e o nome do arquivo estão corretos.")
-    sys.exit(1)
-except Exception as e:
-    print(f"❌ ERRO ao carregar o arquivo: {e}")
-    sys.exit(1)
+def carregar_dados(path: Path = FILE_PATH) -> pd.DataFrame:
+    print(f"\n📂 Carregando dados de: {path}")
+    try:
+        # Lendo o CSV com separador ','
+        df = pd.read_csv(path, skiprows=SKIP_ROWS, encoding='utf-8', sep=',')
 
-# --- 2. Normalizar Colunas ---
-print("\n🔧 Normalizando colunas...")
-df.columns = df.columns.map(lambda c: str(c).strip() if not pd.isna(c) else c)
-df.columns = df.columns.str.strip('"')
-# Remove caracteres não-ASCII
-df.columns = [re.sub(r'[^\x00-\x7F]+', '', col) for col in df.columns]
-df.columns = df.columns.str.replace('\\r', '', regex=False).str.replace('\\n', '', regex=False)
+        if df.empty:
+            raise ValueError("O DataFrame está vazio após o carregamento.")
 
-print("\n📋 Colunas detectadas (normalizadas):")
-print(list(df.columns))
+        print(f"✅ {len(df)} linhas brutas carregadas")
+        return df
+
+    except FileNotFoundError:
+        print(f"❌ ERRO: Arquivo não encontrado em: {path.resolve()}")
+        print("   Verifique se o caminho e o nome do arquivo estão corretos.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ ERRO ao carregar o arquivo: {e}")
+        sys.exit(1)
+
+# --- 2. Normalizar Colunas ---
+def normalizar_colunas(df: pd.DataFrame) -> pd.DataFrame:
+    print("\n🔧 Normalizando colunas...")
+    df.columns = df.columns.map(lambda c: str(c).strip() if not pd.isna(c) else c)
+    df.columns = df.columns.str.strip('"')
+    # Remove caracteres não-ASCII
+    df.columns = [re.sub(r'[^\x00-\x7F]+', '', col) for col in df.columns]
+    df.columns = df.columns.str.replace('\\r', '', regex=False).str.replace('\\n', '', regex=False)
+
+    print("\n📋 Colunas detectadas (normalizadas):")
+    print(list(df.columns))
+    return df
 
 # --- 3. Mapear Colunas ---
-print("\n🔧 Mapeando colunas do Google Ads...")
+def mapear_colunas(df: pd.DataFrame, path: Path = FILE_PATH) -> pd.DataFrame:
+    print("\n🔧 Mapeando colunas do Google Ads...")
 
-col_mapping = {
-    'Campanha': 'Nome_Campanha',
-    'Tipo de campanha': 'Tipo_Campanha',
-    'Dia': 'Data',
-    'Custo': 'Investimento',
-    'Conversões': 'Conversoes',
-    'Converses': 'Conversoes',
-    'Conversoes': 'Conversoes',
-    'Custo / conv.': 'CPL'
-}
+    # Aplicar o renomeio
+    for col_original, col_nova in COL_MAPPING.items():
+        if col_original in df.columns:
+            df.rename(columns={col_original: col_nova}, inplace=True)
 
-# Aplicar o renomeio
-for col_original, col_nova in col_mapping.items():
-    if col_original in df.columns:
-        df.rename(columns={col_original: col_nova}, inplace=True)
+    validar_colunas(df.columns, path)
+    return df
 
 # --- 4. Validar Colunas ---
-colunas_obrigatorias = ['Data', 'Investimento', 'Conversoes', 'Tipo_Campanha']
-colunas_faltantes = [col for col in colunas_obrigatorias if col not in df.columns]
-
-if colunas_faltantes:
-    print(f"\n❌ ERRO: Colunas obrigatórias não encontradas: {colunas_faltantes}")
-    print(f"   Verifique se o arquivo '{FILE_PATH.name}' tem as colunas corretas.")
-    sys.exit(1)
-else:
-    print("   ✅ Colunas essenciais (Data, Investimento, Conversoes, Tipo_Campanha) encontradas.")
-
-# --- 5. Processar Data ---
-print(f"\n🔧 Processando coluna de data...")
-df['Data_Datetime'] = pd.to_datetime(df['Data'], errors='coerce')
-num_na_dates = df['Data_Datetime'].isna().sum()
-if num_na_dates > 0:
-    print(f"⚠️ {num_na_dates} linhas com data inválida serão removidas.")
-    df = df.dropna(subset=['Data_Datetime'])
-
-if df.empty:
-    print("❌ ERRO: Nenhuma linha válida após conversão de data.")
-    sys.exit(1)
-
-print(f"✅ {len(df)} linhas válidas")
-
-# --- 6. Processar Valores Numéricos ---
-print(f"\n🔧 Processando valores numéricos...")
-df['Investimento_Google'] = df['Investimento'].apply(parse_number)
-df['Leads_Google'] = df['Conversoes'].apply(parse_number)
-
-# --- 7. Adicionar Colunas de Tempo ---
-print(f"\n🔧 Adicionando colunas de tempo...")
-df['Ano'] = df['Data_Datetime'].dt.year
-df['Mes'] = df['Data_Datetime'].dt.month
-df['Mes_Ano'] = df['Data_Datetime'].dt.to_period('M')
-
-# --- 8. Adicionar Coluna de Atribuição HubSpot ---
-print(f"\n🔧 Adicionando coluna 'Tipo_campanha_HUBSPOT' = 'Pesquisa Paga'")
-df['Tipo_campanha_HUBSPOT'] = 'Pesquisa Paga'
-
-print("\n✅ Processamento básico concluído com sucesso!")
-
-# =====================================================================
-# --- 9. GERAR RELATÓRIOS ---
-# =====================================================================
-print("\nGerando relatórios...")
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+def validar_colunas(colunas, path: Path = FILE_PATH):
+    colunas_faltantes = [col for col in COLUNAS_OBRIGATORIAS if col not in colunas]
 
-# --- Relatório 1: Google_YoY (Agregado por Dia) ---
-print(f"  Processando dados para a aba 'Google_YoY'...")
-df_daily_agg = df.groupby('Data_Datetime').agg(
-    Investimento_Google=('Investimento_Google', 'sum'),
-    Leads_Google=('Leads_Google', 'sum')
-).reset_index()
+    if colunas_faltantes:
+        print(f"\n❌ ERRO: Colunas obrigatórias não encontradas: {colunas_faltantes}")
+        print(f"   Verifique se o arquivo '{path.name}' tem as colunas corretas.")
+        sys.exit(1)
+    else:
+        print("   ✅ Colunas essenciais (Data, Investimento, Conversoes, Tipo_Campanha) encontradas.")
+
+def inspecionar(path: Path = FILE_PATH, n_linhas: int = cabecalhos.AMOSTRA_LINHAS) -> list:
+    """Lê só o cabeçalho e as primeiras linhas do export e resolve as colunas (sem pandas)."""
+    def detectar(colunas, linhas):
+        # Mais de uma coluna mapeada para o mesmo nome vira coluna duplicada no pandas
+        campos = COLUNAS_OBRIGATORIAS + ['Nome_Campanha']
+        return {campo: [c for c in colunas if COL_MAPPING.get(c, c) == campo] for campo in campos}
+
+    return [cabecalhos.inspecionar_arquivo(
+        'google', path, detectar, COLUNAS_OBRIGATORIAS, normalizar=normalizar_nome_coluna,
+        n_linhas=n_linhas, skip_rows=SKIP_ROWS, sep=','
+    )]
+
+def processar_google(df: pd.DataFrame) -> pd.DataFrame:
+    # --- 5. Processar Data ---
+    print(f"\n🔧 Processando coluna de data...")
+    df['Data_Datetime'] = datas.converter_datas(df['Data'], 'google_dia')
+    num_na_dates = df['Data_Datetime'].isna().sum()
+    if num_na_dates > 0:
+        print(f"⚠️ {num_na_dates} linhas com data inválida serão removidas.")
+        df = df.dropna(subset=['Data_Datetime'])
 
-df_daily_agg = df_daily_agg.rename(columns={'Data_Datetime': 'Data'})
-# Manter linhas com investimento OU leads para não perder dados
-df_daily_agg = df_daily_agg[(df_daily_agg['Investimento_Google'] > 0) | (df_daily_agg['Leads_Google'] > 0)].sort_values(by='Data')
+    if df.empty:
+        print("❌ ERRO: Nenhuma linha válida após conversão de data.")
+        sys.exit(1)
 
-# Adicionando o cálculo de CPL
-df_daily_agg['CPL_Google'] = df_daily_agg['Investimento_Google'] / df_daily_agg['Leads_Google']
-df_daily_agg['CPL_Google'] = df_daily_agg['CPL_Google'].fillna(0).replace([np.inf, -np.inf], 0)
+    print(f"✅ {len(df)} linhas válidas")
 
+    # --- 6. Processar Valores Numéricos ---
+    print(f"\n🔧 Processando valores numéricos...")
+    df['Investimento_Google'] = df['Investimento'].apply(parse_number)
+    df['Leads_Google'] = df['Conversoes'].apply(parse_number)
 
-# --- Relatório 2: Abas por Ano (2023, 2024, 2025) ---
-print("  Processando dados para as abas por ano...")
-df_2023 = df[df['Ano'] == 2023]
-df_2024 = df[df['Ano'] == 2024]
-df_2025 = df[df['Ano'] == 2025]
+    # --- 7. Adicionar Colunas de Tempo ---
+    print(f"\n🔧 Adicionando colunas de tempo...")
+    df['Ano'] = df['Data_Datetime'].dt.year
+    df['Mes'] = df['Data_Datetime'].dt.month
+    df['Mes_Ano'] = df['Data_Datetime'].dt.to_period('M')
 
-# Salvar tudo em um único arquivo Excel com abas
-print(f"\n💾 Salvando arquivo Excel único em: {OUT_EXCEL_FILE}")
-try:
-    with pd.ExcelWriter(OUT_EXCEL_FILE, engine='openpyxl') as writer:
-        # Aba 1: Google_YoY
-        df_daily_agg.to_excel(writer, sheet_name='Google_YoY', index=False, float_format='%.2f')
-        print("  ✅ Aba 'Google_YoY' salva.")
-        
-        # Aba 2: Google_Completo (O dataframe 'df' original processado)
-        df.to_excel(writer, sheet_name='Google_Completo', index=False)
-        print("  ✅ Aba 'Google_Completo' (com Tipo_campanha_HUBSPOT) salva.")
-
-        # Abas por Ano
-        if not df_2023.empty:
-            df_2023.to_excel(writer, sheet_name='Google_2023', index=False)
-            print("  ✅ Aba 'Google_2023' salva.")
-        if not df_2024.empty:
-            df_2024.to_excel(writer, sheet_name='Google_2024', index=False)
-            print("  ✅ Aba 'Google_2024' salva.")
-        if not df_2025.empty:
-            df_2025.to_excel(writer, sheet_name='Google_2025', index=False)
-            print("  ✅ Aba 'Google_2025' salva.")
-    
-    print(f"\n✅ Arquivo Excel '{OUT_EXCEL_FILE.name}' gerado com sucesso na pasta '{OUTPUT_DIR}'!")
-
-except ImportError:
-    print("\n\n❌ ERRO: A BIBLIOTECA 'openpyxl' NÃO ESTÁ INSTALADA.")
-    print("Para salvar em Excel, por favor, rode o comando no seu terminal:")
-    print("pip install openpyxl")
-    sys.exit(1)
-except Exception as e:
-    print(f"\n\n❌ ERRO AO SALVAR O EXCEL: {e}")
-    print("Verifique se o arquivo não está aberto em outro programa.")
-    sys.exit(1)
-
-
-# =====================================================================
-# --- 10. CONFIRMAÇÃO DE DADOS ---
-# =====================================================================
-print("\n--- Confirmação de Investimento Google (2025) ---")
+    # --- 8. Adicionar Coluna de Atribuição HubSpot ---
+    print(f"\n🔧 Adicionando coluna 'Tipo_campanha_HUBSPOT' = 'Pesquisa Paga'")
+    df['Tipo_campanha_HUBSPOT'] = 'Pesquisa Paga'
 
-try:
-    df_daily_agg['Data'] = pd.to_datetime(df_daily_agg['Data'])
-    
-    # Calcular Setembro 2025
-    invest_set_2025 = df_daily_agg[
-        (df_daily_agg['Data'].dt.year == 2025) &
-        (df_daily_agg['Data'].dt.month == 9)
-    ]['Investimento_Google'].sum()
-    
-    # Calcular Outubro 2025
-    invest_out_2025 = df_daily_agg[
-        (df_daily_agg['Data'].dt.year == 2025) &
-        (df_daily_agg['Data'].dt.month == 10)
-    ]['Investimento_Google'].sum()
-    
-    # Formatar como moeda brasileira
-    print(f"  ✅ Investimento Total em Setembro/2025: R$ {invest_set_2025:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-    print(f"  ✅ Investimento Total em Outubro/2025:   R$ {invest_out_2025:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-
-except Exception as e_conf:
-    print(f"  ⚠️ Não foi possível calcular a confirmação de investimento: {e_conf}")
-
-print("\n--- Amostra do Relatório YoY (Aba 'Google_YoY') ---")
-print(df_daily_agg.head())
+    print("\n✅ Processamento básico concluído com sucesso!")
+    return df
+
+# --- Relatório 1: Google_YoY (Agregado por Dia) ---
+def agregar_diario(df: pd.DataFrame) -> pd.DataFrame:
+    print(f"  Processando dados para a aba 'Google_YoY'...")
+    df_daily_agg = df.groupby('Data_Datetime').agg(
+        Investimento_Google=('Investimento_Google', 'sum'),
+        Leads_Google=('Leads_Google', 'sum')
+    ).reset_index()
+
+    return finalizar_diario(df_daily_agg)
+
+def finalizar_diario(df_daily_agg: pd.DataFrame) -> pd.DataFrame:
+    df_daily_agg = df_daily_agg.rename(columns={'Data_Datetime': 'Data'})
+    # Manter linhas com investimento OU leads para não perder dados
+    df_daily_agg = df_daily_agg[(df_daily_agg['Investimento_Google'] > 0) | (df_daily_agg['Leads_Google'] > 0)].sort_values(by='Data')
+
+    # Adicionando o cálculo de CPL
+    df_daily_agg['CPL_Google'] = df_daily_agg['Investimento_Google'] / df_daily_agg['Leads_Google']
+    df_daily_agg['CPL_Google'] = df_daily_agg['CPL_Google'].fillna(0).replace([np.inf, -np.inf], 0)
+    return df_daily_agg
+
+def processar(path: Path = FILE_PATH, engine: str = "pandas") -> tuple:
+    """
+    Executa as etapas 1 a 8 e a agregação diária com o engine escolhido.
+    Retorna (df, df_daily_agg) em pandas, iguais para qualquer engine.
+    """
+    if engine == "polars":
+        import engine_polars
+        return engine_polars.processar_google(path)
+
+    df = carregar_dados(path)
+    df = normalizar_colunas(df)
+    df = mapear_colunas(df, path)
+    df = processar_google(df)
+    return df, agregar_diario(df)
+
+def salvar_excel(df: pd.DataFrame, df_daily_agg: pd.DataFrame):
+    # --- Relatório 2: Abas por Ano (2023, 2024, 2025) ---
+    print("  Processando dados para as abas por ano...")
+    df_2023 = df[df['Ano'] == 2023]
+    df_2024 = df[df['Ano'] == 2024]
+    df_2025 = df[df['Ano'] == 2025]
+
+    # Salvar tudo em um único arquivo Excel com abas
+    print(f"\n💾 Salvando arquivo Excel único em: {OUT_EXCEL_FILE}")
+    try:
+        with pd.ExcelWriter(OUT_EXCEL_FILE, engine='openpyxl') as writer:
+            # Aba 1: Google_YoY
+            df_daily_agg.to_excel(writer, sheet_name='Google_YoY', index=False, float_format='%.2f')
+            print("  ✅ Aba 'Google_YoY' salva.")
+
+            # Aba 2: Google_Completo (O dataframe 'df' original processado)
+            df.to_excel(writer, sheet_name='Google_Completo', index=False)
+            print("  ✅ Aba 'Google_Completo' (com Tipo_campanha_HUBSPOT) salva.")
+
+            # Abas por Ano
+            if not df_2023.empty:
+                df_2023.to_excel(writer, sheet_name='Google_2023', index=False)
+                print("  ✅ Aba 'Google_2023' salva.")
+            if not df_2024.empty:
+                df_2024.to_excel(writer, sheet_name='Google_2024', index=False)
+                print("  ✅ Aba 'Google_2024' salva.")
+            if not df_2025.empty:
+                df_2025.to_excel(writer, sheet_name='Google_2025', index=False)
+                print("  ✅ Aba 'Google_2025' salva.")
+
+        print(f"\n✅ Arquivo Excel '{OUT_EXCEL_FILE.name}' gerado com sucesso na pasta '{OUTPUT_DIR}'!")
+
+    except ImportError:
+        print("\n\n❌ ERRO: A BIBLIOTECA 'openpyxl' NÃO ESTÁ INSTALADA.")
+        print("Para salvar em Excel, por favor, rode o comando no seu terminal:")
+        print("pip install openpyxl")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\n❌ ERRO AO SALVAR O EXCEL: {e}")
+        print("Verifique se o arquivo não está aberto em outro programa.")
+        sys.exit(1)
+
+def confirmar_investimento(df_daily_agg: pd.DataFrame):
+    print("\n--- Confirmação de Investimento Google (2025) ---")
+
+    try:
+        df_daily_agg['Data'] = pd.to_datetime(df_daily_agg['Data'])
+
+        # Calcular Setembro 2025
+        invest_set_2025 = df_daily_agg[
+            (df_daily_agg['Data'].dt.year == 2025) &
+            (df_daily_agg['Data'].dt.month == 9)
+        ]['Investimento_Google'].sum()
+
+        # Calcular Outubro 2025
+        invest_out_2025 = df_daily_agg[
+            (df_daily_agg['Data'].dt.year == 2025) &
+            (df_daily_agg['Data'].dt.month == 10)
+        ]['Investimento_Google'].sum()
+
+        # Formatar como moeda brasileira
+        print(f"  ✅ Investimento Total em Setembro/2025: R$ {invest_set_2025:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+        print(f"  ✅ Investimento Total em Outubro/2025:   R$ {invest_out_2025:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+
+    except Exception as e_conf:
+        print(f"  ⚠️ Não foi possível calcular a confirmação de investimento: {e_conf}")
+
+def config_cache() -> dict:
+    """Configuração que define o resultado do processamento (entra na chave do cache)."""
+    return {'skip_rows': SKIP_ROWS, 'col_mapping': COL_MAPPING, 'obrigatorias': COLUNAS_OBRIGATORIAS}
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Processamento de dados do Google Ads.")
+    parser.add_argument(
+        "--engine", choices=["pandas", "polars"], default="pandas",
+        help="Engine usado na leitura e limpeza do export. Padrão: pandas."
+    )
+    parser.add_argument(
+        "--sem-cache", dest="cache", action="store_false",
+        help="Ignora o cache de etapas e reprocessa o export do zero."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Só lê o cabeçalho e mostra as colunas detectadas (não processa nada)."
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.dry_run:
+        sys.exit(cabecalhos.imprimir_inspecoes(inspecionar(FILE_PATH)))
+
+    print("="*80)
+    print("📊 PROCESSAMENTO DE DADOS - GOOGLE ADS (Versão Corrigida)")
+    print("="*80)
+
+    # Export inválido falha aqui, antes da leitura completa
+    cabecalhos.preflight(lambda: inspecionar(FILE_PATH))
+
+    import cache_etapas
+    df, df_daily_agg = cache_etapas.executar_em_cache(
+        'google', [FILE_PATH] + cache_etapas.arquivos_codigo(Path(__file__)), dict(config_cache(), engine=args.engine),
+        lambda: processar(FILE_PATH, engine=args.engine), usar_cache=args.cache
+    )
+
+    # =====================================================================
+    # --- 9. GERAR RELATÓRIOS ---
+    # =====================================================================
+    print("\nGerando relatórios...")
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    salvar_excel(df, df_daily_agg)
+
+    # Cópia em Arrow para o blend do HubSpot abrir com memory map (ver troca_arrow.py)
+    import troca_arrow
+    troca_arrow.salvar(df, OUT_EXCEL_FILE, 'Google_Completo')
+
+    # =====================================================================
+    # --- 10. CONFIRMAÇÃO DE DADOS ---
+    # =====================================================================
+    confirmar_investimento(df_daily_agg)
+
+    print("\n--- Amostra do Relatório YoY (Aba 'Google_YoY') ---")
+    print(df_daily_agg.head())
 
 if __name__ == "__main__":
-    pass
\ No newline at end of file
+    main()
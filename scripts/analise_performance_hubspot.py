@@ -17,18 +17,21 @@ analise_performance_hubspot_CORRIGIDO_FIX.py
       Campanha/Termo (e Investimento) nas bases Meta/Google.
 """
 
-import pandas as pd
-import numpy as np
-import unicodedata
+from __future__ import annotations
+
 import re
 import sys
-import hashlib
+import time
 from pathlib import Path
-from datetime import datetime
 
-print("="*80)
-print("🚀 Iniciando Script de BLEND - VERSÃO CORRIGIDA FINAL")
-print("="*80)
+import cabecalhos
+import datas
+import mapeamento
+from importacao_tardia import importar_tardio
+
+# pandas/numpy só são carregados no primeiro uso (inspect/--dry-run não usam)
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
 
 # --- 1. CONFIGURAÇÕES ---
 
@@ -43,8 +46,6 @@ DATA_DIR_HUBSPOT = BASE_DIR / "data"
 DATA_DIR_INVESTIMENTO = BASE_DIR / "outputs" 
 OUTPUT_DIR = BASE_DIR / "output" 
 
-OUTPUT_DIR.mkdir(exist_ok=True)
-
 # Arquivos de entrada
 HUBSPOT_FILE = DATA_DIR_HUBSPOT / "hubspot_dataset.csv" 
 META_REPORT_FILE = DATA_DIR_INVESTIMENTO / "meta_dataset_dashboard.xlsx"
@@ -62,43 +63,32 @@ META_ACCOUNT_OTHER_LABEL = "Red Balloon - Contas Meta"
 GOOGLE_ACCOUNT_LABEL = "Google Ads"
 AREA_GESTAO_DEFAULT = "Gestão Antiga" 
 
-# Regras de Negócio
-CANAL_FILTRO = [
-    "social pago", 
-    "pesquisa paga",
-    "paid social",
-    "facebook",
-    "instagram",
-    "linkedin",
-    "cpc"
-]
-MATRICULA_KEYWORDS = ["MATRÍCULA CONCLUÍDA"] 
-DEFAULT_NA_TEXT = "Não Mapeado"
-
-# Mapeamento dos Nomes de Canal Finais
-CANAL_MAP_FINAL = {
-    'social pago': 'Social Pago',
-    'facebook': 'Social Pago',
-    'instagram': 'Social Pago',
-    'linkedin': 'Social Pago',
-    'paid social': 'Social Pago',
-    
-    'pesquisa paga': 'Pesquisa Paga',
-    'cpc': 'Pesquisa Paga'
-}
-
-# Mapeamento usando o STATUS ORIGINAL do HubSpot
-ETAPA_FUNIL_MAP = {
-    "NOVO NEGÓCIO": "1. Novo Negócio",
-    "NEGÓCIO EM QUALIFICAÇÃO": "2. Negócio em Qualificação",
-    "VISITA AGENDADA": "3. Visita Agendada",
-    "VISITA REALIZADA": "4. Visita Realizada",
-    "LISTA DE ESPERA": "5. Lista de Espera",
-    "NEGÓCIO EM PAUSA": "6. Negócio em Pausa",
-    "NEGÓCIO PERDIDO": "7. Negócio Perdido",
-    "MATRÍCULA CONCLUÍDA": "8. Matrícula Realizada"
-}
-MATRICULA_NOME_FINAL = "8. Matrícula Realizada"
+# Regras de Negócio: lidas de regras_negocio.toml no primeiro uso (ver regras_negocio.py,
+# carregar_regras() e usar_regras()); o import do script não lê o arquivo.
+REGRAS_FILE = Path(__file__).with_name("regras_negocio.toml")
+REGRAS = None
+# Preenchidas por usar_regras():
+#   DEFAULT_NA_TEXT           texto dos valores não mapeados
+#   CANAL_MAP_FINAL           fonte já limpa pelo clean_text -> canal final (+ CANAL_PADROES regex)
+#   CANAL_PLATAFORMA          {'meta': canal, 'google': canal} que recebe o investimento de cada relatório
+#   ETAPA_FUNIL_MAP           STATUS ORIGINAL do HubSpot -> etapa (ordem dos valores = ordem do funil; + ETAPA_PADROES)
+#   MATRICULA_NOME_FINAL      etapa que conta como matrícula
+#   ETAPAS_NEGOCIO            etapas em que o lead já conta como negócio (ordem do funil, sem as perdidas)
+#   COLUNAS_HUBSPOT, COLUNAS_META_RELATORIO, COLUNAS_GOOGLE_RELATORIO   palavras-chave do find_col
+NOMES_REGRAS = (
+    'DEFAULT_NA_TEXT', 'CANAL_MAP_FINAL', 'CANAL_PADROES', 'CANAL_PLATAFORMA', 'ETAPA_FUNIL_MAP', 'ETAPA_PADROES',
+    'MATRICULA_NOME_FINAL', 'ETAPAS_NEGOCIO', 'COLUNAS_HUBSPOT', 'COLUNAS_META_RELATORIO', 'COLUNAS_GOOGLE_RELATORIO',
+)
+
+COLUNAS_OBRIGATORIAS_HUBSPOT = ['data_criacao', 'status']
+
+# Campos que identificam o mesmo negócio em linhas repetidas do export (ver deduplicacao.py).
+# Se o export tiver o ID do negócio, ele sozinho é a identidade; sem ID nem nome, não há deduplicação.
+IDENTIDADE_HUBSPOT = ['data_criacao', 'nome_negocio', 'unidade', 'fonte', 'detalhamento_1', 'detalhamento_2']
+
+# Tabela de valores não mapeados (status, canal) gerada a cada preparação do HubSpot
+DIAGNOSTICO_MAPEAMENTO_FILE = OUTPUT_DIR / "diagnostico_mapeamento.csv"
+DUPLICADOS_HUBSPOT_FILE = OUTPUT_DIR / "duplicados_hubspot.csv"
 
 
 # --- 2. FUNÇÕES UTILITÁRIAS ---
@@ -138,21 +128,25 @@ def read_any(path: Path, sheet_name=0, skiprows=0) -> pd.DataFrame:
         print(f"    Detalhe: {e}")
         sys.exit(1)
 
+def limpar_nome_coluna(c):
+    """Normaliza um nome de coluna (minúsculas, sem acentos, espaços -> '_')."""
+    import unicodedata
+
+    c_str = str(c).strip().lower()
+    c_norm = unicodedata.normalize('NFKD', c_str)
+    c_ascii = c_norm.encode('ascii', 'ignore').decode('utf-8')
+    c_clean = re.sub(r'[^a-z0-9_ ]+', '', c_ascii)
+    return re.sub(r'\s+', '_', c_clean)
+
 def clean_cols(df):
     """Limpa e normaliza os nomes das colunas de um DataFrame."""
-    cols = []
-    for c in df.columns:
-        c_str = str(c).strip().lower()
-        c_norm = unicodedata.normalize('NFKD', c_str)
-        c_ascii = c_norm.encode('ascii', 'ignore').decode('utf-8')
-        c_clean = re.sub(r'[^a-z0-9_ ]+', '', c_ascii)
-        c_clean = re.sub(r'\s+', '_', c_clean)
-        cols.append(c_clean)
-    df.columns = cols
+    df.columns = [limpar_nome_coluna(c) for c in df.columns]
     return df
 
 def clean_text(text):
     """Limpa e normaliza uma string de dados (remove acentos, espaços, caracteres especiais)."""
+    import unicodedata
+
     try:
         text_str = str(text).strip().lower()
         text_norm = unicodedata.normalize('NFKD', text_str)
@@ -170,6 +164,7 @@ def extract_status_base(status_full):
     Extrai o status base do formato "STATUS (Pipeline)"
     Ex: "NOVO NEGÓCIO (Red Balloon - Unidades de Rua)" -> "NOVO NEGÓCIO"
     """
+    carregar_regras()
     try:
         if pd.isna(status_full):
             return DEFAULT_NA_TEXT
@@ -181,34 +176,21 @@ def extract_status_base(status_full):
         return DEFAULT_NA_TEXT
 
 def find_col(df: pd.DataFrame, keywords: list, use_clean_cols=False) -> str:
-    """Encontra a primeira coluna no DataFrame que corresponde a uma keyword."""
-    target_cols = df.columns
-    
-    # 1. Busca por correspondência exata
-    for k in keywords:
-        if k in target_cols:
-            return k
-            
-    # 2. Busca ignorando maiúsculas/minúsculas
-    cols_map = {str(c).strip().lower(): str(c) for c in target_cols}
-    for k in keywords:
-        k_low = k.strip().lower()
-        if k_low in cols_map:
-            return cols_map[k_low]
-            
-    # 3. Heurística de substring
-    for col_orig in target_cols:
-        col_low = str(col_orig).strip().lower()
-        for k in keywords:
-            if k.strip().lower() in col_low:
-                return str(col_orig)
+    """
+    Encontra a primeira coluna no DataFrame que corresponde a uma keyword.
+    Aceita também a lista de nomes de colunas (inspeção só do cabeçalho).
+    """
+    target_cols = df.columns if hasattr(df, 'columns') else df
     
-    return None
+    # 1. correspondência exata, 2. ignorando maiúsculas/minúsculas, 3. substring
+    candidatas = cabecalhos.candidatas_find_col(list(target_cols), keywords)
+    return candidatas[0] if candidatas else None
 
 def calcular_ciclo_captacao(date_series: pd.Series) -> pd.Series:
     """
     Calcula o ciclo de captação (YY.1 Alta ou YY.2 Baixa).
     """
+    carregar_regras()
     
     def get_ciclo(dt):
         if pd.isna(dt):
@@ -235,6 +217,9 @@ def calcular_ciclo_captacao(date_series: pd.Series) -> pd.Series:
 
 def generate_unique_id(df: pd.DataFrame) -> pd.DataFrame:
     """Gera IDs únicos e consistentes para cada negócio."""
+    import hashlib
+    import unicodedata
+
     print("    🔑 Gerando IDs únicos e consistentes...")
     
     # 1. Criar a chave de agrupamento
@@ -278,43 +263,74 @@ def generate_unique_id(df: pd.DataFrame) -> pd.DataFrame:
 
 # --- 3. LÓGICA PRINCIPAL ---
 
-def main():
-    
-    print("\n📥 Carregando dados do HubSpot...")
-    df_hub_raw = read_any(HUBSPOT_FILE)
-    df_hub = clean_cols(df_hub_raw)
-    print(f"    ✅ HubSpot carregado: {len(df_hub)} linhas")
+def colunas_identidade(df_hub: pd.DataFrame) -> list:
+    """
+    Colunas do export que identificam cada negócio. Sem ID nem nome do negócio, data +
+    unidade + fonte juntariam leads diferentes: retorna [] e a deduplicação é pulada.
+    """
+    carregar_regras()
+    col_id = find_col(df_hub, COLUNAS_HUBSPOT['id_negocio'])
+    if col_id:
+        return [col_id]
+    if not find_col(df_hub, COLUNAS_HUBSPOT['nome_negocio']):
+        return []
+    colunas = (find_col(df_hub, COLUNAS_HUBSPOT[campo]) for campo in IDENTIDADE_HUBSPOT)
+    return [c for c in dict.fromkeys(colunas) if c]
+
+def remover_duplicados(df_hub: pd.DataFrame, duplicados: list = None) -> pd.DataFrame:
+    """Remove negócios repetidos no export, mantendo o Status_Principal mais avançado (3.1b)."""
+    import deduplicacao
+    
+    colunas = colunas_identidade(df_hub)
+    inicio = time.perf_counter()
+    df_hub, removidas = deduplicacao.deduplicar(df_hub, colunas, list(ETAPA_FUNIL_MAP.values()))
+    if colunas:
+        print(f"    🧹 Duplicados: {len(removidas)} linhas removidas em {time.perf_counter() - inicio:.2f}s "
+              f"(identidade: {', '.join(colunas)})")
+    else:
+        print("    ⚠️  Duplicados: export sem coluna de ID nem de nome do negócio, deduplicação pulada")
+    if duplicados is not None:
+        duplicados.append((removidas, colunas))
+    return df_hub
+
+def preparar_hubspot(df_hub: pd.DataFrame, diagnostico: list = None, duplicados: list = None) -> pd.DataFrame:
+    """
+    Prepara os campos do HubSpot, mapeia canais e calcula as métricas de negócio (3.1 a 3.3).
+    Se 'diagnostico' for uma lista, recebe os valores de status/canal não mapeados.
+    Se 'duplicados' for uma lista, recebe (linhas removidas, colunas de identidade) da 3.1b.
+    """
+    carregar_regras()
     
     # --- 3.1. Preparar campos do HubSpot ---
     
     print("\n🔄 Preparando campos do HubSpot...")
     
     # Data de Criação
-    col_data = find_col(df_hub, ['data', 'data_de_criacao', 'createdate', 'create_date'])
+    col_data = find_col(df_hub, COLUNAS_HUBSPOT['data_criacao'])
     if not col_data:
         print("❌ ERRO: Coluna de data de criação não encontrada.")
         sys.exit(1)
-    df_hub['Data'] = pd.to_datetime(df_hub[col_data], errors='coerce').dt.normalize()
+    df_hub['Data'] = datas.converter_datas(df_hub[col_data], 'hubspot_data_criacao').dt.normalize()
     
     # Data de Fechamento
-    col_data_fechamento = find_col(df_hub, ['data_de_fechamento', 'closedate', 'close_date'])
+    col_data_fechamento = find_col(df_hub, COLUNAS_HUBSPOT['data_fechamento'])
     if col_data_fechamento:
-        df_hub['Data_Fechamento'] = pd.to_datetime(df_hub[col_data_fechamento], errors='coerce').dt.normalize()
+        df_hub['Data_Fechamento'] = datas.converter_datas(df_hub[col_data_fechamento], 'hubspot_data_fechamento').dt.normalize()
         print(f"    ✅ Coluna 'Data_Fechamento' criada: {df_hub['Data_Fechamento'].notna().sum()} registros com data")
     else:
         df_hub['Data_Fechamento'] = pd.NaT
         print("    ⚠️  Coluna de data de fechamento não encontrada - usando NaT")
     
     # Unidade
-    col_unidade = find_col(df_hub, ['unidade_desejada', 'unidade'])
+    col_unidade = find_col(df_hub, COLUNAS_HUBSPOT['unidade'])
     df_hub['Unidade'] = df_hub[col_unidade].fillna(DEFAULT_NA_TEXT) if col_unidade else DEFAULT_NA_TEXT
     
     # Tipo (Pipeline)
-    col_tipo = find_col(df_hub, ['pipeline', 'tipo'])
+    col_tipo = find_col(df_hub, COLUNAS_HUBSPOT['tipo'])
     df_hub['Tipo'] = df_hub[col_tipo].fillna(DEFAULT_NA_TEXT) if col_tipo else DEFAULT_NA_TEXT
     
     # Status Principal
-    col_status = find_col(df_hub, ['etapa_do_negocio', 'dealstage', 'deal_stage', 'status'])
+    col_status = find_col(df_hub, COLUNAS_HUBSPOT['status'])
     if not col_status:
         print("❌ ERRO: Coluna de status/etapa não encontrada.")
         sys.exit(1)
@@ -322,57 +338,61 @@ def main():
     # Preservar o status original antes de qualquer processamento
     df_hub['Status_Original'] = df_hub[col_status].fillna(DEFAULT_NA_TEXT)
     
-    # Extrair o status base (sem o pipeline entre parênteses)
-    df_hub['Status_Base'] = df_hub['Status_Original'].apply(extract_status_base)
+    # Extrair o status base (sem o pipeline entre parênteses) - uma vez por valor único
+    df_hub['Status_Base'] = mapeamento.aplicar_em_unicos(df_hub['Status_Original'], extract_status_base)
     
     # Mapear para o formato final usando o status base
-    df_hub['Status_Principal'] = df_hub['Status_Base'].map(ETAPA_FUNIL_MAP).fillna(DEFAULT_NA_TEXT)
+    df_hub['Status_Principal'] = mapeamento.mapear_dict(
+        df_hub['Status_Base'], ETAPA_FUNIL_MAP, DEFAULT_NA_TEXT, diagnostico=diagnostico, padroes=ETAPA_PADROES
+    )
     
     print(f"    ✅ Status mapeados:")
     print(df_hub['Status_Principal'].value_counts())
     
+    # --- 3.1b. Remover negócios duplicados (precisa do Status_Principal) ---
+    df_hub = remover_duplicados(df_hub, duplicados)
+    
     # RVO
-    col_rvo = find_col(df_hub, ['valor_na_moeda_da_empresa', 'rvo', 'amount'])
+    col_rvo = find_col(df_hub, COLUNAS_HUBSPOT['rvo'])
     df_hub['RVO'] = pd.to_numeric(df_hub[col_rvo], errors='coerce').fillna(0) if col_rvo else 0
     
     # Fonte de Tráfego
-    col_fonte = find_col(df_hub, ['fonte_original_do_trafego', 'original_source'])
+    col_fonte = find_col(df_hub, COLUNAS_HUBSPOT['fonte'])
     df_hub['Fonte_Original_do_Trafego'] = df_hub[col_fonte].fillna(DEFAULT_NA_TEXT) if col_fonte else DEFAULT_NA_TEXT
-    df_hub['Fonte_Original_do_Trafego_clean'] = df_hub['Fonte_Original_do_Trafego'].apply(clean_text)
+    df_hub['Fonte_Original_do_Trafego_clean'] = mapeamento.aplicar_em_unicos(df_hub['Fonte_Original_do_Trafego'], clean_text)
     
     # Detalhamentos
-    col_det1 = find_col(df_hub, ['detalhamento_da_fonte_original_do_trafego_1', 'detalhamento_fonte_original_1', 'hs_analytics_source_data_1'])
+    col_det1 = find_col(df_hub, COLUNAS_HUBSPOT['detalhamento_1'])
     df_hub['Detalhamento_fonte_original_1'] = df_hub[col_det1].fillna(DEFAULT_NA_TEXT) if col_det1 else DEFAULT_NA_TEXT
     # 💡 CORREÇÃO CRÍTICA: Limpeza para o merge de investimento do Meta (1)
-    df_hub['Merge_Key_Meta'] = df_hub['Detalhamento_fonte_original_1'].apply(clean_text)
+    df_hub['Merge_Key_Meta'] = mapeamento.aplicar_em_unicos(df_hub['Detalhamento_fonte_original_1'], clean_text, categorico=False)
 
-    col_det2 = find_col(df_hub, ['detalhamento_da_fonte_original_do_trafego_2', 'detalhamento_fonte_original_2', 'hs_analytics_source_data_2'])
+    col_det2 = find_col(df_hub, COLUNAS_HUBSPOT['detalhamento_2'])
     df_hub['Detalhamento_fonte_original_2'] = df_hub[col_det2].fillna(DEFAULT_NA_TEXT) if col_det2 else DEFAULT_NA_TEXT
     # 💡 CORREÇÃO CRÍTICA: Limpeza para o merge de investimento do Google (2)
-    df_hub['Merge_Key_Google'] = df_hub['Detalhamento_fonte_original_2'].apply(clean_text)
+    df_hub['Merge_Key_Google'] = mapeamento.aplicar_em_unicos(df_hub['Detalhamento_fonte_original_2'], clean_text, categorico=False)
     
     # --- 3.2. Mapeamento de Canais e Filtro ---
     
     print("\n    🗺️  Mapeando canais e aplicando filtros...")
     
     # Mapeamento de Origem Principal
-    df_hub['Origem_Principal'] = df_hub['Fonte_Original_do_Trafego_clean'].map(CANAL_MAP_FINAL).fillna(DEFAULT_NA_TEXT)
+    df_hub['Origem_Principal'] = mapeamento.mapear_dict(
+        df_hub['Fonte_Original_do_Trafego_clean'], CANAL_MAP_FINAL, DEFAULT_NA_TEXT, diagnostico=diagnostico,
+        padroes=CANAL_PADROES
+    )
     
     # Filtro de Canais (apenas canais de mídia paga)
-    df_hub_filtrado = df_hub[df_hub['Origem_Principal'].isin(CANAL_MAP_FINAL.values())].copy()
+    canais_pagos = set(CANAL_MAP_FINAL.values()) | {canal for _, canal in CANAL_PADROES}
+    df_hub_filtrado = df_hub[df_hub['Origem_Principal'].isin(canais_pagos)].copy()
     
     print(f"    ✅ Filtro aplicado: {len(df_hub_filtrado)} registros de mídia paga")
     
-    # Mapeamento de Nome_Conta_Final
-    def map_nome_conta(origem):
-        if origem == 'Social Pago':
-            return META_ACCOUNT_OTHER_LABEL
-        elif origem == 'Pesquisa Paga':
-            return GOOGLE_ACCOUNT_LABEL
-        else:
-            return DEFAULT_NA_TEXT
-    
-    df_hub_filtrado['Nome_Conta_Final'] = df_hub_filtrado['Origem_Principal'].apply(map_nome_conta)
+    # Mapeamento de Nome_Conta_Final (canal de cada plataforma -> rótulo da conta)
+    nome_conta = {CANAL_PLATAFORMA['meta']: META_ACCOUNT_OTHER_LABEL, CANAL_PLATAFORMA['google']: GOOGLE_ACCOUNT_LABEL}
+    df_hub_filtrado['Nome_Conta_Final'] = mapeamento.mapear_dict(
+        df_hub_filtrado['Origem_Principal'], nome_conta, DEFAULT_NA_TEXT
+    )
     df_hub_filtrado['Area_Gestao_RVO'] = AREA_GESTAO_DEFAULT
     
     # --- 3.3. Calcular Métricas de Negócios ---
@@ -408,24 +428,45 @@ def main():
             1, 0
         )
     
+    return df_hub_filtrado
+
+def resolver_relatorio(keywords: dict, campos: tuple = ('data', 'investimento', 'campanha')):
+    """
+    resolver(cabeçalho) -> índices das colunas de 'campos', com a mesma escolha de
+    clean_cols + find_col (leitura só das colunas usadas, ver leitura_xlsx.py).
+    """
+    def resolver(cabecalho):
+        limpas = [limpar_nome_coluna(c) for c in cabecalho]
+        indices = []
+        for campo in campos:
+            candidatas = cabecalhos.candidatas_find_col(limpas, keywords[campo])
+            indices.append(limpas.index(candidatas[0]) if candidatas else None)
+        return indices
+    return resolver
+
+def carregar_investimentos() -> tuple:
+    """Carrega as bases Meta/Google e agrega o investimento por (Data, chave de merge) (3.4)."""
+    carregar_regras()
+    
     # --- 3.4. Carregar e Preparar Dados de Investimento ---
     
     print("\n📥 Carregando dados de investimento...")
+    import leitura_xlsx
+    import troca_arrow
     
     # Meta Ads
     if META_REPORT_FILE.exists():
-        df_meta_raw = read_any(META_REPORT_FILE, sheet_name=META_SHEET_NAME)
+        df_meta_raw = troca_arrow.ler_aba(META_REPORT_FILE, META_SHEET_NAME, lambda: leitura_xlsx.ler_aba(
+            META_REPORT_FILE, META_SHEET_NAME, resolver_relatorio(COLUNAS_META_RELATORIO)))
         df_meta = clean_cols(df_meta_raw)
         
-        col_data_meta = find_col(df_meta, ['data', 'date', 'day'])
-        # ✅ CORREÇÃO FINAL: Adicionar mais sinônimos para investimento, incluindo variações de nomes de colunas que contenham "valor"
-        col_inv_meta = find_col(df_meta, ['investimento', 'spend', 'amount_spent', 'valor_usado_brl', 'valor_usado', 'valor'])
-        # ✅ CORREÇÃO FINAL: Adicionar mais sinônimos para campanha, incluindo 'nome_da_campanha' (normalizado de 'Nome da Campanha') e 'campanha' (mais simples)
-        col_campanha_meta = find_col(df_meta, ['campanha', 'campaign', 'campaign_name', 'nome_da_campanha', 'nome_campanha'])
+        col_data_meta = find_col(df_meta, COLUNAS_META_RELATORIO['data'])
+        col_inv_meta = find_col(df_meta, COLUNAS_META_RELATORIO['investimento'])
+        col_campanha_meta = find_col(df_meta, COLUNAS_META_RELATORIO['campanha'])
         
         if col_data_meta and col_inv_meta and col_campanha_meta:
             print(f"    ✅ Colunas Meta encontradas: Data='{col_data_meta}', Investimento='{col_inv_meta}', Campanha='{col_campanha_meta}'")
-            df_meta['Data'] = pd.to_datetime(df_meta[col_data_meta], errors='coerce').dt.normalize()
+            df_meta['Data'] = datas.converter_datas(df_meta[col_data_meta], 'meta_completo_data').dt.normalize()
             df_meta['Investimento_Meta'] = pd.to_numeric(df_meta[col_inv_meta], errors='coerce').fillna(0)
             
             df_meta['Campanha'] = df_meta[col_campanha_meta].fillna(DEFAULT_NA_TEXT)
@@ -446,18 +487,17 @@ def main():
     
     # Google Ads
     if GOOGLE_REPORT_FILE.exists():
-        df_google_raw = read_any(GOOGLE_REPORT_FILE, sheet_name=GOOGLE_SHEET_NAME)
+        df_google_raw = troca_arrow.ler_aba(GOOGLE_REPORT_FILE, GOOGLE_SHEET_NAME, lambda: leitura_xlsx.ler_aba(
+            GOOGLE_REPORT_FILE, GOOGLE_SHEET_NAME, resolver_relatorio(COLUNAS_GOOGLE_RELATORIO)))
         df_google = clean_cols(df_google_raw)
         
-        col_data_google = find_col(df_google, ['data', 'date', 'day'])
-        # ✅ CORREÇÃO FINAL: Adicionar mais sinônimos para investimento
-        col_inv_google = find_col(df_google, ['investimento', 'cost', 'spend', 'investimento_google', 'valor'])
-        # ✅ CORREÇÃO FINAL: Focar em 'Nome_Campanha' (Termo/Keyword pode não existir)
-        col_termo_google = find_col(df_google, ['nome_campanha', 'campanha', 'campaign', 'keyword', 'search_term', 'termo'])
+        col_data_google = find_col(df_google, COLUNAS_GOOGLE_RELATORIO['data'])
+        col_inv_google = find_col(df_google, COLUNAS_GOOGLE_RELATORIO['investimento'])
+        col_termo_google = find_col(df_google, COLUNAS_GOOGLE_RELATORIO['campanha'])
         
         if col_data_google and col_inv_google and col_termo_google:
             print(f"    ✅ Colunas Google encontradas: Data='{col_data_google}', Investimento='{col_inv_google}', Campanha/Termo='{col_termo_google}'")
-            df_google['Data'] = pd.to_datetime(df_google[col_data_google], errors='coerce').dt.normalize()
+            df_google['Data'] = datas.converter_datas(df_google[col_data_google], 'google_completo_data').dt.normalize()
             df_google['Investimento_Google'] = pd.to_numeric(df_google[col_inv_google], errors='coerce').fillna(0)
             
             df_google['Termo'] = df_google[col_termo_google].fillna(DEFAULT_NA_TEXT)
@@ -474,6 +514,12 @@ def main():
         print("    ⚠️  Arquivo Google Ads não encontrado")
         df_google_agg = pd.DataFrame(columns=['Data', 'Termo_Merge_Key', 'Investimento_Google'])
     
+    return df_meta_agg, df_google_agg
+
+def merge_investimento(df_hub_filtrado: pd.DataFrame, df_meta_agg: pd.DataFrame, df_google_agg: pd.DataFrame) -> pd.DataFrame:
+    """Cruza os negócios com o investimento Meta/Google e prorrateia a mídia por lead (3.5)."""
+    carregar_regras()
+    
     # --- 3.5. Merge e Prorrateio de Investimento ---
     
     print("\n🔗 Realizando merge e prorrateio de investimento...")
@@ -498,13 +544,13 @@ def main():
     
     # Calcular investimento total por dia e origem
     df_merged['Investimento_Total_Dia'] = np.where(
-        df_merged['Origem_Principal'] == 'Social Pago',
+        df_merged['Origem_Principal'] == CANAL_PLATAFORMA['meta'],
         df_merged['Investimento_Meta'],
         df_merged['Investimento_Google']
     )
     
     # Prorrateio: contar leads por (Data, Origem_Principal)
-    leads_por_dia = df_merged.groupby(['Data', 'Origem_Principal']).size().reset_index(name='Count_Leads')
+    leads_por_dia = df_merged.groupby(['Data', 'Origem_Principal'], observed=True).size().reset_index(name='Count_Leads')
     df_merged = df_merged.drop(columns=['Count_Leads'], errors='ignore')
     df_merged = df_merged.merge(leads_por_dia, on=['Data', 'Origem_Principal'], how='left')
     
@@ -518,11 +564,23 @@ def main():
     print(f"    ✅ Investimento prorrateado calculado")
     print(f"    💰 Investimento total: R$ {df_merged['Midia_Paga'].sum():,.2f}")
     
+    return df_merged
+
+def preparar_granular(df_merged: pd.DataFrame, ids: str = "global", processos: int = None) -> pd.DataFrame:
+    """
+    Gera os IDs e seleciona as colunas da Visao_Granular_Final (3.6).
+    ids='particionado' numera por fatias de dias em paralelo (ver ids_particionados.py).
+    """
+    
     # --- 3.6. Gerar IDs e Preparar DataFrame Granular ---
     
     print("\n🔄 Gerando IDs únicos e preparando visão granular...")
     
-    df_granular = generate_unique_id(df_merged)
+    if ids == "particionado":
+        import ids_particionados
+        df_granular = ids_particionados.gerar_ids(df_merged, processos=processos)
+    else:
+        df_granular = generate_unique_id(df_merged)
     
     # Limpar colunas auxiliares
     cols_to_drop = [
@@ -547,6 +605,11 @@ def main():
     
     print(f"    ✅ Visão granular final preparada com {len(df_granular)} linhas")
     
+    return df_granular
+
+def agregar_dash(df_granular: pd.DataFrame) -> pd.DataFrame:
+    """Monta a aba Blend_Agregado_Dash (3.7)."""
+    
     # --- 3.7. Preparar DataFrame Agregado (Blend_Agregado_Dash) ---
     
     print("\n🔄 Preparando visão agregada para o Dashboard...")
@@ -566,7 +629,7 @@ def main():
     df_agregado = df_granular.groupby([
         'Data', 'Origem_Principal', 'Detalhamento_fonte_original_1', 
         'Detalhamento_fonte_original_2', 'Status_Principal', 'Tipo', 'Unidade'
-    ], dropna=False).agg(agg_dict).reset_index()
+    ], dropna=False, observed=True).agg(agg_dict).reset_index()
     
     # Renomear colunas
     df_agregado = df_agregado.rename(columns={
@@ -591,6 +654,12 @@ def main():
     
     print(f"    ✅ Visão agregada preparada com {len(df_agregado)} linhas")
     
+    return df_agregado
+
+def agregar_matriculas_fechamento(df_granular: pd.DataFrame) -> pd.DataFrame:
+    """Monta a aba Agregado_Matriculas_Fechamento (3.8)."""
+    carregar_regras()
+    
     # --- 3.8. Preparar DataFrame Agregado de Matrículas (Agregado_Matriculas_Fechamento) ---
     
     print("\n🔄 Preparando visão agregada de matrículas por data de fechamento...")
@@ -600,72 +669,80 @@ def main():
     
     if len(df_matriculas) == 0:
         print("    ⚠️  Nenhuma matrícula encontrada para gerar a aba Agregado_Matriculas_Fechamento")
-        df_matriculas_fechamento = pd.DataFrame()
-    else:
-        # Colunas de Matrícula por Ciclo (baseado na Data de Fechamento)
-        matriculas_ciclo_fechamento_cols = sorted(df_matriculas['Ciclo_Captacao_Fechamento'].unique())
-        matriculas_ciclo_fechamento_cols = [c for c in matriculas_ciclo_fechamento_cols if c != DEFAULT_NA_TEXT]
-        
-        # Recalcular as colunas de matrícula por ciclo, usando Ciclo_Captacao_Fechamento
-        for ciclo in matriculas_ciclo_fechamento_cols:
-            col_name = f"Matriculas_{ciclo.replace('.', '_').replace(' ', '_')}"
-            df_matriculas[col_name] = np.where(
-                (df_matriculas['Matriculas'] == 1) & (df_matriculas['Ciclo_Captacao_Fechamento'] == ciclo),
-                1, 0
-            )
-        
-        # Adicionar as colunas de ciclo baseadas na Data de Criação (para manter a estrutura)
-        for col in [c for c in df_granular.columns if c.startswith('Matriculas_') and c not in df_matriculas.columns]:
-            df_matriculas[col] = 0
-        
-        # Agrupar por Data_Fechamento e Ciclo_Captacao_Fechamento
-        agg_dict_mat = {
-            'Total_Negocios': 'sum',
-            'Matriculas': 'sum',
-            'Midia_Paga': 'sum',
-            'RVO': 'sum'
-        }
-        
-        # Adicionar agregação para cada coluna de matrícula por ciclo
-        for col in [c for c in df_matriculas.columns if c.startswith('Matriculas_')]:
-            agg_dict_mat[col] = 'sum'
-        
-        df_matriculas_fechamento = df_matriculas.groupby([
-            'Data_Fechamento', 'Ciclo_Captacao_Fechamento', 'Origem_Principal', 
-            'Detalhamento_fonte_original_1', 'Detalhamento_fonte_original_2', 
-            'Tipo', 'Unidade'
-        ], dropna=False).agg(agg_dict_mat).reset_index()
-        
-        # Renomear colunas
-        df_matriculas_fechamento = df_matriculas_fechamento.rename(columns={
-            'Origem_Principal': 'Canal',
-            'Detalhamento_fonte_original_1': 'Campanha',
-            'Detalhamento_fonte_original_2': 'Termo',
-            'Tipo': 'Pipeline',
-            'Unidade': 'Unidade_Desejada',
-            'Total_Negocios': 'Volume_Matriculas',
-            'Midia_Paga': 'Investimento',
-            'RVO': 'RVO_Total',
-            'Ciclo_Captacao_Fechamento': 'Ciclo_Captacao'
-        })
-        
-        # Selecionar e reordenar colunas
-        cols_matriculas = [
-            'Data_Fechamento', 'Ciclo_Captacao', 'Canal', 'Campanha', 'Termo', 
-            'Pipeline', 'Unidade_Desejada', 'Volume_Matriculas', 'Matriculas', 
-            'Investimento', 'RVO_Total'
-        ] + [c for c in df_matriculas_fechamento.columns if c.startswith('Matriculas_')]
-        
-        df_matriculas_fechamento = df_matriculas_fechamento[cols_matriculas]
-        
-        # Ordenar por Data_Fechamento
-        df_matriculas_fechamento = df_matriculas_fechamento.sort_values('Data_Fechamento')
-        
-        print(f"    ✅ Visão de matrículas preparada com {len(df_matriculas_fechamento)} linhas")
-        print(f"    ✅ Total de matrículas na aba: {df_matriculas_fechamento['Matriculas'].sum()}")
+        return pd.DataFrame()
+    
+    # Colunas de Matrícula por Ciclo (baseado na Data de Fechamento)
+    matriculas_ciclo_fechamento_cols = sorted(df_matriculas['Ciclo_Captacao_Fechamento'].unique())
+    matriculas_ciclo_fechamento_cols = [c for c in matriculas_ciclo_fechamento_cols if c != DEFAULT_NA_TEXT]
+    
+    # Recalcular as colunas de matrícula por ciclo, usando Ciclo_Captacao_Fechamento
+    for ciclo in matriculas_ciclo_fechamento_cols:
+        col_name = f"Matriculas_{ciclo.replace('.', '_').replace(' ', '_')}"
+        df_matriculas[col_name] = np.where(
+            (df_matriculas['Matriculas'] == 1) & (df_matriculas['Ciclo_Captacao_Fechamento'] == ciclo),
+            1, 0
+        )
+    
+    # Adicionar as colunas de ciclo baseadas na Data de Criação (para manter a estrutura)
+    for col in [c for c in df_granular.columns if c.startswith('Matriculas_') and c not in df_matriculas.columns]:
+        df_matriculas[col] = 0
+    
+    # Agrupar por Data_Fechamento e Ciclo_Captacao_Fechamento
+    agg_dict_mat = {
+        'Total_Negocios': 'sum',
+        'Matriculas': 'sum',
+        'Midia_Paga': 'sum',
+        'RVO': 'sum'
+    }
+    
+    # Adicionar agregação para cada coluna de matrícula por ciclo
+    for col in [c for c in df_matriculas.columns if c.startswith('Matriculas_')]:
+        agg_dict_mat[col] = 'sum'
+    
+    df_matriculas_fechamento = df_matriculas.groupby([
+        'Data_Fechamento', 'Ciclo_Captacao_Fechamento', 'Origem_Principal', 
+        'Detalhamento_fonte_original_1', 'Detalhamento_fonte_original_2', 
+        'Tipo', 'Unidade'
+    ], dropna=False, observed=True).agg(agg_dict_mat).reset_index()
+    
+    # Renomear colunas
+    df_matriculas_fechamento = df_matriculas_fechamento.rename(columns={
+        'Origem_Principal': 'Canal',
+        'Detalhamento_fonte_original_1': 'Campanha',
+        'Detalhamento_fonte_original_2': 'Termo',
+        'Tipo': 'Pipeline',
+        'Unidade': 'Unidade_Desejada',
+        'Total_Negocios': 'Volume_Matriculas',
+        'Midia_Paga': 'Investimento',
+        'RVO': 'RVO_Total',
+        'Ciclo_Captacao_Fechamento': 'Ciclo_Captacao'
+    })
+    
+    # Selecionar e reordenar colunas
+    cols_matriculas = [
+        'Data_Fechamento', 'Ciclo_Captacao', 'Canal', 'Campanha', 'Termo', 
+        'Pipeline', 'Unidade_Desejada', 'Volume_Matriculas', 'Matriculas', 
+        'Investimento', 'RVO_Total'
+    ] + [c for c in df_matriculas_fechamento.columns if c.startswith('Matriculas_')]
+    
+    df_matriculas_fechamento = df_matriculas_fechamento[cols_matriculas]
+    
+    # Ordenar por Data_Fechamento
+    df_matriculas_fechamento = df_matriculas_fechamento.sort_values('Data_Fechamento')
+    
+    print(f"    ✅ Visão de matrículas preparada com {len(df_matriculas_fechamento)} linhas")
+    print(f"    ✅ Total de matrículas na aba: {df_matriculas_fechamento['Matriculas'].sum()}")
+    
+    return df_matriculas_fechamento
+
+def salvar_blend(df_granular: pd.DataFrame, df_agregado: pd.DataFrame, df_matriculas_fechamento: pd.DataFrame) -> Path:
+    """Salva as três abas do blend em um xlsx com timestamp (3.9)."""
     
     # --- 3.9. Salvar Arquivo Final ---
     
+    from datetime import datetime
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     OUT_FILE = OUTPUT_DIR / f"{BLEND_BASE_NAME}_{timestamp}.xlsx"
     
@@ -704,6 +781,324 @@ def main():
         print(f"\n\n❌ ERRO AO SALVAR O EXCEL: {e}")
         print("Verifique se o arquivo não está aberto em outro programa.")
         sys.exit(1)
+    
+    return OUT_FILE
+
+def merge_atribuicao(df_hub_filtrado: pd.DataFrame, df_meta_agg: pd.DataFrame, df_google_agg: pd.DataFrame,
+                     atribuicao: dict) -> pd.DataFrame:
+    """3.5 com um modelo de atribuicao.py (janela/decaimento) no lugar do último clique."""
+    import atribuicao as modelos_atribuicao
+    
+    df_merged = df_hub_filtrado.copy()
+    carregar_regras()
+    df_merged['Midia_Paga'] = modelos_atribuicao.atribuir(df_hub_filtrado, df_meta_agg, df_google_agg,
+                                                          CANAL_PLATAFORMA, **atribuicao)
+    return df_merged
+
+def executar_blend(df_hub_filtrado: pd.DataFrame, df_meta_agg: pd.DataFrame, df_google_agg: pd.DataFrame,
+                   atribuicao: dict = None, ids: str = "global", processos: int = None) -> tuple:
+    """
+    Executa merge, IDs e agregações (3.5 a 3.8).
+    atribuicao: {'modelo', 'janela_dias', 'meia_vida'} (ver atribuicao.py); None = último clique.
+    ids/processos: modo de geração dos IDs (ver preparar_granular).
+    Retorna (df_granular, df_agregado, df_matriculas_fechamento).
+    """
+    carregar_regras()
+    if not atribuicao or atribuicao['modelo'] == 'ultimo_clique':
+        df_merged = merge_investimento(df_hub_filtrado, df_meta_agg, df_google_agg)
+    else:
+        df_merged = merge_atribuicao(df_hub_filtrado, df_meta_agg, df_google_agg, atribuicao)
+    df_granular = preparar_granular(df_merged, ids=ids, processos=processos)
+    df_agregado = agregar_dash(df_granular)
+    df_matriculas_fechamento = agregar_matriculas_fechamento(df_granular)
+    return df_granular, df_agregado, df_matriculas_fechamento
+
+def carregar_hubspot() -> pd.DataFrame:
+    """Lê o export do HubSpot e executa a preparação (3.1 a 3.3)."""
+    print("\n📥 Carregando dados do HubSpot...")
+    import csv_paralelo
+    if csv_paralelo.usar(HUBSPOT_FILE):
+        # Export grande: parse dividido em faixas de bytes num pool de processos
+        df_hub_raw = csv_paralelo.ler_csv(HUBSPOT_FILE)
+    else:
+        df_hub_raw = read_any(HUBSPOT_FILE)
+    df_hub = clean_cols(df_hub_raw)
+    print(f"    ✅ HubSpot carregado: {len(df_hub)} linhas")
+    
+    diagnostico, duplicados = [], []
+    df_hub_filtrado = preparar_hubspot(df_hub, diagnostico=diagnostico, duplicados=duplicados)
+    mapeamento.salvar_diagnostico(diagnostico, DIAGNOSTICO_MAPEAMENTO_FILE)
+    
+    import deduplicacao
+    removidas, colunas = duplicados[0]
+    deduplicacao.salvar_relatorio(removidas, colunas, DUPLICADOS_HUBSPOT_FILE)
+    if len(removidas):
+        print(f"    ⚠️  Negócios duplicados removidos listados em: {DUPLICADOS_HUBSPOT_FILE}")
+    return df_hub_filtrado
+
+def inspecionar(path: Path = HUBSPOT_FILE, relatorios: bool = True, n_linhas: int = cabecalhos.AMOSTRA_LINHAS) -> list:
+    """
+    Lê só o cabeçalho e as primeiras linhas do export do HubSpot (e dos relatórios
+    Meta/Google, se relatorios=True) e resolve as colunas como o find_col (sem pandas).
+    """
+    carregar_regras()
+    def detectar_com(mapa):
+        def detectar(colunas, linhas):
+            return {campo: cabecalhos.candidatas_find_col(colunas, keywords) for campo, keywords in mapa.items()}
+        return detectar
+
+    resultados = [cabecalhos.inspecionar_arquivo(
+        'hubspot', path, detectar_com(COLUNAS_HUBSPOT), COLUNAS_OBRIGATORIAS_HUBSPOT,
+        normalizar=limpar_nome_coluna, n_linhas=n_linhas
+    )]
+    if relatorios:
+        resultados += [
+            cabecalhos.inspecionar_arquivo(
+                'meta_relatorio', META_REPORT_FILE, detectar_com(COLUNAS_META_RELATORIO), list(COLUNAS_META_RELATORIO),
+                opcional=True, normalizar=limpar_nome_coluna, n_linhas=n_linhas, sheet_name=META_SHEET_NAME
+            ),
+            cabecalhos.inspecionar_arquivo(
+                'google_relatorio', GOOGLE_REPORT_FILE, detectar_com(COLUNAS_GOOGLE_RELATORIO), list(COLUNAS_GOOGLE_RELATORIO),
+                opcional=True, normalizar=limpar_nome_coluna, n_linhas=n_linhas, sheet_name=GOOGLE_SHEET_NAME
+            ),
+        ]
+    return resultados
+
+def usar_regras(path: Path):
+    """
+    Carrega as regras de negócio de um arquivo TOML (padrão, --regras ou campo 'regras'
+    do lote). ValueError lista os problemas do arquivo.
+    """
+    global REGRAS_FILE, REGRAS, DEFAULT_NA_TEXT, CANAL_MAP_FINAL, CANAL_PADROES, CANAL_PLATAFORMA
+    global ETAPA_FUNIL_MAP, ETAPA_PADROES, MATRICULA_NOME_FINAL, ETAPAS_NEGOCIO
+    global COLUNAS_HUBSPOT, COLUNAS_META_RELATORIO, COLUNAS_GOOGLE_RELATORIO
+    import regras_negocio
+    
+    REGRAS_FILE = Path(path)
+    REGRAS = regras_negocio.carregar(REGRAS_FILE)
+    DEFAULT_NA_TEXT = REGRAS.texto_nao_mapeado
+    CANAL_MAP_FINAL = dict(REGRAS.canais)
+    CANAL_PADROES = list(REGRAS.canais_padroes)
+    CANAL_PLATAFORMA = dict(REGRAS.plataformas)
+    ETAPA_FUNIL_MAP = dict(REGRAS.etapas_funil)
+    ETAPA_PADROES = list(REGRAS.etapas_padroes)
+    MATRICULA_NOME_FINAL = REGRAS.etapa_matricula
+    ETAPAS_NEGOCIO = list(REGRAS.etapas_negocio)
+    COLUNAS_HUBSPOT = dict(REGRAS.colunas['hubspot'])
+    COLUNAS_META_RELATORIO = dict(REGRAS.colunas['meta_relatorio'])
+    COLUNAS_GOOGLE_RELATORIO = dict(REGRAS.colunas['google_relatorio'])
+
+def carregar_regras():
+    """Carrega as regras do REGRAS_FILE se ainda não foram carregadas (no-op depois)."""
+    if REGRAS is None:
+        usar_regras(REGRAS_FILE)
+
+def __getattr__(nome):
+    """Constante de regra lida de fora do módulo antes do primeiro uso: carrega o arquivo."""
+    if nome in NOMES_REGRAS:
+        carregar_regras()
+        return globals()[nome]
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+def config_cache() -> dict:
+    """Regras de negócio que definem o resultado do blend (entram na chave do cache)."""
+    carregar_regras()
+    return {
+        'canal_map': CANAL_MAP_FINAL,
+        'canal_padroes': [(regex.pattern, canal) for regex, canal in CANAL_PADROES],
+        'canal_plataforma': CANAL_PLATAFORMA,
+        'etapa_funil_map': ETAPA_FUNIL_MAP,
+        'etapa_padroes': [(regex.pattern, etapa) for regex, etapa in ETAPA_PADROES],
+        'matricula_nome_final': MATRICULA_NOME_FINAL,
+        'meta_account_label': META_ACCOUNT_OTHER_LABEL,
+        'google_account_label': GOOGLE_ACCOUNT_LABEL,
+        'area_gestao_default': AREA_GESTAO_DEFAULT,
+        'default_na_text': DEFAULT_NA_TEXT,
+        'identidade_hubspot': IDENTIDADE_HUBSPOT,
+        'colunas_hubspot': COLUNAS_HUBSPOT,
+        'colunas_meta_relatorio': COLUNAS_META_RELATORIO,
+        'colunas_google_relatorio': COLUNAS_GOOGLE_RELATORIO,
+        'meta_sheet': META_SHEET_NAME,
+        'google_sheet': GOOGLE_SHEET_NAME,
+    }
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Blend HubSpot + investimento Meta/Google.")
+    parser.add_argument(
+        "--sem-cache", dest="cache", action="store_false",
+        help="Ignora o cache de etapas e reprocessa HubSpot e blend do zero."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Só lê o cabeçalho e mostra as colunas detectadas (não processa nada)."
+    )
+    parser.add_argument(
+        "--saida", choices=["xlsx", "estrela", "ambos"], default="xlsx",
+        help="xlsx do blend, esquema estrela compacto para o Looker Studio (ver saida_estrela.py) ou os dois. Padrão: xlsx."
+    )
+    parser.add_argument(
+        "--formato-estrela", choices=["parquet", "csv.gz"], default="parquet",
+        help="Formato dos arquivos do esquema estrela. Padrão: parquet."
+    )
+    parser.add_argument(
+        "--validar", action="store_true",
+        help="Depois do blend, confere o investimento contra os relatórios Meta/Google (ver validar_investimentos.py)."
+    )
+    parser.add_argument(
+        "--snapshot", action="store_true",
+        help="Registra as três abas no histórico do blend (output/historico, ver historico_blend.py)."
+    )
+    parser.add_argument(
+        "--atribuicao", choices=["ultimo_clique", "janela", "decaimento"], default="ultimo_clique",
+        help="Modelo de atribuição do investimento aos negócios (ver atribuicao.py). Padrão: ultimo_clique."
+    )
+    parser.add_argument(
+        "--janela-dias", type=int, default=30,
+        help="Modelos janela/decaimento: investimento do dia D vai para negócios criados em [D, D + N]. Padrão: 30."
+    )
+    parser.add_argument(
+        "--meia-vida", type=float, default=7.0,
+        help="Modelo decaimento: dias para o peso de um negócio cair pela metade. Padrão: 7."
+    )
+    parser.add_argument(
+        "--ids", choices=["global", "particionado"], default="global",
+        help="Geração dos IDs: ordenação global ou por fatias de dias em paralelo (ver ids_particionados.py). Padrão: global."
+    )
+    parser.add_argument(
+        "--processos", type=int, default=None,
+        help="Processos usados com --ids particionado. Padrão: número de CPUs."
+    )
+    parser.add_argument(
+        "--funil", action="store_true",
+        help="Gera também o funil e as coortes pré-agregados para o dashboard (ver funil_coortes.py)."
+    )
+    parser.add_argument(
+        "--kpis", action="store_true",
+        help="Gera também o cubo de KPIs por dia, semana, mês e ciclo (ver cubo_kpis.py)."
+    )
+    parser.add_argument(
+        "--formato-kpis", choices=["parquet", "csv.gz"], default="csv.gz",
+        help="Formato das tabelas do cubo de KPIs. Padrão: csv.gz."
+    )
+    parser.add_argument(
+        "--anomalias", action="store_true",
+        help="Procura dias anômalos no investimento diário Meta/Google/blend (ver anomalias.py)."
+    )
+    parser.add_argument(
+        "--bloquear-anomalias", choices=["aviso", "critico", "nenhuma"], default="critico",
+        help="Com --anomalias, severidade a partir da qual o script termina com código 1. Padrão: critico."
+    )
+    parser.add_argument(
+        "--regras", type=Path, default=None,
+        help=f"Arquivo TOML de regras de negócio (ver regras_negocio.py). Padrão: {REGRAS_FILE.name}."
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    
+    args = parse_args(argv)
+    try:
+        if args.regras:
+            usar_regras(args.regras)
+        else:
+            carregar_regras()
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.dry_run:
+        sys.exit(cabecalhos.imprimir_inspecoes(inspecionar(HUBSPOT_FILE)))
+    
+    print("="*80)
+    print("🚀 Iniciando Script de BLEND - VERSÃO CORRIGIDA FINAL")
+    print("="*80)
+    print(f"    📏 Regras: {REGRAS_FILE.name} (versão {REGRAS.versao}, {REGRAS.hash[:12]})")
+    
+    # Export do HubSpot inválido falha aqui, antes da leitura completa
+    # (os relatórios Meta/Google são saídas do próprio pipeline)
+    cabecalhos.preflight(lambda: inspecionar(HUBSPOT_FILE, relatorios=False))
+    
+    import cache_etapas
+    # Código das etapas: este script e todos os módulos locais que ele importa
+    codigo = cache_etapas.arquivos_codigo(Path(__file__))
+    
+    # Etapa HubSpot: só depende do export do HubSpot e das regras
+    df_hub_filtrado = cache_etapas.executar_em_cache(
+        'hubspot', [HUBSPOT_FILE] + codigo,
+        config_cache(),
+        carregar_hubspot, usar_cache=args.cache
+    )
+    
+    # Etapa Investimentos: leitura dos relatórios Meta/Google (não depende do HubSpot)
+    df_meta_agg, df_google_agg = cache_etapas.executar_em_cache(
+        'investimentos', [META_REPORT_FILE, GOOGLE_REPORT_FILE] + codigo, config_cache(),
+        carregar_investimentos, usar_cache=args.cache
+    )
+    
+    # Etapa Blend: depende também das bases de investimento
+    atribuicao = {'modelo': args.atribuicao}
+    if args.atribuicao != 'ultimo_clique':
+        print(f"    🎯 Atribuição: {args.atribuicao}")
+        atribuicao.update(janela_dias=args.janela_dias, meia_vida=args.meia_vida)
+    
+    def blend():
+        return executar_blend(df_hub_filtrado, df_meta_agg, df_google_agg, atribuicao=atribuicao,
+                              ids=args.ids, processos=args.processos)
+    
+    # O número de processos não muda o resultado, só o modo de IDs entra na chave
+    df_granular, df_agregado, df_matriculas_fechamento = cache_etapas.executar_em_cache(
+        'blend', [HUBSPOT_FILE, META_REPORT_FILE, GOOGLE_REPORT_FILE] + codigo,
+        dict(config_cache(), atribuicao=atribuicao, ids=args.ids), blend, usar_cache=args.cache
+    )
+    
+    out_file = None
+    if args.saida in ("xlsx", "ambos"):
+        inicio = time.perf_counter()
+        out_file = salvar_blend(df_granular, df_agregado, df_matriculas_fechamento)
+        segundos_xlsx = time.perf_counter() - inicio
+        # Cópia em Arrow da visão granular para validação/funil/KPIs em outros processos
+        import troca_arrow
+        troca_arrow.salvar(df_granular, out_file, 'Visao_Granular_Final')
+    
+    if args.saida in ("estrela", "ambos"):
+        import saida_estrela
+        resumo = saida_estrela.salvar(df_granular, OUTPUT_DIR, BLEND_BASE_NAME, args.formato_estrela)
+        if out_file is not None:
+            saida_estrela.imprimir_comparacao(resumo, out_file.stat().st_size, segundos_xlsx)
+        else:
+            saida_estrela.imprimir_comparacao(resumo)
+            out_file = resumo[0]['arquivo'].parent
+    
+    if args.snapshot:
+        import historico_blend
+        historico_blend.registrar(
+            {'granular': df_granular, 'agregado': df_agregado, 'matriculas': df_matriculas_fechamento},
+            OUTPUT_DIR / "historico", origem=str(out_file)
+        )
+    
+    if args.funil:
+        import funil_coortes
+        funil_coortes.salvar(funil_coortes.calcular(df_granular), OUTPUT_DIR)
+    
+    if args.kpis:
+        import cubo_kpis
+        cubo_kpis.salvar(cubo_kpis.calcular(df_granular), OUTPUT_DIR, args.formato_kpis)
+    
+    codigo = 0
+    if args.anomalias:
+        import anomalias
+        series = anomalias.series_execucao(df_meta_agg, df_google_agg, df_granular)
+        codigo |= anomalias.executar(series, bloquear=args.bloquear_anomalias)
+    
+    if args.validar:
+        import validar_investimentos
+        codigo |= validar_investimentos.validar(out_file)
+    
+    if codigo != 0:
+        sys.exit(1)
+    
+    return out_file
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
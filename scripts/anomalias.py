@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+anomalias.py
+
+Detecção de dias anômalos no investimento diário, para pegar export quebrado
+(dia sem gasto no Meta, import do Google em dobro) antes de publicar o
+dashboard.
+
+Séries (uma por fonte e campanha; '(total)' = soma do dia):
+    meta_yoy / google_yoy       abas Meta_YoY e Google_YoY dos relatórios
+    meta / google               investimento por campanha (Meta_Completo / Google_Completo
+                                agregados por carregar_investimentos)
+    blend_meta / blend_google   Midia_Paga atribuída no blend por dia (canal de cada plataforma nas regras)
+
+Cada dia é comparado com os JANELA_DIAS dias anteriores da mesma série
+(mediana e MAD da janela) pelo z robusto
+
+    z = 0,6745 * (valor - mediana) / max(MAD, PISO_RELATIVO * mediana, PISO_ABSOLUTO)
+
+Nas séries de total, dias sem valor entre o primeiro e o último dia contam
+como 0 (as abas YoY omitem dias sem investimento, e o dia zerado é justamente
+o export quebrado). Nas séries por campanha, dia sem valor (ou com 0) é
+campanha parada: fica fora da janela e não é avaliado, então a mediana e o
+MAD saem só dos dias ativos. Janela com mediana 0 (série parada) não gera z.
+As séries são empilhadas numa matriz dias x séries e todas as janelas saem
+de uma vez (sliding_window_view + nanmedian), em blocos de BLOCO_SERIES
+colunas para limitar a memória.
+
+|z| >= LIMIAR_AVISO é aviso e |z| >= LIMIAR_CRITICO é crítico. Todos os dias
+sinalizados vão para output/anomalias_investimento.csv; o código de saída é 1
+se houver anomalia da severidade de --bloquear ou acima nos últimos
+DIAS_BLOQUEIO dias (os que a atualização trouxe). Um pico antigo continua no
+relatório, mas não bloqueia as atualizações seguintes.
+
+Uso:
+    python scripts/analise_performance_hubspot.py --anomalias [--bloquear-anomalias aviso]
+    python scripts/anomalias.py [--blend arquivo.xlsx] [--janela 28] [--bloquear critico]
+    python scripts/benchmark_anomalias.py --campanhas 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+import analise_performance_hubspot as blend
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+JANELA_DIAS = 28
+MIN_DIAS = 7
+LIMIAR_AVISO = 3.5
+LIMIAR_CRITICO = 7.0
+# Escala mínima do z: evita alarme em séries quase constantes (MAD ~ 0)
+PISO_RELATIVO = 0.05
+PISO_ABSOLUTO = 1.0  # R$
+BLOCO_SERIES = 512
+# Só os dias mais recentes (os da atualização) bloqueiam; cobre uma semana sem rodar
+DIAS_BLOQUEIO = 7
+SEVERIDADES = ['aviso', 'critico']
+TOTAL = "(total)"
+RELATORIO_NOME = "anomalias_investimento.csv"
+MAX_LINHAS_TELA = 10
+
+# Fonte -> (atributo do relatório em blend, aba, coluna de investimento)
+ABAS_DIARIAS = {
+    'meta_yoy': ('META_REPORT_FILE', 'Meta_YoY', 'Investimento'),
+    'google_yoy': ('GOOGLE_REPORT_FILE', 'Google_YoY', 'Investimento_Google'),
+}
+# Fonte -> plataforma cujo canal (blend.CANAL_PLATAFORMA) é filtrado na Visao_Granular_Final
+CANAIS_BLEND = {'blend_meta': 'meta', 'blend_google': 'google'}
+
+
+# --- Séries ---
+
+def serie(df: pd.DataFrame, coluna_data: str, coluna_valor: str, fonte: str, coluna_campanha: str = None) -> pd.DataFrame:
+    """Série no formato longo [Fonte, Campanha, Data, Valor] (Campanha = TOTAL sem coluna_campanha)."""
+    return pd.DataFrame({
+        'Fonte': fonte,
+        'Campanha': df[coluna_campanha].astype(str) if coluna_campanha else TOTAL,
+        'Data': pd.to_datetime(df[coluna_data], errors='coerce').dt.normalize(),
+        'Valor': pd.to_numeric(df[coluna_valor], errors='coerce').fillna(0.0),
+    }).dropna(subset=['Data'])
+
+
+def series_relatorios() -> list:
+    """Totais diários das abas Meta_YoY / Google_YoY (relatório ausente = série ausente)."""
+    import leitura_xlsx
+
+    series = []
+    for fonte, (atributo, aba, coluna) in ABAS_DIARIAS.items():
+        path = getattr(blend, atributo)
+        if not path.exists():
+            print(f"    ⚠️  {fonte}: {path.name} não encontrado, série ignorada")
+            continue
+        nomes = ['Data', coluna]
+        df = leitura_xlsx.ler_aba(path, aba, lambda cabecalho: [cabecalho.index(n) if n in cabecalho else None for n in nomes])
+        if not set(nomes) <= set(df.columns):
+            print(f"    ⚠️  {fonte}: aba '{aba}' sem as colunas {nomes}, série ignorada")
+            continue
+        series.append(serie(df, 'Data', coluna, fonte))
+    return series
+
+
+def series_execucao(df_meta_agg: pd.DataFrame, df_google_agg: pd.DataFrame, df_granular: pd.DataFrame) -> pd.DataFrame:
+    """Todas as séries a partir do que o blend já tem em memória (mais as abas YoY)."""
+    series = series_relatorios()
+    series.append(serie(df_meta_agg, 'Data', 'Investimento_Meta', 'meta', 'Campanha_Merge_Key'))
+    series.append(serie(df_google_agg, 'Data', 'Investimento_Google', 'google', 'Termo_Merge_Key'))
+    origem = df_granular['Origem_Principal'].astype(str)
+    for fonte, plataforma in CANAIS_BLEND.items():
+        canal = blend.CANAL_PLATAFORMA[plataforma]
+        series.append(serie(df_granular[origem == canal], 'Data', 'Midia_Paga', fonte))
+    return pd.concat(series, ignore_index=True)
+
+
+# --- Detecção ---
+
+def matriz_diaria(series: pd.DataFrame) -> pd.DataFrame:
+    """
+    Dias x (Fonte, Campanha). Totais: 0 nos dias sem valor dentro do período da série,
+    NaN fora dele. Campanhas: NaN nos dias sem valor ou com 0 (campanha parada).
+    """
+    largo = series.pivot_table(index='Data', columns=['Fonte', 'Campanha'], values='Valor', aggfunc='sum')
+    largo = largo.reindex(pd.date_range(largo.index.min(), largo.index.max(), freq='D'))
+    total = largo.columns.get_level_values('Campanha') == TOTAL
+    presente = largo.notna()
+    ativo = presente.cummax() & presente[::-1].cummax()[::-1]
+    largo.loc[:, total] = largo.loc[:, total].mask(ativo.loc[:, total] & ~presente.loc[:, total], 0.0)
+    largo.loc[:, ~total] = largo.loc[:, ~total].mask(largo.loc[:, ~total] <= 0)
+    return largo
+
+
+def z_robusto(valores: np.ndarray, janela: int = JANELA_DIAS, min_dias: int = MIN_DIAS) -> tuple:
+    """
+    (mediana, MAD, z) de cada célula da matriz dias x séries contra os 'janela' dias
+    anteriores da mesma coluna. NaN onde a janela tem menos de min_dias valores ou
+    mediana 0 (série parada: qualquer gasto daria z enorme contra o piso absoluto).
+    """
+    n_dias, n_series = valores.shape
+    preenchido = np.vstack([np.full((janela, n_series), np.nan), valores])
+    # Linha t -> dias t-janela .. t-1 (o próprio dia fica fora da janela)
+    janelas = np.lib.stride_tricks.sliding_window_view(preenchido, janela, axis=0)[:n_dias]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # janelas só com NaN
+        mediana = np.nanmedian(janelas, axis=2)
+        mad = np.nanmedian(np.abs(janelas - mediana[..., None]), axis=2)
+    suficientes = ((~np.isnan(janelas)).sum(axis=2) >= min_dias) & (mediana != 0)
+    escala = np.maximum(mad, np.maximum(PISO_RELATIVO * np.abs(mediana), PISO_ABSOLUTO))
+    z = np.where(suficientes, 0.6745 * (valores - mediana) / escala, np.nan)
+    return mediana, mad, z
+
+
+def detectar(series: pd.DataFrame, janela: int = JANELA_DIAS, min_dias: int = MIN_DIAS,
+             limiar_aviso: float = LIMIAR_AVISO, limiar_critico: float = LIMIAR_CRITICO) -> pd.DataFrame:
+    """Dias com |z| >= limiar_aviso, com Mediana, MAD, Z, Severidade e Direcao."""
+    colunas = ['Fonte', 'Campanha', 'Data', 'Valor', 'Mediana', 'MAD', 'Z', 'Severidade', 'Direcao']
+    if series.empty:
+        return pd.DataFrame(columns=colunas)
+
+    largo = matriz_diaria(series)
+    valores = largo.to_numpy(dtype=float)
+    partes = []
+    for inicio in range(0, valores.shape[1], BLOCO_SERIES):
+        bloco = valores[:, inicio:inicio + BLOCO_SERIES]
+        mediana, mad, z = z_robusto(bloco, janela, min_dias)
+        with np.errstate(invalid='ignore'):
+            dias, cols = np.nonzero(np.abs(z) >= limiar_aviso)
+        partes.append(pd.DataFrame({
+            'Fonte': largo.columns.get_level_values('Fonte')[inicio + cols],
+            'Campanha': largo.columns.get_level_values('Campanha')[inicio + cols],
+            'Data': largo.index[dias],
+            'Valor': bloco[dias, cols],
+            'Mediana': mediana[dias, cols],
+            'MAD': mad[dias, cols],
+            'Z': z[dias, cols],
+        }))
+    sinalizados = pd.concat(partes, ignore_index=True)
+    sinalizados['Severidade'] = np.where(sinalizados['Z'].abs() >= limiar_critico, 'critico', 'aviso')
+    sinalizados['Direcao'] = np.where(sinalizados['Z'] > 0, 'alta', 'queda')
+    return sinalizados[colunas].sort_values(['Data', 'Fonte', 'Campanha'], ignore_index=True)
+
+
+def salvar_relatorio(sinalizados: pd.DataFrame, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sinalizados.to_csv(path, index=False, encoding="utf-8-sig", float_format="%.2f")
+
+
+def executar(series: pd.DataFrame, bloquear: str = 'critico', janela: int = JANELA_DIAS,
+             limiar_aviso: float = LIMIAR_AVISO, limiar_critico: float = LIMIAR_CRITICO,
+             dias_bloqueio: int = DIAS_BLOQUEIO) -> int:
+    """
+    Detecta, imprime o resumo e grava o relatório. Retorna 1 se houver anomalia >= bloquear
+    nos últimos dias_bloqueio dias das séries.
+    """
+    inicio = time.perf_counter()
+    print(f"\n🚨 Anomalias no investimento diário (janela de {janela} dias, z >= {limiar_aviso} / {limiar_critico})")
+    sinalizados = detectar(series, janela=janela, limiar_aviso=limiar_aviso, limiar_critico=limiar_critico)
+
+    n_series = series.groupby(['Fonte', 'Campanha']).ngroups if len(series) else 0
+    for fonte, grupo in sinalizados.groupby('Fonte', sort=True):
+        contagem = grupo['Severidade'].value_counts()
+        simbolo = "❌" if contagem.get('critico', 0) else "⚠️ "
+        print(f"    {simbolo} {fonte:<13} {contagem.get('critico', 0):>5} críticos | {contagem.get('aviso', 0):>5} avisos")
+
+    relatorio = blend.OUTPUT_DIR / RELATORIO_NOME
+    salvar_relatorio(sinalizados, relatorio)
+
+    bloqueantes = sinalizados.iloc[:0]
+    if bloquear in SEVERIDADES and len(series):
+        nivel = SEVERIDADES.index(bloquear)
+        desde = series['Data'].max() - pd.Timedelta(days=dias_bloqueio - 1)
+        bloqueantes = sinalizados[(sinalizados['Severidade'].map(SEVERIDADES.index) >= nivel)
+                                  & (sinalizados['Data'] >= desde)]
+    for l in bloqueantes.sort_values('Z', key=lambda z: z.abs(), ascending=False)[:MAX_LINHAS_TELA].itertuples():
+        print(f"       {l.Data:%Y-%m-%d} {l.Fonte}/{l.Campanha}: R$ {l.Valor:,.2f} "
+              f"(mediana R$ {l.Mediana:,.2f}, z {l.Z:+.1f}, {l.Direcao})")
+
+    print(f"    📄 Dias sinalizados: {relatorio}")
+    print(f"    ⏱️  {n_series:,} séries em {time.perf_counter() - inicio:.2f}s")
+    if len(bloqueantes):
+        print(f"❌ {len(bloqueantes)} dias com anomalia '{bloquear}' ou acima nos últimos {dias_bloqueio} dias.")
+        return 1
+    print(f"✅ Nenhuma anomalia bloqueante no investimento diário dos últimos {dias_bloqueio} dias.")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Dias anômalos no investimento diário (Meta, Google e blend).")
+    parser.add_argument("--blend", type=Path, default=None, help="xlsx do blend. Padrão: o mais recente em output/.")
+    parser.add_argument("--janela", type=int, default=JANELA_DIAS, help=f"Dias anteriores comparados. Padrão: {JANELA_DIAS}.")
+    parser.add_argument("--limiar-aviso", type=float, default=LIMIAR_AVISO, help=f"|z| de aviso. Padrão: {LIMIAR_AVISO}.")
+    parser.add_argument("--limiar-critico", type=float, default=LIMIAR_CRITICO, help=f"|z| crítico. Padrão: {LIMIAR_CRITICO}.")
+    parser.add_argument(
+        "--bloquear", choices=SEVERIDADES + ['nenhuma'], default='critico',
+        help="Severidade a partir da qual o código de saída é 1. Padrão: critico."
+    )
+    parser.add_argument(
+        "--dias-bloqueio", type=int, default=DIAS_BLOQUEIO,
+        help=f"Só anomalias nos últimos N dias bloqueiam (as mais antigas ficam só no relatório). Padrão: {DIAS_BLOQUEIO}."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import funil_coortes
+
+    args = parse_args(argv)
+    df_meta_agg, df_google_agg = blend.carregar_investimentos()
+    series = series_execucao(df_meta_agg, df_google_agg, funil_coortes.carregar_granular(args.blend))
+    sys.exit(executar(series, args.bloquear, args.janela, args.limiar_aviso, args.limiar_critico, args.dias_bloqueio))
+
+
+if __name__ == "__main__":
+    main()
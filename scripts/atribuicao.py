@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+atribuicao.py
+
+Modelos de atribuição do investimento aos negócios (alternativas à etapa 3.5
+do blend, que é do tipo último clique: cada negócio recebe só o investimento
+da sua chave de Detalhamento no dia de criação).
+
+Nos modelos daqui, o investimento do dia D na campanha C é espalhado pelos
+negócios da mesma campanha criados em [D, D + k]:
+
+    janela      partes iguais entre os negócios da janela;
+    decaimento  peso 0,5 ** ((t - D) / meia_vida) para o negócio criado em t,
+                normalizado para a soma dos pesos da janela dar 1.
+
+Investimento sem nenhum negócio na janela fica sem atribuição (aparece no
+resumo). Com k = 0 o modelo 'janela' divide o investimento do dia entre os
+negócios da campanha naquele dia.
+
+A campanha é a mesma chave do merge do blend: Merge_Key_Meta x
+Campanha_Merge_Key para o canal da plataforma meta, Merge_Key_Google x
+Termo_Merge_Key para o da google (canais de [plataformas] nas regras).
+
+Implementação sem laço por negócio: campanha e dia viram uma chave inteira
+ordenável (campanha * largura + dia), então "negócios da campanha C entre D e
+D + k" é um intervalo contíguo no array ordenado, achado com searchsorted.
+    - janela: contagem por intervalo (searchsorted) e soma acumulada (cumsum)
+      das cotas de investimento;
+    - decaimento: os pesos dependem da defasagem, então a soma é feita por
+      defasagem (k + 1 passagens vetorizadas) sobre as tabelas agregadas por
+      (campanha, dia). Somas acumuladas de exponenciais estourariam o float
+      em históricos de vários anos.
+
+Uso:
+    python scripts/analise_performance_hubspot.py --atribuicao janela --janela-dias 30
+    python scripts/analise_performance_hubspot.py --atribuicao decaimento --janela-dias 30 --meia-vida 7
+"""
+
+from __future__ import annotations
+
+from importacao_tardia import importar_tardio
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+MODELOS = ['ultimo_clique', 'janela', 'decaimento']
+JANELA_DIAS_PADRAO = 30
+MEIA_VIDA_PADRAO = 7.0
+
+# Plataforma -> (chave no HubSpot, chave na base de investimento, coluna de valor)
+PLATAFORMAS = {
+    'meta': ('Merge_Key_Meta', 'Campanha_Merge_Key', 'Investimento_Meta'),
+    'google': ('Merge_Key_Google', 'Termo_Merge_Key', 'Investimento_Google'),
+}
+
+
+def _dias(serie: pd.Series) -> tuple:
+    """Dias desde 1970 (int64) e máscara das datas válidas."""
+    datas = pd.to_datetime(serie, errors='coerce').to_numpy(dtype='datetime64[D]')
+    validas = ~np.isnat(datas)
+    return np.where(validas, datas, np.datetime64(0, 'D')).astype(np.int64), validas
+
+
+def _chaves(campanhas: np.ndarray, dias: np.ndarray, dia_min: int, largura: int) -> np.ndarray:
+    """Chave inteira ordenável (campanha, dia). A folga de k dias nas bordas fica dentro de 'largura'."""
+    return campanhas.astype(np.int64) * largura + (dias - dia_min)
+
+
+def atribuir_janela(chave_neg: np.ndarray, chave_inv: np.ndarray, valor_inv: np.ndarray, k: int) -> np.ndarray:
+    """Valor atribuído a cada negócio: cotas iguais do investimento de [t - k, t]."""
+    neg_ordenados = np.sort(chave_neg)
+    n_janela = np.searchsorted(neg_ordenados, chave_inv + k, 'right') - np.searchsorted(neg_ordenados, chave_inv, 'left')
+    cotas = np.where(n_janela > 0, valor_inv / np.maximum(n_janela, 1), 0.0)
+
+    ordem = np.argsort(chave_inv, kind='stable')
+    inv_ordenados = chave_inv[ordem]
+    acumulado = np.concatenate([[0.0], np.cumsum(cotas[ordem])])
+    fim = np.searchsorted(inv_ordenados, chave_neg, 'right')
+    inicio = np.searchsorted(inv_ordenados, chave_neg - k, 'left')
+    return acumulado[fim] - acumulado[inicio]
+
+
+def _buscar(chaves: np.ndarray, tabela: np.ndarray, valores: np.ndarray) -> np.ndarray:
+    """valores[tabela == chave] para cada chave (0 se ausente). 'tabela' ordenada e sem repetição."""
+    if len(tabela) == 0:
+        return np.zeros(len(chaves))
+    pos = np.minimum(np.searchsorted(tabela, chaves), len(tabela) - 1)
+    return np.where(tabela[pos] == chaves, valores[pos], 0.0)
+
+
+def atribuir_decaimento(chave_neg: np.ndarray, chave_inv: np.ndarray, valor_inv: np.ndarray,
+                        k: int, meia_vida: float) -> np.ndarray:
+    """Valor atribuído a cada negócio com pesos 0,5 ** (defasagem / meia_vida) dentro de [D, D + k]."""
+    pesos = 0.5 ** (np.arange(k + 1) / meia_vida)
+
+    # Negócios e investimento agregados por (campanha, dia)
+    neg_unicos, neg_codigos, neg_contagem = np.unique(chave_neg, return_inverse=True, return_counts=True)
+    inv_unicos, inv_codigos = np.unique(chave_inv, return_inverse=True)
+    inv_soma = np.bincount(inv_codigos, weights=valor_inv, minlength=len(inv_unicos))
+
+    # Soma dos pesos dos negócios na janela de cada (campanha, dia) de investimento
+    total_pesos = np.zeros(len(inv_unicos))
+    for defasagem, peso in enumerate(pesos):
+        total_pesos += peso * _buscar(inv_unicos + defasagem, neg_unicos, neg_contagem.astype(float))
+    por_peso = np.where(total_pesos > 0, inv_soma / np.where(total_pesos > 0, total_pesos, 1.0), 0.0)
+
+    # Cada (campanha, dia) de negócio recebe dos dias de investimento [t - k, t]
+    por_negocio = np.zeros(len(neg_unicos))
+    for defasagem, peso in enumerate(pesos):
+        por_negocio += peso * _buscar(neg_unicos - defasagem, inv_unicos, por_peso)
+    return por_negocio[neg_codigos]
+
+
+def atribuir(df_hub: pd.DataFrame, df_meta_agg: pd.DataFrame, df_google_agg: pd.DataFrame, canais: dict,
+             modelo: str, janela_dias: int = JANELA_DIAS_PADRAO, meia_vida: float = MEIA_VIDA_PADRAO) -> np.ndarray:
+    """
+    Midia_Paga por negócio (na ordem de df_hub) pelo modelo 'janela' ou 'decaimento'.
+    canais: plataforma -> Origem_Principal que recebe o investimento dela (CANAL_PLATAFORMA do blend).
+    """
+    if modelo not in ('janela', 'decaimento'):
+        raise ValueError(f"modelo de atribuição inválido: {modelo} (use janela ou decaimento)")
+    if janela_dias < 0 or meia_vida <= 0:
+        raise ValueError("janela_dias deve ser >= 0 e meia_vida > 0")
+
+    bases = {'meta': df_meta_agg, 'google': df_google_agg}
+    midia = np.zeros(len(df_hub))
+    origem = df_hub['Origem_Principal'].to_numpy(dtype=object)
+    dias_neg, validos_neg = _dias(df_hub['Data'])
+
+    print(f"\n🎯 Atribuição '{modelo}' (janela de {janela_dias} dias"
+          + (f", meia-vida de {meia_vida:g} dias)" if modelo == 'decaimento' else ")"))
+    for plataforma, (col_hub, col_inv, col_valor) in PLATAFORMAS.items():
+        canal = canais[plataforma]
+        df_inv = bases[plataforma]
+        negocios = np.flatnonzero((origem == canal) & validos_neg)
+        dias_inv, validos_inv = _dias(df_inv['Data'])
+        valor = pd.to_numeric(df_inv[col_valor], errors='coerce').fillna(0).to_numpy(dtype=float)
+        validos_inv &= valor != 0
+        if len(negocios) == 0 or not validos_inv.any():
+            print(f"    ⚠️  {canal}: sem negócios ou sem investimento para atribuir")
+            continue
+
+        # Códigos de campanha comuns aos dois lados
+        campanhas, _ = pd.factorize(np.concatenate([
+            df_hub[col_hub].to_numpy(dtype=object)[negocios],
+            df_inv[col_inv].to_numpy(dtype=object)[validos_inv],
+        ]))
+        camp_neg, camp_inv = campanhas[:len(negocios)], campanhas[len(negocios):]
+        d_neg, d_inv, v_inv = dias_neg[negocios], dias_inv[validos_inv], valor[validos_inv]
+
+        dia_min = min(d_neg.min(), d_inv.min()) - janela_dias
+        largura = max(d_neg.max(), d_inv.max()) + janela_dias - dia_min + 1
+        chave_neg = _chaves(camp_neg, d_neg, dia_min, largura)
+        chave_inv = _chaves(camp_inv, d_inv, dia_min, largura)
+
+        if modelo == 'janela':
+            valores = atribuir_janela(chave_neg, chave_inv, v_inv, janela_dias)
+        else:
+            valores = atribuir_decaimento(chave_neg, chave_inv, v_inv, janela_dias, meia_vida)
+        midia[negocios] = valores
+
+        total = v_inv.sum()
+        print(f"    ✅ {canal}: R$ {valores.sum():,.2f} de R$ {total:,.2f} atribuídos "
+              f"({valores.sum() / total:.1%}) a {len(negocios):,} negócios")
+    return midia
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_anomalias.py
+
+Tempo da detecção de anomalias (anomalias.py) em séries diárias sintéticas
+por campanha, com dias quebrados injetados (dia zerado, import em dobro), e
+conferência do z contra um cálculo série a série com np.median.
+
+Também roda o portão (executar) nas séries de uma execução sintética limpa
+(investimento e blend de dados_sinteticos, sem nada injetado), que não pode
+bloquear, e confere que dia injetado antigo só bloqueia dentro de
+--dias-bloqueio.
+
+Uso:
+    python scripts/benchmark_anomalias.py --campanhas 2000 --dias 760
+Retorna código 1 se um dia injetado não for sinalizado com a severidade
+esperada, se o z divergir da referência ou se o portão bloquear os dados
+limpos.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import analise_performance_hubspot as blend
+import anomalias
+import dados_sinteticos
+from paridade import constantes
+
+AMOSTRA_REFERENCIA = 20
+
+
+def gerar_series(n_campanhas: int, n_dias: int, seed: int = 13) -> pd.DataFrame:
+    """Investimento diário por campanha (cada uma com seu nível) + o total do dia."""
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range("2023-10-01", periods=n_dias, freq="D")
+    nivel = rng.uniform(50, 2000, n_campanhas)
+    valores = np.round(nivel * rng.lognormal(0, 0.15, (n_dias, n_campanhas)), 2)
+    df = pd.DataFrame({
+        'Fonte': 'google',
+        'Campanha': np.tile([f"campanha_{i:05d}" for i in range(n_campanhas)], n_dias),
+        'Data': np.repeat(datas, n_campanhas),
+        'Valor': valores.ravel(),
+    })
+    total = df.groupby('Data', as_index=False)['Valor'].sum().assign(Fonte='google_yoy', Campanha=anomalias.TOTAL)
+    return pd.concat([df, total], ignore_index=True)
+
+
+def injetar(series: pd.DataFrame) -> list:
+    """
+    Zera o total de um dia (linha removida, como na aba YoY), dobra o total de outro
+    (import em dobro) e dobra um dia de uma campanha. Retorna [(fonte, campanha, dia, severidade mínima)].
+    """
+    datas = np.sort(series['Data'].unique())
+    dia_zero, dia_dobro, dia_campanha = datas[len(datas) // 2], datas[-10], datas[-20]
+    total = series['Fonte'] == 'google_yoy'
+    series.loc[total & (series['Data'] == dia_dobro), 'Valor'] *= 2
+    series.loc[(series['Campanha'] == 'campanha_00007') & (series['Data'] == dia_campanha), 'Valor'] *= 2
+    series.drop(index=series.index[total & (series['Data'] == dia_zero)], inplace=True)
+    return [('google_yoy', anomalias.TOTAL, dia_zero, 'critico'), ('google_yoy', anomalias.TOTAL, dia_dobro, 'critico'),
+            ('google', 'campanha_00007', dia_campanha, 'aviso')]
+
+
+def z_referencia(valores: np.ndarray, janela: int, min_dias: int) -> np.ndarray:
+    """z de uma série, dia a dia, com np.median sobre a janela anterior."""
+    z = np.full(len(valores), np.nan)
+    for t in range(len(valores)):
+        janela_t = valores[max(0, t - janela):t]
+        janela_t = janela_t[~np.isnan(janela_t)]
+        if len(janela_t) < min_dias:
+            continue
+        mediana = np.median(janela_t)
+        if mediana == 0:
+            continue
+        mad = np.median(np.abs(janela_t - mediana))
+        escala = max(mad, anomalias.PISO_RELATIVO * abs(mediana), anomalias.PISO_ABSOLUTO)
+        z[t] = 0.6745 * (valores[t] - mediana) / escala
+    return z
+
+
+def series_limpas(linhas_hubspot: int) -> pd.DataFrame:
+    """Séries que o blend passaria ao portão numa execução sintética sem anomalia injetada."""
+    meta_agg, google_agg = dados_sinteticos.gerar_meta_agg(), dados_sinteticos.gerar_google_agg()
+    with contextlib.redirect_stdout(io.StringIO()):
+        hub = blend.preparar_hubspot(blend.clean_cols(dados_sinteticos.gerar_hubspot(linhas_hubspot)))
+        granular = blend.preparar_granular(blend.merge_investimento(hub, meta_agg, google_agg))
+    with constantes(anomalias, series_relatorios=lambda: []):
+        return anomalias.series_execucao(meta_agg, google_agg, granular)
+
+
+def portao(series: pd.DataFrame, **kwargs) -> int:
+    """Código de saída do executar(), com o relatório numa pasta temporária."""
+    with tempfile.TemporaryDirectory() as tmp, constantes(blend, OUTPUT_DIR=Path(tmp)), \
+         contextlib.redirect_stdout(io.StringIO()):
+        return anomalias.executar(series, bloquear='critico', **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da detecção de anomalias no investimento diário.")
+    parser.add_argument("--campanhas", type=int, default=2000, help="Campanhas (séries) sintéticas.")
+    parser.add_argument("--dias", type=int, default=760, help="Dias por série.")
+    parser.add_argument("--linhas-hubspot", type=int, default=200_000, help="Linhas do HubSpot sintético do caso limpo.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"🏁 BENCHMARK DE ANOMALIAS - {args.campanhas:,} campanhas x {args.dias:,} dias")
+    print("=" * 80)
+
+    series = gerar_series(args.campanhas, args.dias)
+    injetados = injetar(series)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        sinalizados = anomalias.detectar(series)
+        segundos = time.perf_counter() - inicio
+    print(f"\n⏱️  detectar: {segundos:.3f}s | {len(sinalizados):,} dias sinalizados "
+          f"({(sinalizados['Severidade'] == 'critico').sum():,} críticos)")
+
+    print("\n🔍 Dias injetados:")
+    ok = True
+    for fonte, campanha, dia, minima in injetados:
+        achado = sinalizados[(sinalizados['Fonte'] == fonte) & (sinalizados['Campanha'] == campanha) & (sinalizados['Data'] == dia)]
+        severidade = achado['Severidade'].iloc[0] if len(achado) else None
+        certo = severidade is not None and anomalias.SEVERIDADES.index(severidade) >= anomalias.SEVERIDADES.index(minima)
+        ok &= certo
+        detalhe = f"{severidade}, z {achado['Z'].iloc[0]:+.1f}" if len(achado) else "não sinalizado"
+        print(f"    {'✅' if certo else '❌'} {pd.Timestamp(dia):%Y-%m-%d} {fonte}/{campanha}: {detalhe} (esperado: {minima} ou acima)")
+
+    print(f"\n🔍 z contra a referência série a série ({AMOSTRA_REFERENCIA} séries):")
+    largo = anomalias.matriz_diaria(series)
+    valores = largo.to_numpy(dtype=float)
+    colunas = np.random.default_rng(1).choice(valores.shape[1], min(AMOSTRA_REFERENCIA, valores.shape[1]), replace=False)
+    _, _, z = anomalias.z_robusto(valores[:, colunas])
+    divergentes = 0
+    for i, c in enumerate(colunas):
+        esperado = z_referencia(valores[:, c], anomalias.JANELA_DIAS, anomalias.MIN_DIAS)
+        divergentes += not np.allclose(esperado, z[:, i], rtol=1e-9, atol=1e-9, equal_nan=True)
+    print(f"    {'✅' if not divergentes else '❌'} {len(colunas) - divergentes} de {len(colunas)} séries idênticas")
+    ok &= not divergentes
+
+    print("\n🔍 Portão (executar, bloquear=critico):")
+    limpas = series_limpas(args.linhas_hubspot)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sinalizados_limpos = anomalias.detectar(limpas)
+    codigo = portao(limpas)
+    ok &= codigo == 0
+    print(f"    {'✅' if codigo == 0 else '❌'} Execução sintética limpa ({limpas.groupby(['Fonte', 'Campanha']).ngroups:,} séries): "
+          f"{'não bloqueia' if codigo == 0 else 'bloqueia'} | {len(sinalizados_limpos):,} dias sinalizados "
+          f"({(sinalizados_limpos['Severidade'] == 'critico').sum():,} críticos)")
+
+    # O crítico injetado mais recente (datas[-10]) fica fora dos últimos DIAS_BLOQUEIO dias
+    antigo, recente = portao(series), portao(series, dias_bloqueio=15)
+    ok &= antigo == 0 and recente == 1
+    print(f"    {'✅' if antigo == 0 else '❌'} Críticos injetados há 10+ dias, --dias-bloqueio {anomalias.DIAS_BLOQUEIO}: "
+          f"{'não bloqueia' if antigo == 0 else 'bloqueia'}")
+    print(f"    {'✅' if recente == 1 else '❌'} Mesmos dias com --dias-bloqueio 15: {'bloqueia' if recente == 1 else 'não bloqueia'}")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_arrow.py
+
+Tempo de carga e memória (RSS) da Visao_Granular_Final lida do xlsx x do
+Arrow IPC mapeado (troca_arrow.py). Cada leitura roda em um processo novo,
+para o pico de RSS de uma não contaminar a outra.
+
+    xlsx         pd.read_excel da aba (como as etapas liam antes)
+    arrow_mmap   troca_arrow.abrir: tabela mapeada, sem cópia
+    arrow_pandas troca_arrow.ler_df: tabela mapeada convertida para pandas
+
+No arrow_mmap, o RSS inclui páginas do arquivo que o sistema compartilha
+entre todos os processos que mapeiam o mesmo .arrow.
+
+Uso:
+    python scripts/benchmark_arrow.py --linhas 300000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+MODOS = ['xlsx', 'arrow_mmap', 'arrow_pandas']
+
+
+def rss_mb() -> float:
+    """Pico de RSS do processo (ru_maxrss vem em KB no Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def medir(modo: str, xlsx: Path) -> dict:
+    """Roda dentro do processo filho: importa as bibliotecas, mede a base e depois a leitura."""
+    import pandas as pd
+    import pyarrow  # noqa: F401
+    import troca_arrow
+
+    base = rss_mb()
+    inicio = time.perf_counter()
+    if modo == 'xlsx':
+        linhas = len(pd.read_excel(xlsx, sheet_name='Visao_Granular_Final'))
+    elif modo == 'arrow_mmap':
+        linhas = troca_arrow.abrir(troca_arrow.caminho(xlsx, 'Visao_Granular_Final')).num_rows
+    else:
+        linhas = len(troca_arrow.ler_df(troca_arrow.caminho(xlsx, 'Visao_Granular_Final')))
+    return {'modo': modo, 'linhas': linhas, 'segundos': time.perf_counter() - inicio, 'rss_mb': rss_mb() - base}
+
+
+def gerar(n_linhas: int, pasta: Path) -> Path:
+    import pandas as pd
+
+    import analise_performance_hubspot as blend
+    import dados_sinteticos
+    import troca_arrow
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_hub_filtrado = blend.preparar_hubspot(blend.clean_cols(dados_sinteticos.gerar_hubspot(n_linhas)))
+        df_granular, _, _ = blend.executar_blend(
+            df_hub_filtrado, dados_sinteticos.gerar_meta_agg(), dados_sinteticos.gerar_google_agg()
+        )
+    xlsx = pasta / "granular.xlsx"
+    with pd.ExcelWriter(xlsx, engine='openpyxl') as writer:
+        df_granular.to_excel(writer, sheet_name='Visao_Granular_Final', index=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        troca_arrow.salvar(df_granular, xlsx, 'Visao_Granular_Final')
+    return xlsx
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga da visão granular: xlsx x Arrow IPC mapeado.")
+    parser.add_argument("--linhas", type=int, default=300_000, help="Linhas do HubSpot sintético.")
+    parser.add_argument("--medir", nargs=2, metavar=("MODO", "XLSX"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.medir:
+        print(json.dumps(medir(args.medir[0], Path(args.medir[1]))))
+        return
+
+    print("=" * 80)
+    print(f"🏁 BENCHMARK DE TROCA ENTRE ETAPAS - {args.linhas:,} negócios sintéticos")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = gerar(args.linhas, Path(tmp))
+        arrow = xlsx.with_name(f"{xlsx.stem}.Visao_Granular_Final.arrow")
+        print(f"    📦 xlsx: {xlsx.stat().st_size / 2**20:.1f} MB | arrow: {arrow.stat().st_size / 2**20:.1f} MB")
+
+        resultados = []
+        for modo in MODOS:
+            saida = subprocess.run(
+                [sys.executable, __file__, "--medir", modo, str(xlsx)],
+                capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+            )
+            resultados.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+
+    print("\n⏱️  Carga da Visao_Granular_Final (processo novo por leitura):")
+    xlsx_seg = resultados[0]['segundos']
+    for r in resultados:
+        print(f"    - {r['modo']:<13} {r['segundos']:8.3f}s ({xlsx_seg / max(r['segundos'], 1e-9):7.1f}x) "
+              f"| RSS +{r['rss_mb']:8.1f} MB | {r['linhas']:,} linhas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_atribuicao.py
+
+Tempo dos modelos de atribuição (atribuicao.py) numa base sintética e
+conferência contra uma implementação direta (laço por linha de investimento)
+numa amostra pequena.
+
+Uso:
+    python scripts/benchmark_atribuicao.py --linhas 1000000 --campanhas 220 --janela-dias 30
+Com 220 campanhas por plataforma, cada base de investimento tem ~100 mil linhas.
+Retorna código 1 se algum modelo divergir da referência.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import analise_performance_hubspot as blend
+import atribuicao
+import dados_sinteticos
+
+
+def referencia(df_hub: pd.DataFrame, df_meta_agg: pd.DataFrame, df_google_agg: pd.DataFrame, canais: dict,
+               modelo: str, janela_dias: int, meia_vida: float) -> np.ndarray:
+    """Mesma regra, linha a linha de investimento (lento; só para conferência)."""
+    bases = {'meta': df_meta_agg, 'google': df_google_agg}
+    midia = np.zeros(len(df_hub))
+    dias_neg = df_hub['Data'].to_numpy(dtype='datetime64[D]')
+    for plataforma, (col_hub, col_inv, col_valor) in atribuicao.PLATAFORMAS.items():
+        do_canal = (df_hub['Origem_Principal'] == canais[plataforma]).to_numpy()
+        for data, chave, valor in bases[plataforma][['Data', col_inv, col_valor]].itertuples(index=False):
+            dia = np.datetime64(data, 'D')
+            defasagem = (dias_neg - dia).astype(int)
+            na_janela = do_canal & (df_hub[col_hub] == chave).to_numpy() & (defasagem >= 0) & (defasagem <= janela_dias)
+            if not na_janela.any():
+                continue
+            pesos = np.where(na_janela, 1.0 if modelo == 'janela' else 0.5 ** (defasagem / meia_vida), 0.0)
+            midia += valor * pesos / pesos.sum()
+    return midia
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos modelos de atribuição.")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Linhas do HubSpot sintético.")
+    parser.add_argument("--campanhas", type=int, default=220, help="Campanhas por plataforma.")
+    parser.add_argument("--janela-dias", type=int, default=30)
+    parser.add_argument("--meia-vida", type=float, default=7.0)
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"🏁 BENCHMARK DE ATRIBUIÇÃO - {args.linhas:,} negócios, {args.campanhas} campanhas por plataforma")
+    print("=" * 80)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_hub = blend.preparar_hubspot(blend.clean_cols(
+            dados_sinteticos.gerar_hubspot(args.linhas, n_campanhas=args.campanhas)
+        ))
+        df_meta_agg = dados_sinteticos.gerar_meta_agg(n_campanhas=args.campanhas)
+        df_google_agg = dados_sinteticos.gerar_google_agg(n_campanhas=args.campanhas)
+    print(f"    📦 {len(df_hub):,} negócios | {len(df_meta_agg):,} linhas Meta | {len(df_google_agg):,} linhas Google")
+
+    canais = blend.CANAL_PLATAFORMA
+    ok = True
+    amostra = df_hub.sample(min(len(df_hub), 3000), random_state=1).reset_index(drop=True)
+    meta_amostra = df_meta_agg.sample(min(len(df_meta_agg), 1500), random_state=1)
+    google_amostra = df_google_agg.sample(min(len(df_google_agg), 1500), random_state=1)
+
+    for modelo in ('janela', 'decaimento'):
+        parametros = dict(modelo=modelo, janela_dias=args.janela_dias, meia_vida=args.meia_vida)
+
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            midia = atribuicao.atribuir(df_hub, df_meta_agg, df_google_agg, canais, **parametros)
+        segundos = time.perf_counter() - inicio
+        total = df_meta_agg['Investimento_Meta'].sum() + df_google_agg['Investimento_Google'].sum()
+        print(f"\n⏱️  {modelo}: {segundos:6.2f}s | R$ {midia.sum():,.2f} de R$ {total:,.2f} atribuídos")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            obtido = atribuicao.atribuir(amostra, meta_amostra, google_amostra, canais, **parametros)
+        esperado = referencia(amostra, meta_amostra, google_amostra, canais, **parametros)
+        if np.allclose(obtido, esperado, rtol=1e-9, atol=1e-6):
+            print(f"    ✅ Igual à referência na amostra ({len(amostra):,} negócios)")
+        else:
+            ok = False
+            diferenca = np.abs(obtido - esperado).max()
+            print(f"    ❌ Diverge da referência na amostra (maior diferença: {diferenca:,.6f})")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
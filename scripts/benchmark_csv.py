@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_csv.py
+
+Tempo de leitura do export do HubSpot: read_any (parser python, um núcleo)
+x csv_paralelo.ler_csv com 1, 2, 4... processos, e paridade de cada leitura
+paralela com o read_any.
+
+O CSV sintético tem uma coluna de observações com vírgulas, aspas escapadas
+("") e quebras de linha dentro de aspas em parte das linhas, para exercitar
+os cortes em fim de registro.
+
+Uso:
+    python scripts/benchmark_csv.py --linhas 2000000 --processos 1 2 4 8
+    python scripts/benchmark_csv.py --arquivo data/hubspot_dataset.csv
+Retorna código 1 se alguma leitura paralela divergir do read_any.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import analise_performance_hubspot as blend
+import csv_paralelo
+import dados_sinteticos
+from benchmark_engines import comparar_abas
+
+OBSERVACOES = [
+    None,
+    "Retornar contato",
+    'Aluno pediu "bolsa", ver com a unidade',
+    "Ligou duas vezes,\nsem resposta",
+    'Linha 1\n"Linha 2", com aspas\r\nLinha 3',
+]
+
+
+def gerar(n_linhas: int, path: Path) -> Path:
+    rng = np.random.default_rng(17)
+    df = dados_sinteticos.gerar_hubspot(n_linhas)
+    df["Observações"] = rng.choice(np.array(OBSERVACOES, dtype=object), n_linhas, p=[0.6, 0.2, 0.1, 0.05, 0.05])
+    df.to_csv(path, index=False, encoding="utf-8")
+    return path
+
+
+def cronometrar(funcao):
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        df = funcao()
+        return df, time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da leitura paralela do CSV do HubSpot.")
+    parser.add_argument("--linhas", type=int, default=2_000_000, help="Linhas do CSV sintético.")
+    parser.add_argument("--arquivo", type=Path, help="Usa um export real do HubSpot.")
+    parser.add_argument("--processos", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}),
+                        help="Números de processos a medir.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("🏁 BENCHMARK DE LEITURA PARALELA DO CSV - HubSpot")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.arquivo or gerar(args.linhas, Path(tmp) / blend.HUBSPOT_FILE.name)
+        tamanho_mb = path.stat().st_size / 2**20
+        print(f"    📦 {path.name}: {tamanho_mb:,.1f} MB")
+
+        referencia, t_ref = cronometrar(lambda: blend.read_any(path))
+        print(f"\n⏱️  read_any (referência): {t_ref:8.2f}s ({tamanho_mb / t_ref:7.1f} MB/s) | {len(referencia):,} linhas")
+
+        ok = True
+        for processos in args.processos:
+            df, segundos = cronometrar(lambda: csv_paralelo.ler_csv(path, processos=processos))
+            print(f"    - {processos:>2} processo(s): {segundos:8.2f}s ({tamanho_mb / segundos:7.1f} MB/s, "
+                  f"{t_ref / segundos:5.1f}x)")
+            ok &= comparar_abas(referencia, df, f"{processos} processo(s) x read_any")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
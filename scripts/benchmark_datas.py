@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_datas.py
+
+Benchmark da conversão de datas: pd.to_datetime(errors='coerce') sem formato
+(como era feito) x datas.converter_datas (formato detectado por fonte).
+
+Para cada cenário gera uma coluna sintética com a data verdadeira conhecida e
+mostra tempo, quantos valores viraram NaT e quantos saíram com dia/mês trocados.
+
+Uso:
+    python scripts/benchmark_datas.py --linhas 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import datas
+
+CENARIOS = {
+    'dd/mm/aaaa HH:MM (HubSpot)': '%d/%m/%Y %H:%M',
+    'aaaa-mm-dd (Meta/Google)': '%Y-%m-%d',
+    'aaaa-mm-dd HH:MM:SS': '%Y-%m-%d %H:%M:%S',
+}
+FRACAO_INVALIDOS = 0.01
+
+
+def gerar_coluna(n_linhas: int, formato: str, seed: int = 0) -> tuple:
+    """Retorna (coluna de texto, datas verdadeiras). ~1% das linhas são texto inválido."""
+    rng = np.random.default_rng(seed)
+    inicio = np.datetime64('2023-01-01T00:00')
+    minutos = rng.integers(0, 2 * 365 * 24 * 60, n_linhas)
+    # Datas com hora ficam com minuto cheio; sem hora, só o dia
+    verdade = pd.Series(inicio + minutos.astype('timedelta64[m]'))
+    if '%H' not in formato:
+        verdade = verdade.dt.normalize()
+    texto = verdade.dt.strftime(formato).astype(object)
+
+    invalidos = rng.random(n_linhas) < FRACAO_INVALIDOS
+    texto[invalidos] = 'sem data'
+    verdade = verdade.mask(invalidos)
+    return texto, verdade
+
+
+def medir(funcao, texto: pd.Series) -> tuple:
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter('ignore')
+        inicio = time.perf_counter()
+        resultado = funcao(texto)
+        duracao = time.perf_counter() - inicio
+    return resultado, duracao
+
+
+def avaliar(resultado: pd.Series, verdade: pd.Series) -> dict:
+    resultado = pd.Series(np.asarray(resultado, dtype='datetime64[ns]'))
+    validos = verdade.notna()
+    trocados = validos & resultado.notna() & (resultado.dt.normalize() != verdade.dt.normalize())
+    return {
+        'NaT': int(resultado.isna().sum()),
+        'NaT_esperado': int((~validos).sum()),
+        'Dia_mes_trocados': int(trocados.sum()),
+        'Diferentes': int((validos & (resultado != verdade)).sum()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da conversão de datas (pandas puro x formato detectado).")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Linhas por cenário.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"🏁 BENCHMARK DE DATAS - {args.linhas:,} linhas por cenário")
+    print("=" * 80)
+
+    for nome, formato in CENARIOS.items():
+        texto, verdade = gerar_coluna(args.linhas, formato)
+        legado, t_legado = medir(lambda s: pd.to_datetime(s, errors='coerce'), texto)
+        novo, t_novo = medir(lambda s: datas.converter_datas(s, nome), texto)
+        r_legado, r_novo = avaliar(legado, verdade), avaliar(novo, verdade)
+
+        print(f"\n📅 {nome} (formato detectado: {datas.FORMATOS_DETECTADOS.get(nome)})")
+        print(f"    ⏱️  to_datetime: {t_legado:7.2f}s | converter_datas: {t_novo:7.2f}s  ({t_legado / t_novo:.1f}x)")
+        for rotulo, r in (('to_datetime', r_legado), ('converter_datas', r_novo)):
+            print(f"    {rotulo:>16}: NaT {r['NaT']:,} (esperado {r['NaT_esperado']:,}) | "
+                  f"dia/mês trocados {r['Dia_mes_trocados']:,} | diferentes {r['Diferentes']:,}")
+
+    print("\n📋 Relatório de conversões:")
+    print(datas.relatorio_datas().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_deduplicacao.py
+
+Tempo da remoção de duplicados do HubSpot (deduplicacao.py) numa base
+sintética (com nome do negócio, sem ID) e uma fração de negócios
+reexportados em outra etapa, conferência contra o groupby do pandas e
+orçamento de tempo (ORCAMENTO_POR_MILHAO segundos por milhão de linhas).
+
+Uso:
+    python scripts/benchmark_deduplicacao.py --linhas 2000000 --fracao 0.05
+Retorna código 1 se o resultado divergir da referência ou passar do orçamento.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import analise_performance_hubspot as blend
+import dados_sinteticos
+import deduplicacao
+import mapeamento
+
+# Orçamento do deduplicar: < 1s para 2M de linhas
+ORCAMENTO_POR_MILHAO = 0.5
+
+
+def base_com_duplicados(n_linhas: int, fracao: float, seed: int = 5) -> pd.DataFrame:
+    """Export sintético + cópias de uma fração das linhas em outra etapa do funil."""
+    rng = np.random.default_rng(seed)
+    df = dados_sinteticos.gerar_hubspot(n_linhas)
+    df["Nome do negócio"] = "Negócio " + pd.Series(np.arange(n_linhas)).astype(str)
+    copias = df.sample(frac=fracao, random_state=seed).copy()
+    copias["Etapa do negócio"] = [
+        f"{e} ({p})" for e, p in zip(rng.choice(dados_sinteticos.ETAPAS, len(copias)), copias["Pipeline"])
+    ]
+    df = pd.concat([df, copias], ignore_index=True).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    df = blend.clean_cols(df)
+    status_base = mapeamento.aplicar_em_unicos(df[blend.find_col(df, blend.COLUNAS_HUBSPOT['status'])], blend.extract_status_base)
+    df['Status_Principal'] = mapeamento.mapear_dict(status_base, blend.ETAPA_FUNIL_MAP, blend.DEFAULT_NA_TEXT)
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da remoção de duplicados do HubSpot.")
+    parser.add_argument("--linhas", type=int, default=2_000_000, help="Linhas do HubSpot sintético.")
+    parser.add_argument("--fracao", type=float, default=0.05, help="Fração de linhas reexportadas.")
+    parser.add_argument("--orcamento", type=float, default=None,
+                        help=f"Segundos permitidos ao deduplicar. Padrão: {ORCAMENTO_POR_MILHAO}s por milhão de linhas.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"🏁 BENCHMARK DE DEDUPLICAÇÃO - {args.linhas:,} negócios + {args.fracao:.0%} duplicados")
+    print("=" * 80)
+
+    df = base_com_duplicados(args.linhas, args.fracao)
+    colunas = blend.colunas_identidade(df)
+    ordem_status = list(blend.ETAPA_FUNIL_MAP.values())
+    print(f"    📦 {len(df):,} linhas | identidade: {', '.join(colunas)}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        sem_duplicados, removidas = deduplicacao.deduplicar(df, colunas, ordem_status)
+        segundos = time.perf_counter() - inicio
+    orcamento = args.orcamento or ORCAMENTO_POR_MILHAO * len(df) / 1e6
+    dentro = segundos <= orcamento
+    print(f"\n⏱️  deduplicar: {segundos:.3f}s {'✅' if dentro else '❌'} (orçamento {orcamento:.2f}s) | "
+          f"{len(removidas):,} linhas removidas")
+
+    # Referência: uma linha por identidade, com o maior status da identidade
+    rank = deduplicacao.ranking_status(df['Status_Principal'], ordem_status)
+    esperado = df[colunas].assign(Rank=rank).groupby(colunas, dropna=False)['Rank'].max().sort_values()
+    rank_obtido = deduplicacao.ranking_status(sem_duplicados['Status_Principal'], ordem_status)
+    obtido = sem_duplicados[colunas].assign(Rank=rank_obtido).set_index(colunas)['Rank'].sort_values()
+
+    ok = len(obtido) == len(esperado) and (obtido.to_numpy() == esperado.to_numpy()).all()
+    print(f"    {'✅' if ok else '❌'} {len(obtido):,} negócios únicos (referência: {len(esperado):,}), "
+          f"status mais avançado {'mantido' if ok else 'divergente'}")
+    if not (ok and dentro):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
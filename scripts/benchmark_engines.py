@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_engines.py
+
+Paridade do blend HubSpot em pandas com a conferência em SQL (engine_duckdb.py).
+Gera uma base sintética, roda as etapas 3.5 a 3.8 nas duas implementações,
+compara Visao_Granular_Final, Blend_Agregado_Dash e Agregado_Matriculas_Fechamento
+célula a célula e mostra o tempo de cada uma (o SQL não é um caminho de produção).
+
+Uso:
+    python scripts/benchmark_engines.py --linhas 500000
+Retorna código 1 se alguma aba divergir.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+import pandas as pd
+
+import analise_performance_hubspot as blend
+import dados_sinteticos
+import engine_duckdb
+
+ABAS = ["Visao_Granular_Final", "Blend_Agregado_Dash", "Agregado_Matriculas_Fechamento"]
+
+
+def sem_categoricos(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte colunas categóricas para object (o que vai para a planilha são os valores)."""
+    cats = {c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}
+    return df.astype(cats).reset_index(drop=True)
+
+
+def comparar_abas(esperado: pd.DataFrame, obtido: pd.DataFrame, nome: str,
+                  rtol: float = 1e-9, atol: float = 1e-6) -> bool:
+    """Compara duas abas célula a célula (tolerância para floats)."""
+    try:
+        pd.testing.assert_frame_equal(
+            sem_categoricos(esperado), sem_categoricos(obtido),
+            check_dtype=False, check_exact=False, rtol=rtol, atol=atol,
+        )
+        print(f"    ✅ {nome}: idêntica ({len(esperado)} linhas)")
+        return True
+    except AssertionError as e:
+        print(f"    ❌ {nome}: divergente")
+        print(f"       {str(e).splitlines()[0]}")
+        return False
+
+
+def cronometrar(executar_blend, df_hub_filtrado, df_meta_agg, df_google_agg):
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        saidas = executar_blend(df_hub_filtrado.copy(), df_meta_agg, df_google_agg)
+        duracao = time.perf_counter() - inicio
+    return saidas, duracao
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paridade e benchmark pandas x duckdb do blend.")
+    parser.add_argument("--linhas", type=int, default=200_000, help="Linhas do HubSpot sintético.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"🏁 BENCHMARK DE ENGINES - {args.linhas:,} negócios sintéticos")
+    print("=" * 80)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_hub = blend.clean_cols(dados_sinteticos.gerar_hubspot(args.linhas))
+        df_hub_filtrado = blend.preparar_hubspot(df_hub)
+    df_meta_agg = dados_sinteticos.gerar_meta_agg()
+    df_google_agg = dados_sinteticos.gerar_google_agg()
+    print(f"    📦 {len(df_hub_filtrado):,} negócios de mídia paga | "
+          f"{len(df_meta_agg):,} linhas Meta | {len(df_google_agg):,} linhas Google")
+
+    saidas_pandas, t_pandas = cronometrar(blend.executar_blend, df_hub_filtrado, df_meta_agg, df_google_agg)
+    saidas_duckdb, t_duckdb = cronometrar(engine_duckdb.executar_blend, df_hub_filtrado, df_meta_agg, df_google_agg)
+
+    print("\n🔍 Paridade:")
+    ok = all([comparar_abas(e, o, nome) for e, o, nome in zip(saidas_pandas, saidas_duckdb, ABAS)])
+
+    print("\n⏱️  Tempo (etapas 3.5 a 3.8):")
+    print(f"    - pandas: {t_pandas:8.2f}s")
+    print(f"    - duckdb: {t_duckdb:8.2f}s  ({t_pandas / t_duckdb:.1f}x)")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
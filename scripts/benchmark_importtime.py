@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_importtime.py
+
+Mede o custo de import do CLI e dos scripts com 'python -X importtime' e
+confere o orçamento:
+    - import de midiapaga + scripts abaixo de ORCAMENTO_IMPORT_MS (mediana de
+      --repeticoes execuções, depois de compilar os .pyc: sem eles cada
+      execução recompila os scripts e mede o compilador, não o import);
+    - nenhuma biblioteca pesada (BIBLIOTECAS_PESADAS) carregada só pelo import;
+    - 'midiapaga inspect meta google' (só CSV) abaixo de ORCAMENTO_INSPECT_MS.
+
+Uso:
+    python scripts/benchmark_importtime.py
+Retorna código 1 se o orçamento for estourado.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+BASE_DIR = SCRIPTS_DIR.parent
+
+MODULOS = ["midiapaga", "analise_performance_meta_teste", "analise_performance_google", "analise_performance_hubspot"]
+BIBLIOTECAS_PESADAS = ["pandas", "numpy", "openpyxl", "polars", "duckdb", "pyarrow"]
+# Medido: ~10 ms numa máquina de desenvolvimento; o orçamento deixa folga para máquinas mais lentas
+ORCAMENTO_IMPORT_MS = 50
+ORCAMENTO_INSPECT_MS = 250
+
+
+def medir_importtime(modulos: list) -> list:
+    """Roda 'python -X importtime' e retorna [(nome, self_us, cumulativo_us, nivel)]."""
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True,
+    )
+    linhas = []
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        self_us, cumulativo_us, nome = linha[len("import time:"):].split("|")
+        # Cada nível de import aninhado acrescenta 2 espaços antes do nome
+        nivel = (len(nome) - len(nome.lstrip(" ")) - 1) // 2
+        linhas.append((nome.strip(), int(self_us), int(cumulativo_us), nivel))
+    return linhas
+
+
+def compilar_scripts():
+    """Grava os .pyc dos scripts antes de medir (um .pyc velho faz cada import recompilar o módulo)."""
+    subprocess.run([sys.executable, "-m", "compileall", "-q", str(SCRIPTS_DIR)], capture_output=True, check=False)
+
+
+def medir_comando(argv: list, repeticoes: int) -> float:
+    """Mediana do tempo de parede (ms) de um comando do CLI, rodando da raiz do projeto."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, str(SCRIPTS_DIR / "midiapaga.py"), *argv],
+                       cwd=BASE_DIR, capture_output=True, env=dict(os.environ))
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Orçamento de tempo de import do CLI midiapaga.")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções do import e do inspect para a mediana.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("⏱️  ORÇAMENTO DE IMPORT - midiapaga")
+    print("=" * 80)
+
+    compilar_scripts()
+    medicoes = []
+    for _ in range(max(args.repeticoes, 1)):
+        linhas = medir_importtime(MODULOS)
+        total_ms = sum(cum for nome, _, cum, nivel in linhas if nivel == 0 and nome in MODULOS) / 1000
+        medicoes.append((total_ms, linhas))
+    # Detalhe da execução mediana
+    total_ms, linhas = sorted(medicoes, key=lambda m: m[0])[len(medicoes) // 2]
+    carregadas = sorted({nome.split(".")[0] for nome, *_ in linhas} & set(BIBLIOTECAS_PESADAS))
+
+    print(f"\n📦 Import de {', '.join(MODULOS)}: {total_ms:.1f} ms (mediana de {len(medicoes)}, "
+          f"orçamento {ORCAMENTO_IMPORT_MS} ms)")
+    print("   Maiores custos próprios:")
+    for nome, self_us, _, _ in sorted(linhas, key=lambda l: -l[1])[:8]:
+        print(f"     {self_us / 1000:7.2f} ms  {nome}")
+
+    ok = total_ms <= ORCAMENTO_IMPORT_MS
+    if carregadas:
+        print(f"❌ Bibliotecas pesadas carregadas no import: {carregadas}")
+        ok = False
+    else:
+        print("✅ Nenhuma biblioteca pesada carregada no import")
+
+    inspect_ms = medir_comando(["inspect", "meta", "google"], args.repeticoes)
+    print(f"\n🔎 'midiapaga inspect meta google': {inspect_ms:.0f} ms (orçamento {ORCAMENTO_INSPECT_MS} ms, inclui o interpretador)")
+    ok &= inspect_ms <= ORCAMENTO_INSPECT_MS
+
+    print("\n✅ Dentro do orçamento." if ok else "\n❌ Orçamento estourado.")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
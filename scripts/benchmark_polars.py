@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_polars.py
+
+Paridade e benchmark do processamento Meta/Google (pandas x polars).
+Gera exports sintéticos, roda os dois engines, compara a aba *_Completo e a
+agregação diária (*_YoY) e mostra o tempo de cada um.
+
+Uso:
+    python scripts/benchmark_polars.py --linhas 1000000
+    python scripts/benchmark_polars.py --arquivo-google data/googleads_dataset.csv
+Retorna código 1 se alguma saída divergir.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import analise_performance_google as google
+import analise_performance_meta_teste as meta
+import dados_sinteticos
+from benchmark_engines import comparar_abas
+
+
+def cronometrar(modulo, path: Path, engine: str):
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        saidas = modulo.processar(path, engine=engine)
+        duracao = time.perf_counter() - inicio
+    return saidas, duracao
+
+
+def comparar(nome: str, modulo, path: Path, abas: list) -> bool:
+    print(f"\n📊 {nome} ({path.name})")
+    saidas_pandas, t_pandas = cronometrar(modulo, path, "pandas")
+    saidas_polars, t_polars = cronometrar(modulo, path, "polars")
+
+    ok = all([comparar_abas(e, o, aba) for e, o, aba in zip(saidas_pandas, saidas_polars, abas)])
+    print(f"    ⏱️  pandas: {t_pandas:7.2f}s | polars: {t_polars:7.2f}s  ({t_pandas / t_polars:.1f}x)")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paridade e benchmark pandas x polars (Meta/Google).")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Linhas dos exports sintéticos.")
+    parser.add_argument("--arquivo-google", type=Path, help="Usa um export real do Google Ads.")
+    parser.add_argument("--arquivo-meta", type=Path, help="Usa um export real do Meta Ads.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("🏁 BENCHMARK PANDAS x POLARS - Meta/Google")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        arq_google = args.arquivo_google
+        arq_meta = args.arquivo_meta
+        if arq_google is None:
+            arq_google = dados_sinteticos.gerar_export_google(Path(tmp) / "googleads_dataset.csv", args.linhas)
+        if arq_meta is None:
+            arq_meta = dados_sinteticos.gerar_export_meta(Path(tmp) / "meta_dataset.csv", args.linhas)
+
+        ok_google = comparar("Google Ads", google, arq_google, ["Google_Completo", "Google_YoY"])
+        ok_meta = comparar("Meta Ads", meta, arq_meta, ["Meta_Completo", "Meta_YoY"])
+
+    if not (ok_google and ok_meta):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_saida.py
+
+Tamanho e tempo de gravação da Visao_Granular_Final: aba xlsx (saída atual)
+x esquema estrela em Parquet e CSV.gz (saida_estrela.py).
+Gera uma base sintética e roda o blend pandas para obter a visão granular.
+
+Uso:
+    python scripts/benchmark_saida.py --linhas 200000
+Retorna código 1 se a fato + dimensões não reconstruírem a visão granular.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import analise_performance_hubspot as blend
+import dados_sinteticos
+import saida_estrela
+from benchmark_engines import comparar_abas
+
+
+def reconstruir(tabelas: dict) -> pd.DataFrame:
+    """Junta as dimensões de volta na fato (o que o Looker Studio faz no blend)."""
+    df = tabelas[saida_estrela.TABELA_FATO]
+    for nome, (chave, _) in saida_estrela.DIMENSOES.items():
+        df = df.merge(tabelas[nome], on=chave, how='left').drop(columns=chave)
+    return df
+
+
+def gravar_xlsx(df: pd.DataFrame, path: Path) -> float:
+    inicio = time.perf_counter()
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Visao_Granular_Final', index=False)
+    return time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark xlsx x esquema estrela (Parquet/CSV.gz).")
+    parser.add_argument("--linhas", type=int, default=200_000, help="Linhas do HubSpot sintético.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"🏁 BENCHMARK DE SAÍDA - {args.linhas:,} negócios sintéticos")
+    print("=" * 80)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_hub_filtrado = blend.preparar_hubspot(blend.clean_cols(dados_sinteticos.gerar_hubspot(args.linhas)))
+        df_granular, _, _ = blend.executar_blend(
+            df_hub_filtrado, dados_sinteticos.gerar_meta_agg(), dados_sinteticos.gerar_google_agg()
+        )
+    print(f"    📦 Visao_Granular_Final: {len(df_granular):,} linhas x {len(df_granular.columns)} colunas")
+
+    print("\n🔍 Paridade (fato + dimensões -> visão granular):")
+    reconstruida = reconstruir(saida_estrela.montar_estrela(df_granular))[df_granular.columns]
+    ok = comparar_abas(df_granular, reconstruida, "Visao_Granular_Final")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = Path(tmp) / "granular.xlsx"
+        segundos_xlsx = gravar_xlsx(df_granular, xlsx)
+        for formato in saida_estrela.FORMATOS:
+            with contextlib.redirect_stdout(io.StringIO()):
+                resumo = saida_estrela.salvar_estrela(df_granular, Path(tmp) / formato.replace('.', '_'), formato)
+            print(f"\n📊 {formato}")
+            saida_estrela.imprimir_comparacao(resumo, xlsx.stat().st_size, segundos_xlsx)
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
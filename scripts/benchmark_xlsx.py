@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_xlsx.py
+
+Tempo de leitura da aba Google_Completo por motor de leitura_xlsx.py
+(pd.read_excel da aba inteira x calamine x openpyxl read_only só com as
+colunas usadas) e conferência do investimento agregado que
+carregar_investimentos() produz com cada motor.
+
+A planilha sintética é gerada como o script do Google grava o
+google_dashboard.xlsx (Google_YoY + Google_Completo), a partir de um export
+sintético processado pelo próprio script.
+
+Uso:
+    python scripts/benchmark_xlsx.py --linhas 500000
+    python scripts/benchmark_xlsx.py --arquivo outputs/google_dashboard.xlsx
+Retorna código 1 se algum motor divergir do pd.read_excel.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import analise_performance_google as google
+import analise_performance_hubspot as blend
+import dados_sinteticos
+import leitura_xlsx
+import troca_arrow
+from benchmark_engines import comparar_abas
+from paridade import constantes
+
+
+def gerar(n_linhas: int, pasta: Path) -> Path:
+    """google_dashboard.xlsx sintético com as abas Google_YoY e Google_Completo."""
+    export = dados_sinteticos.gerar_export_google(pasta / google.FILE_PATH.name, n_linhas)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, df_daily_agg = google.processar(export)
+    path = pasta / blend.GOOGLE_REPORT_FILE.name
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        df_daily_agg.to_excel(writer, sheet_name='Google_YoY', index=False, float_format='%.2f')
+        df.to_excel(writer, sheet_name=blend.GOOGLE_SHEET_NAME, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de leitura da aba Google_Completo.")
+    parser.add_argument("--linhas", type=int, default=500_000, help="Linhas da Google_Completo sintética.")
+    parser.add_argument("--arquivo", type=Path, help="Usa um google_dashboard.xlsx real.")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("🏁 BENCHMARK DE LEITURA XLSX - Google_Completo")
+    print("=" * 80)
+
+    motores = [m for m in leitura_xlsx.MOTORES if leitura_xlsx.disponivel(m)]
+    for motor in sorted(set(leitura_xlsx.MOTORES) - set(motores)):
+        print(f"    ⏭️  {motor}: pulado (não instalado)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.arquivo
+        if path is None:
+            inicio = time.perf_counter()
+            path = gerar(args.linhas, Path(tmp))
+            print(f"    📦 Planilha sintética gerada em {time.perf_counter() - inicio:.1f}s")
+        print(f"    📦 {path.name}: {path.stat().st_size / 2**20:.1f} MB")
+
+        resolver = blend.resolver_relatorio(blend.COLUNAS_GOOGLE_RELATORIO)
+        tempos, agregados = {}, {}
+        for motor in ['pandas'] + [m for m in motores if m != 'pandas']:
+            with contextlib.redirect_stdout(io.StringIO()):
+                inicio = time.perf_counter()
+                df = leitura_xlsx.ler_aba(path, blend.GOOGLE_SHEET_NAME, resolver, motor=motor)
+                tempos[motor] = (time.perf_counter() - inicio, df.shape)
+                # Sem o Meta e ignorando .arrow: carregar_investimentos lê só esta aba, pelo motor escolhido
+                with constantes(leitura_xlsx, MOTOR=motor), constantes(troca_arrow, atual=lambda *_: False), \
+                     constantes(blend, META_REPORT_FILE=Path(tmp) / "sem_meta.xlsx", GOOGLE_REPORT_FILE=path):
+                    agregados[motor] = blend.carregar_investimentos()[1]
+
+    print("\n⏱️  Leitura da aba (colunas usadas pelo blend):")
+    base = tempos['pandas'][0]
+    for motor, (segundos, (linhas, colunas)) in tempos.items():
+        print(f"    - {motor:<16} {segundos:8.2f}s ({base / max(segundos, 1e-9):5.1f}x) | {linhas:,} linhas x {colunas} colunas")
+
+    print("\n🔍 Paridade do investimento Google agregado (carregar_investimentos) com o pd.read_excel:")
+    ok = all([comparar_abas(agregados['pandas'], agregados[m], m) for m in agregados if m != 'pandas'])
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+cabecalhos.py
+
+Inspeção rápida dos exports (sem pandas): lê só o cabeçalho e as primeiras
+N linhas de cada fonte. Usada por 'midiapaga inspect/validate', pelo
+--dry-run dos scripts e como pré-validação antes da leitura completa.
+
+CSV: pula as linhas de preâmbulo, detecta o separador com csv.Sniffer (como
+o sep=None do pandas) e lê só AMOSTRA_LINHAS linhas.
+Excel: lê só as primeiras linhas da aba com openpyxl em modo read_only.
+
+Para cada campo (data, investimento, campanha, status, RVO...) a inspeção
+informa a coluna escolhida, as outras colunas que também casariam (ambíguas)
+e se os valores da amostra têm cara do tipo esperado.
+"""
+
+import itertools
+import sys
+import time
+from pathlib import Path
+
+ENCODINGS = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252']
+AMOSTRA_LINHAS = 200
+# Fração mínima de valores válidos na amostra para o campo ser aceito
+MIN_VALIDOS_AMOSTRA = 0.5
+
+# Tipo esperado de cada campo (nome em minúsculas) para a conferência da amostra
+TIPO_POR_CAMPO = {
+    'data': 'data',
+    'data_criacao': 'data',
+    'data_fechamento': 'data',
+    'investimento': 'numero',
+    'conversoes': 'numero',
+    'rvo': 'numero',
+}
+
+
+# =====================================================================
+# --- Leitura da amostra ---
+# =====================================================================
+
+def _ler_csv(path: Path, n_linhas: int, skip_rows: int, sep: str, encoding: str) -> tuple:
+    import csv
+
+    with open(path, "r", encoding=encoding, newline="") as f:
+        for _ in range(skip_rows):
+            f.readline()
+        cabecalho = f.readline()
+        if encoding == 'utf-8':
+            cabecalho = cabecalho.lstrip('\ufeff')
+        if sep is None:
+            try:
+                sep = csv.Sniffer().sniff(cabecalho).delimiter
+            except csv.Error:
+                sep = ','
+        colunas = next(csv.reader([cabecalho], delimiter=sep), [])
+        linhas = list(itertools.islice(csv.reader(f, delimiter=sep), n_linhas))
+    return colunas, linhas
+
+
+def ler_amostra_csv(path: Path, n_linhas: int = AMOSTRA_LINHAS, skip_rows: int = 0, sep: str = None) -> tuple:
+    """Retorna (colunas, primeiras n_linhas linhas) do CSV."""
+    for encoding in ENCODINGS:
+        try:
+            return _ler_csv(path, n_linhas, skip_rows, sep, encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("Não foi possível decodificar o arquivo com os encodings testados")
+
+
+def ler_amostra_excel(path: Path, n_linhas: int = AMOSTRA_LINHAS, sheet_name=0) -> tuple:
+    """Retorna (colunas, primeiras n_linhas linhas) da aba."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        linhas = ws.iter_rows(min_row=1, max_row=n_linhas + 1, values_only=True)
+        primeira = next(linhas, ())
+        n = len(primeira)
+        while n and primeira[n - 1] is None:
+            n -= 1
+        return list(primeira[:n]), [list(l[:n]) for l in linhas]
+    finally:
+        wb.close()
+
+
+def ler_amostra(path: Path, n_linhas: int = AMOSTRA_LINHAS, skip_rows: int = 0, sep: str = None, sheet_name=0) -> tuple:
+    path = Path(path)
+    if path.suffix.lower() in ('.xlsx', '.xls'):
+        return ler_amostra_excel(path, n_linhas, sheet_name)
+    return ler_amostra_csv(path, n_linhas, skip_rows, sep)
+
+
+def ler_cabecalho(path: Path, skip_rows: int = 0, sep: str = None, sheet_name=0) -> list:
+    return ler_amostra(path, 0, skip_rows, sep, sheet_name)[0]
+
+
+# =====================================================================
+# --- Resolução de colunas ---
+# =====================================================================
+
+def candidatas_por_nome(colunas: list, nomes: list) -> list:
+    """Colunas presentes na lista de nomes aceitos, na ordem de prioridade dos nomes."""
+    return [n for n in nomes if n in colunas]
+
+
+def candidatas_find_col(colunas: list, keywords: list) -> list:
+    """
+    Todas as colunas que o find_col aceitaria, no mesmo nível de busca em que
+    ele decide (exata, sem caixa, substring). A primeira é a que ele escolhe.
+    """
+    exatas = [k for k in keywords if k in colunas]
+    if exatas:
+        return exatas
+
+    cols_map = {str(c).strip().lower(): str(c) for c in colunas}
+    sem_caixa = list(dict.fromkeys(cols_map[k.strip().lower()] for k in keywords if k.strip().lower() in cols_map))
+    if sem_caixa:
+        return sem_caixa
+
+    return [str(c) for c in colunas if any(k.strip().lower() in str(c).strip().lower() for k in keywords)]
+
+
+# =====================================================================
+# --- Conferência dos valores da amostra ---
+# =====================================================================
+
+def _parece_data(v, formatos: list) -> bool:
+    from datetime import datetime
+
+    if isinstance(v, datetime):
+        return True
+    s = str(v).strip()
+    for formato in formatos:
+        try:
+            if formato == 'ISO8601':
+                datetime.fromisoformat(s)
+            else:
+                datetime.strptime(s, formato)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+def parece_numero(v) -> bool:
+    """Número simples ou em formato brasileiro (1.234,56), com ou sem 'R$'/aspas."""
+    if isinstance(v, (int, float)):
+        return True
+    s = str(v).strip().replace('R$', '').replace(' ', '').replace('"', '')
+    if "." in s and "," in s:
+        s = s.replace(".", "").replace(",", ".")
+    else:
+        s = s.replace(",", ".")
+    try:
+        float(s)
+        return True
+    except ValueError:
+        return False
+
+
+def taxa_validos(valores: list, tipo: str):
+    """Fração dos valores não vazios da amostra que parecem do tipo (None se todos vazios)."""
+    valores = [v for v in valores if v is not None and str(v).strip() != '']
+    if not valores:
+        return None
+    if tipo == 'data':
+        from datas import FORMATOS_CANDIDATOS
+        return sum(_parece_data(v, FORMATOS_CANDIDATOS) for v in valores) / len(valores)
+    return sum(parece_numero(v) for v in valores) / len(valores)
+
+
+# =====================================================================
+# --- Inspeção (inspect / validate / --dry-run / pré-validação) ---
+# =====================================================================
+
+def inspecao(fonte: str, path: Path, colunas=None, candidatas=None, obrigatorias=(), erro=None,
+             opcional=False, invalidas=None, n_linhas=0) -> dict:
+    candidatas = candidatas or {}
+    detectadas = {campo: (c[0] if c else None) for campo, c in candidatas.items()}
+    return {
+        'fonte': fonte,
+        'arquivo': str(path),
+        'colunas': list(colunas or []),
+        'linhas_amostra': n_linhas,
+        'detectadas': detectadas,
+        'ambiguas': {campo: c for campo, c in candidatas.items() if len(c) > 1},
+        'invalidas': invalidas or {},
+        'faltando': [] if erro else [campo for campo in obrigatorias if not detectadas.get(campo)],
+        'obrigatorias': list(obrigatorias),
+        'erro': erro,
+        'opcional': opcional,
+    }
+
+
+def inspecionar_arquivo(fonte: str, path: Path, detectar, obrigatorias, opcional=False, normalizar=None,
+                        n_linhas: int = AMOSTRA_LINHAS, **leitura) -> dict:
+    """
+    Lê o cabeçalho e as primeiras n_linhas de 'path' e aplica
+    detectar(colunas, linhas) -> {campo: [colunas candidatas em ordem de prioridade]}.
+    normalizar: função aplicada aos nomes antes do detectar (a mesma do script).
+    opcional=True: arquivo ausente é só aviso (ex: relatórios de investimento do blend).
+    """
+    path = Path(path)
+    if not path.exists():
+        return inspecao(fonte, path, obrigatorias=obrigatorias, erro="arquivo não encontrado", opcional=opcional)
+    try:
+        brutas, linhas = ler_amostra(path, n_linhas, **leitura)
+    except Exception as e:
+        return inspecao(fonte, path, obrigatorias=obrigatorias, erro=str(e), opcional=opcional)
+
+    colunas = [normalizar(c) for c in brutas] if normalizar else [str(c) for c in brutas]
+    candidatas = detectar(colunas, linhas)
+
+    invalidas = {}
+    for campo, cands in candidatas.items():
+        tipo = TIPO_POR_CAMPO.get(campo.lower())
+        if not cands or tipo is None or cands[0] not in colunas:
+            continue
+        i = colunas.index(cands[0])
+        taxa = taxa_validos([l[i] if i < len(l) else None for l in linhas], tipo)
+        if taxa is not None and taxa < MIN_VALIDOS_AMOSTRA:
+            invalidas[campo] = taxa
+
+    return inspecao(fonte, path, brutas, candidatas, obrigatorias, opcional=opcional,
+                    invalidas=invalidas, n_linhas=len(linhas))
+
+
+def inspecao_ok(resultado: dict) -> bool:
+    if resultado['erro']:
+        return resultado['opcional'] and resultado['erro'] == "arquivo não encontrado"
+    invalida_obrigatoria = any(c in resultado['obrigatorias'] for c in resultado['invalidas'])
+    return not resultado['faltando'] and not invalida_obrigatoria
+
+
+def imprimir_inspecoes(resultados: list) -> int:
+    """Imprime o resultado de cada fonte. Retorna 0 se tudo estiver ok, senão 1 (código de saída)."""
+    for r in resultados:
+        print(f"\n🔎 {r['fonte']}: {r['arquivo']}")
+        if r['erro']:
+            simbolo = "⚠️ " if inspecao_ok(r) else "❌"
+            print(f"    {simbolo} {r['erro']}")
+            continue
+        print(f"    📋 {len(r['colunas'])} colunas, {r['linhas_amostra']} linhas de amostra: {r['colunas']}")
+        for campo, coluna in r['detectadas'].items():
+            if not coluna:
+                print(f"    {'❌' if campo in r['faltando'] else '➖'} {campo:<16} não encontrada")
+                continue
+            print(f"    ✅ {campo:<16} <- '{coluna}'")
+            if campo in r['ambiguas']:
+                print(f"       ⚠️  ambígua: também casam {r['ambiguas'][campo][1:]}")
+            if campo in r['invalidas']:
+                simbolo = "❌" if campo in r['obrigatorias'] else "⚠️ "
+                print(f"       {simbolo} só {r['invalidas'][campo]:.0%} da amostra tem o formato esperado")
+    return 0 if all(inspecao_ok(r) for r in resultados) else 1
+
+
+def resumir_problemas(r: dict) -> str:
+    if r['erro']:
+        return r['erro']
+    partes = []
+    if r['faltando']:
+        partes.append(f"campos obrigatórios não encontrados: {r['faltando']}")
+    if r['invalidas']:
+        partes.append(f"valores fora do formato na amostra: {sorted(r['invalidas'])}")
+    if r['ambiguas']:
+        partes.append(f"colunas ambíguas: {sorted(r['ambiguas'])}")
+    return "; ".join(partes)
+
+
+def preflight(inspecionar_fontes):
+    """
+    Pré-validação antes da leitura completa: roda inspecionar_fontes() e, se
+    alguma fonte falhar, mostra o detalhe e encerra com código 1 (em
+    milissegundos, sem ler o arquivo todo).
+    """
+    inicio = time.perf_counter()
+    resultados = inspecionar_fontes()
+    if not all(inspecao_ok(r) for r in resultados):
+        print("\n❌ Pré-validação falhou: o export não tem o formato esperado.")
+        imprimir_inspecoes(resultados)
+        sys.exit(1)
+
+    print(f"✅ Pré-validação das entradas ok em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    for r in resultados:
+        problemas = resumir_problemas(r)
+        if problemas:
+            print(f"    ⚠️  {r['fonte']}: {problemas}")
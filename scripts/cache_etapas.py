@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+cache_etapas.py
+
+Cache local por conteúdo para as etapas do pipeline (Meta, Google, preparação
+do HubSpot e blend). Cada etapa gera uma chave a partir de:
+    - hash dos bytes dos arquivos de entrada e do código (arquivos_codigo: o
+      script e todos os módulos locais que ele importa, inclusive os imports
+      dentro de funções, como engines e leitores);
+    - configuração da etapa (constantes de negócio, abas, engine, etc.).
+Se a chave já existir no cache, o resultado processado é carregado direto do
+disco e toda a leitura/limpeza é pulada.
+
+Para não reler arquivos grandes a cada execução, o hash de cada arquivo fica
+guardado junto com mtime e tamanho; se os dois não mudaram, o hash é reaproveitado.
+
+O cache é limitado por tamanho total: quando passa do limite, os itens usados
+há mais tempo são removidos (LRU).
+
+Em processos de longa duração (servico_pipeline.py) dá para ligar também um
+cache em memória com ativar_memoria(): o último resultado de cada etapa fica
+no processo e é devolvido sem reler o pickle do disco.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+
+try:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+except NameError:
+    BASE_DIR = Path.cwd()
+
+CACHE_DIR = BASE_DIR / ".cache" / "etapas"
+INDICE_HASHES_FILE = CACHE_DIR / "indice_hashes.json"
+CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+VERSAO_CACHE = 1  # Incrementar quando o formato dos itens mudar
+
+BLOCO_LEITURA = 8 * 1024 * 1024
+
+# Cache em memória: etapa -> (chave, resultado). Só o último resultado de cada etapa.
+MEMORIA = {}
+MEMORIA_ATIVA = False
+
+
+def ativar_memoria():
+    """Liga o cache em memória (para processos que rodam várias vezes o pipeline)."""
+    global MEMORIA_ATIVA
+    MEMORIA_ATIVA = True
+
+
+def etapas_em_memoria() -> dict:
+    return {etapa: chave[:12] for etapa, (chave, _) in MEMORIA.items()}
+
+
+def _carregar_indice() -> dict:
+    try:
+        with open(INDICE_HASHES_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _salvar_indice(indice: dict):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Temporário por processo: execuções em paralelo (lote_marcas.py) gravam o mesmo índice
+    tmp = INDICE_HASHES_FILE.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(indice, f)
+    os.replace(tmp, INDICE_HASHES_FILE)
+
+
+def hash_arquivo(path: Path, indice: dict = None) -> str:
+    """
+    Retorna o sha256 dos bytes do arquivo. Usa mtime + tamanho como caminho
+    rápido: se não mudaram desde a última vez, devolve o hash guardado.
+    """
+    path = Path(path)
+    if not path.exists():
+        return "ausente"
+
+    salvar = indice is None
+    if indice is None:
+        indice = _carregar_indice()
+
+    st = path.stat()
+    chave = str(path.resolve())
+    registro = indice.get(chave)
+    if registro and registro["mtime_ns"] == st.st_mtime_ns and registro["size"] == st.st_size:
+        return registro["sha256"]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(BLOCO_LEITURA), b""):
+            h.update(bloco)
+    digest = h.hexdigest()
+
+    indice[chave] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+    if salvar:
+        _salvar_indice(indice)
+    return digest
+
+
+def arquivos_codigo(script: Path) -> list:
+    """
+    O script e os módulos da mesma pasta que ele importa, direta ou indiretamente
+    (imports de topo e dentro de funções, lidos com ast sem executar nada).
+    Módulo novo importado pela etapa entra na chave sem ajustar lista nenhuma.
+    """
+    script = Path(script).resolve()
+    pasta = script.parent
+    encontrados = {script}
+    pendentes = [script]
+    while pendentes:
+        arvore = ast.parse(pendentes.pop().read_bytes())
+        for no in ast.walk(arvore):
+            if isinstance(no, ast.Import):
+                nomes = [alias.name for alias in no.names]
+            elif isinstance(no, ast.ImportFrom) and no.level == 0 and no.module:
+                nomes = [no.module]
+            else:
+                continue
+            for nome in nomes:
+                path = pasta / f"{nome.split('.')[0]}.py"
+                if path not in encontrados and path.exists():
+                    encontrados.add(path)
+                    pendentes.append(path)
+    return sorted(encontrados)
+
+
+def chave_etapa(etapa: str, arquivos: list, config: dict = None) -> str:
+    """Gera a chave de cache da etapa a partir dos arquivos de entrada e da configuração."""
+    import pandas as pd
+
+    indice = _carregar_indice()
+    hashes = [[Path(a).name, hash_arquivo(a, indice)] for a in arquivos]
+    _salvar_indice(indice)
+
+    conteudo = json.dumps({
+        "etapa": etapa,
+        "versao": VERSAO_CACHE,
+        "pandas": pd.__version__,
+        "arquivos": hashes,
+        "config": config or {},
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def _caminho_item(etapa: str, chave: str) -> Path:
+    return CACHE_DIR / f"{etapa}_{chave[:24]}.pkl"
+
+
+def carregar(etapa: str, chave: str):
+    """Carrega o resultado da etapa do cache (ou None se não existir)."""
+    path = _caminho_item(etapa, chave)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            resultado = pickle.load(f)
+    except Exception as e:
+        print(f"    ⚠️  Cache corrompido para '{etapa}' ({e}). Reprocessando...")
+        path.unlink(missing_ok=True)
+        return None
+    # Marca o item como usado agora (base do LRU)
+    os.utime(path, None)
+    return resultado
+
+
+def salvar(etapa: str, chave: str, resultado):
+    """Grava o resultado da etapa no cache e aplica o limite de tamanho."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _caminho_item(etapa, chave)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    evictar()
+
+
+def evictar(max_bytes: int = None):
+    """Remove os itens menos usados até o cache caber em max_bytes."""
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    itens = [(p, p.stat()) for p in CACHE_DIR.glob("*.pkl")]
+    total = sum(st.st_size for _, st in itens)
+    if total <= max_bytes:
+        return
+
+    for path, st in sorted(itens, key=lambda item: item[1].st_mtime):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= st.st_size
+        print(f"    🧹 Cache: '{path.name}' removido (LRU)")
+
+
+def executar_em_cache(etapa: str, arquivos: list, config: dict, funcao, usar_cache: bool = True):
+    """
+    Executa funcao() só se o resultado da etapa ainda não estiver no cache.
+    arquivos: entradas cujo conteúdo define o resultado (inclua o próprio script).
+    """
+    if not usar_cache:
+        return funcao()
+
+    chave = chave_etapa(etapa, arquivos, config)
+    if MEMORIA_ATIVA and etapa in MEMORIA and MEMORIA[etapa][0] == chave:
+        print(f"\n♻️  Cache: etapa '{etapa}' sem mudanças nas entradas. Resultado em memória ({chave[:12]}).")
+        return MEMORIA[etapa][1]
+
+    resultado = carregar(etapa, chave)
+    if resultado is not None:
+        print(f"\n♻️  Cache: etapa '{etapa}' sem mudanças nas entradas. Resultado reaproveitado ({chave[:12]}).")
+    else:
+        resultado = funcao()
+        try:
+            salvar(etapa, chave, resultado)
+            print(f"    💾 Cache: etapa '{etapa}' salva ({chave[:12]}).")
+        except Exception as e:
+            print(f"    ⚠️  Não foi possível salvar o cache da etapa '{etapa}': {e}", file=sys.stderr)
+
+    if MEMORIA_ATIVA:
+        MEMORIA[etapa] = (chave, resultado)
+    return resultado
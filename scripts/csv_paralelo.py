@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+csv_paralelo.py
+
+Leitura de CSV grande (export do HubSpot) em paralelo, por faixas de bytes.
+
+1. O cabeçalho é resolvido uma vez: separador (csv.Sniffer, como o sep=None
+   do read_any), nomes das colunas (pelo próprio pandas) e início dos dados.
+2. O arquivo é cortado em PARTES_POR_PROCESSO faixas por processo. Cada corte
+   avança até a próxima quebra de linha fora de aspas: uma quebra é fim de
+   registro se o número de aspas antes dela é par (aspas escapadas "" contam
+   duas vezes). A contagem é uma passada sequencial de bytes.count, sem
+   decodificar nem parsear; aspas e '\\n' são o mesmo byte em utf-8, latin1
+   e cp1252.
+3. Cada faixa é lida num processo do pool com o parser C, as colunas já
+   resolvidas e float_precision='round_trip' (mesmos floats do parser python).
+4. As partes são concatenadas em ordem. Uma coluna que saiu numérica numa
+   parte e texto em outra (o read_any inteiro a deixaria como texto) é relida
+   como texto nas partes em que saiu numérica, sem perder zeros à esquerda.
+
+Encoding: utf-8 e depois os outros de cabecalhos.ENCODINGS, como o read_any.
+Assume aspas no padrão RFC 4180 (campo com aspas ou quebra de linha vem entre
+aspas), que é o formato do export do HubSpot.
+
+Uso:
+    (automático em carregar_hubspot para CSV acima de LIMIAR_MB)
+    python scripts/benchmark_csv.py --linhas 2000000 --processos 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+import cabecalhos
+import pool_processos
+
+pd = importar_tardio("pandas")
+
+LIMIAR_MB = 256
+PARTES_POR_PROCESSO = 4
+BLOCO_BYTES = 16 * 2**20
+ASPAS = b'"'
+
+
+def usar(path: Path) -> bool:
+    """CSV grande o bastante para compensar o pool (e mais de um núcleo)."""
+    path = Path(path)
+    return (path.suffix.lower() == ".csv" and (os.cpu_count() or 1) > 1
+            and path.stat().st_size >= LIMIAR_MB * 2**20)
+
+
+# --- Cortes em fim de registro ---
+
+def _contar_aspas(f, inicio: int, fim: int) -> int:
+    f.seek(inicio)
+    total, restante = 0, fim - inicio
+    while restante > 0:
+        bloco = f.read(min(BLOCO_BYTES, restante))
+        if not bloco:
+            break
+        total += bloco.count(ASPAS)
+        restante -= len(bloco)
+    return total
+
+
+def proximo_registro(f, posicao: int, aspas: int) -> int:
+    """Início do primeiro registro depois de 'posicao', sabendo quantas aspas vêm antes dela."""
+    f.seek(posicao)
+    while True:
+        bloco = f.read(BLOCO_BYTES)
+        if not bloco:
+            return posicao
+        inicio = 0
+        while (quebra := bloco.find(b"\n", inicio)) >= 0:
+            aspas += bloco.count(ASPAS, inicio, quebra)
+            if aspas % 2 == 0:
+                return posicao + quebra + 1
+            inicio = quebra + 1
+        aspas += bloco.count(ASPAS, inicio)
+        posicao += len(bloco)
+
+
+def faixas(path: Path, inicio_dados: int, n_partes: int) -> list:
+    """[(início, fim)] em bytes, cada uma com registros inteiros, cobrindo [inicio_dados, tamanho)."""
+    tamanho = Path(path).stat().st_size
+    cortes = [inicio_dados]
+    with open(path, "rb") as f:
+        aspas = _contar_aspas(f, 0, inicio_dados)
+        lido_ate = inicio_dados
+        for k in range(1, n_partes):
+            alvo = inicio_dados + (tamanho - inicio_dados) * k // n_partes
+            if alvo <= cortes[-1]:
+                continue
+            aspas += _contar_aspas(f, lido_ate, alvo)
+            lido_ate = alvo
+            cortes.append(proximo_registro(f, alvo, aspas))
+    cortes.append(tamanho)
+    return [(a, b) for a, b in zip(cortes, cortes[1:]) if b > a]
+
+
+def esquema(path: Path, skip_rows: int, encoding: str) -> tuple:
+    """(colunas, separador, início dos dados em bytes)."""
+    with open(path, "rb") as f:
+        posicao = 0
+        for _ in range(skip_rows + 1):
+            posicao = proximo_registro(f, posicao, 0)
+        f.seek(0)
+        topo = f.read(posicao)
+    linha_cabecalho = topo.decode(encoding).splitlines()[skip_rows] if topo else ""
+    try:
+        sep = csv.Sniffer().sniff(linha_cabecalho.lstrip("\ufeff")).delimiter
+    except csv.Error:
+        sep = ","
+    colunas = pd.read_csv(io.BytesIO(topo), sep=sep, encoding=encoding, skiprows=skip_rows, nrows=0).columns
+    return list(colunas), sep, posicao
+
+
+# --- Leitura das partes ---
+
+def ler_parte(tarefa: tuple) -> pd.DataFrame:
+    """Roda no pool: parseia os bytes [início, fim) com as colunas já resolvidas."""
+    path, inicio, fim, colunas, sep, encoding, dtype = tarefa
+    with open(path, "rb") as f:
+        f.seek(inicio)
+        dados = f.read(fim - inicio)
+    try:
+        return pd.read_csv(io.BytesIO(dados), sep=sep, header=None, names=colunas, encoding=encoding,
+                           dtype=dtype, float_precision="round_trip")
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame({c: pd.Series(dtype=object) for c in colunas})
+
+
+def colunas_mistas(partes: list, colunas: list) -> list:
+    """Colunas numéricas numa parte e texto (ou bool) em outra: a leitura inteira daria texto."""
+    mistas = []
+    for coluna in colunas:
+        tipos = {p[coluna].dtype.kind for p in partes if p[coluna].notna().any()}
+        if tipos & {'i', 'f'} and tipos & {'O', 'b'}:
+            mistas.append(coluna)
+    return mistas
+
+
+def _ler(path: Path, processos: int, skip_rows: int, encoding: str) -> pd.DataFrame:
+    colunas, sep, inicio_dados = esquema(path, skip_rows, encoding)
+    tarefas = [(str(path), a, b, colunas, sep, encoding, None)
+               for a, b in faixas(path, inicio_dados, processos * PARTES_POR_PROCESSO)]
+    print(f"    📂 Lendo {Path(path).name} em {len(tarefas)} faixas ({processos} processo(s), encoding {encoding})")
+
+    with ProcessPoolExecutor(max_workers=processos, mp_context=pool_processos.contexto_pool()) as pool:
+        partes = list(pool.map(ler_parte, tarefas))
+        mistas = colunas_mistas(partes, colunas)
+        if mistas:
+            texto = {c: str for c in mistas}
+            refazer = [i for i, p in enumerate(partes) if any(p[c].dtype.kind != 'O' for c in mistas)]
+            print(f"    🔁 Colunas com tipos diferentes entre faixas, relidas como texto: {', '.join(mistas)}")
+            novas = pool.map(ler_parte, [tarefas[i][:-1] + (texto,) for i in refazer])
+            for i, parte in zip(refazer, novas):
+                partes[i] = parte
+
+    if not partes:
+        return pd.DataFrame(columns=colunas)
+    return pd.concat(partes, ignore_index=True)
+
+
+def ler_csv(path: Path, processos: int = None, skip_rows: int = 0) -> pd.DataFrame:
+    """Mesmo DataFrame do read_any (CSV), com o parse dividido entre 'processos' processos."""
+    processos = processos or os.cpu_count() or 1
+    for encoding in cabecalhos.ENCODINGS:
+        try:
+            df = _ler(Path(path), processos, skip_rows, encoding)
+            print(f"    ✅ Arquivo lido com encoding: {encoding}")
+            return df
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("Não foi possível decodificar o arquivo com os encodings testados")
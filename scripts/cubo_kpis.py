@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+cubo_kpis.py
+
+Cubo de KPIs pré-agregado em quatro grãos (dia, semana ISO, mês e ciclo de
+captação), por Canal e Unidade, para o dashboard não recalcular razões sobre
+a Visao_Granular_Final.
+
+Medidas (somas):
+    Investimento   Midia_Paga
+    Leads          todos os negócios criados (Total_Negocios, como o Count_Leads do blend)
+    Negocios       negócios em etapa de negócio (blend.ETAPAS_NEGOCIO, das regras: da
+                   etapa_negocio em diante na ordem do funil, sem perdidos nem não mapeados)
+    Matriculas     matrículas, na data de criação do negócio
+    RVO            RVO
+
+Razões (recalculadas em cada grão a partir das somas, 0 quando o divisor é 0,
+como o CPL_Google do script do Google):
+    CPL, Custo_por_Negocio, Custo_por_Matricula, ROAS (RVO / Investimento)
+
+Só o grão diário lê a visão granular. Os outros saem do grão imediatamente
+mais fino que os contém: dia -> semana, dia -> mês -> ciclo (semanas ISO
+cruzam meses, por isso o mês vem do dia e não da semana).
+
+Uso:
+    python scripts/analise_performance_hubspot.py --kpis
+    python scripts/cubo_kpis.py [--blend arquivo.xlsx] [--formato parquet|csv.gz]
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+import analise_performance_hubspot as blend
+import saida_estrela
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+# Coluna da visão granular -> nome no cubo
+DIMENSOES = {'Origem_Principal': 'Canal', 'Unidade': 'Unidade'}
+MEDIDAS = ['Investimento', 'Leads', 'Negocios', 'Matriculas', 'RVO']
+# Razão -> (numerador, denominador)
+RAZOES = {
+    'CPL': ('Investimento', 'Leads'),
+    'Custo_por_Negocio': ('Investimento', 'Negocios'),
+    'Custo_por_Matricula': ('Investimento', 'Matriculas'),
+    'ROAS': ('RVO', 'Investimento'),
+}
+GRAOS = ['dia', 'semana', 'mes', 'ciclo']
+KPIS_BASE_NAME = "kpis"
+
+
+def dividir(numerador: pd.Series, denominador: pd.Series) -> pd.Series:
+    """Divisão segura: 0 quando o denominador é 0."""
+    return (numerador / denominador.where(denominador != 0)).fillna(0)
+
+
+def com_razoes(df: pd.DataFrame) -> pd.DataFrame:
+    for razao, (numerador, denominador) in RAZOES.items():
+        df[razao] = dividir(df[numerador], df[denominador])
+    return df
+
+
+def base_diaria(df_granular: pd.DataFrame) -> pd.DataFrame:
+    """Somas por (Data, Canal, Unidade): a única agregação sobre a visão granular."""
+    df = pd.DataFrame({
+        'Data': df_granular['Data'].dt.normalize(),
+        **{nome: df_granular[coluna].astype(str) for coluna, nome in DIMENSOES.items()},
+        'Investimento': df_granular['Midia_Paga'],
+        'Leads': df_granular['Total_Negocios'],
+        'Negocios': df_granular['Status_Principal'].astype(str).isin(blend.ETAPAS_NEGOCIO).astype('int64'),
+        'Matriculas': df_granular['Matriculas'],
+        'RVO': df_granular['RVO'],
+    })
+    return df.groupby(['Data'] + list(DIMENSOES.values()), sort=True)[MEDIDAS].sum().reset_index()
+
+
+def rolar(df: pd.DataFrame, **chaves) -> pd.DataFrame:
+    """Soma as medidas de um grão mais fino nas novas chaves (Series alinhadas a df)."""
+    dims = list(DIMENSOES.values())
+    agrupado = df[dims + MEDIDAS].assign(**chaves)
+    return agrupado.groupby(list(chaves) + dims, sort=True)[MEDIDAS].sum().reset_index()
+
+
+def calcular(df_granular: pd.DataFrame) -> dict:
+    """{grão: tabela} com as somas e as razões de cada grão."""
+    print("\n🔄 Calculando cubo de KPIs...")
+    dia = base_diaria(df_granular)
+
+    iso = dia['Data'].dt.isocalendar()
+    semana = rolar(
+        dia,
+        Semana_ISO=iso['year'].astype(str) + '-W' + iso['week'].astype(str).str.zfill(2),
+        Inicio_Semana=dia['Data'] - pd.to_timedelta(dia['Data'].dt.weekday, unit='D'),
+    )
+    mes = rolar(dia, Mes=dia['Data'].dt.to_period('M').dt.start_time)
+    ciclo = rolar(mes, Ciclo_Captacao=blend.calcular_ciclo_captacao(mes['Mes']))
+
+    cubo = {'dia': dia, 'semana': semana, 'mes': mes, 'ciclo': ciclo}
+    for grao, df in cubo.items():
+        com_razoes(df)
+        print(f"    ✅ {grao:<7} {len(df):>8,} linhas")
+    return cubo
+
+
+def salvar(cubo: dict, output_dir: Path = None, formato: str = 'csv.gz') -> Path:
+    """Grava um arquivo por grão em <output_dir>/kpis_<timestamp>/kpi_<grão>.<formato>."""
+    pasta = (output_dir or blend.OUTPUT_DIR) / f"{KPIS_BASE_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    pasta.mkdir(parents=True, exist_ok=True)
+    print(f"\n💾 Salvando cubo de KPIs ({formato}) em: {pasta.resolve()}")
+    for grao, df in cubo.items():
+        saida_estrela.gravar_tabela(df, pasta / f"kpi_{grao}{saida_estrela.FORMATOS[formato]}", formato)
+    return pasta
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cubo de KPIs por dia, semana, mês e ciclo a partir do blend.")
+    parser.add_argument("--blend", type=Path, default=None, help="xlsx do blend. Padrão: o mais recente em output/.")
+    parser.add_argument("--formato", choices=list(saida_estrela.FORMATOS), default="csv.gz",
+                        help="Formato das tabelas. Padrão: csv.gz.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import funil_coortes
+
+    args = parse_args(argv)
+    return salvar(calcular(funil_coortes.carregar_granular(args.blend)), formato=args.formato)
+
+
+if __name__ == "__main__":
+    main()
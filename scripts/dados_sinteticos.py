@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dados_sinteticos.py
+
+Geradores de bases sintéticas (HubSpot e investimento Meta/Google) no mesmo
+formato dos exports reais. Usados pelos scripts de benchmark e de paridade
+para comparar engines sem depender dos dados de produção.
+"""
+
+import numpy as np
+import pandas as pd
+
+UNIDADES = ["Moema", "Pinheiros", "Vila Mariana", "Perdizes", "Santana", "Tatuapé", "Alphaville", "Butantã"]
+PIPELINES = ["Red Balloon - Unidades de Rua", "Red Balloon - Franquias", "Red Balloon - Online"]
+ETAPAS = [
+    "NOVO NEGÓCIO", "NEGÓCIO EM QUALIFICAÇÃO", "VISITA AGENDADA", "VISITA REALIZADA",
+    "LISTA DE ESPERA", "NEGÓCIO EM PAUSA", "NEGÓCIO PERDIDO", "MATRÍCULA CONCLUÍDA",
+]
+FONTES = ["Social pago", "Pesquisa paga", "Paid Social", "Facebook", "cpc", "Pesquisa orgânica", "Tráfego direto"]
+PESOS_FONTES = [0.30, 0.30, 0.05, 0.05, 0.05, 0.15, 0.10]
+
+
+def _campanhas(prefixo: str, n: int) -> list:
+    return [f"{prefixo} Campanha {i:03d} - Captação" for i in range(n)]
+
+
+def gerar_hubspot(n_linhas: int, n_campanhas: int = 60, inicio: str = "2023-10-01", dias: int = 760, seed: int = 42) -> pd.DataFrame:
+    """Gera um export do HubSpot com os nomes de colunas originais (antes do clean_cols)."""
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp(inicio)
+
+    criacao = base + pd.to_timedelta(rng.integers(0, dias, n_linhas), unit="D") \
+        + pd.to_timedelta(rng.integers(0, 86400, n_linhas), unit="s")
+    etapas = rng.choice(ETAPAS, n_linhas)
+    pipelines = rng.choice(PIPELINES, n_linhas)
+    fechamento = criacao + pd.to_timedelta(rng.integers(1, 120, n_linhas), unit="D")
+    fechado = np.isin(etapas, ["MATRÍCULA CONCLUÍDA", "NEGÓCIO PERDIDO"])
+
+    camp_meta = np.array(_campanhas("Meta", n_campanhas))
+    camp_google = np.array(_campanhas("Google", n_campanhas))
+
+    df = pd.DataFrame({
+        "Data de criação": criacao.strftime("%Y-%m-%d %H:%M"),
+        "Data de fechamento": np.where(fechado, fechamento.strftime("%Y-%m-%d %H:%M"), None),
+        "Unidade Desejada": rng.choice(UNIDADES, n_linhas),
+        "Pipeline": pipelines,
+        "Etapa do negócio": [f"{e} ({p})" for e, p in zip(etapas, pipelines)],
+        "Valor na moeda da empresa": np.round(rng.uniform(0, 3500, n_linhas), 2),
+        "Fonte original do tráfego": rng.choice(FONTES, n_linhas, p=PESOS_FONTES),
+        "Detalhamento da fonte original do tráfego 1": rng.choice(camp_meta, n_linhas),
+        "Detalhamento da fonte original do tráfego 2": rng.choice(camp_google, n_linhas),
+    })
+    return df
+
+
+def gerar_investimento_agregado(prefixo: str, col_chave: str, col_valor: str, n_campanhas: int = 60,
+                                inicio: str = "2023-10-01", dias: int = 760, seed: int = 7) -> pd.DataFrame:
+    """Gera o investimento já agregado por (Data, chave limpa), como sai de carregar_investimentos()."""
+    from analise_performance_hubspot import clean_text
+
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range(inicio, periods=dias, freq="D")
+    chaves = [clean_text(c) for c in _campanhas(prefixo, n_campanhas)]
+
+    idx = pd.MultiIndex.from_product([datas, chaves], names=["Data", col_chave])
+    df = idx.to_frame(index=False)
+    df[col_valor] = np.round(rng.uniform(0, 400, len(df)), 2)
+    # Nem toda campanha roda todo dia
+    return df[rng.random(len(df)) < 0.6].reset_index(drop=True)
+
+
+def gerar_meta_agg(**kwargs) -> pd.DataFrame:
+    return gerar_investimento_agregado("Meta", "Campanha_Merge_Key", "Investimento_Meta", **kwargs)
+
+
+def gerar_google_agg(**kwargs) -> pd.DataFrame:
+    return gerar_investimento_agregado("Google", "Termo_Merge_Key", "Investimento_Google", seed=11, **kwargs)
+
+
+def _formatar_brl(valores) -> list:
+    """Formata valores como no export brasileiro (1.234,56)."""
+    return [f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in valores]
+
+
+def gerar_export_google(path, n_linhas: int, n_campanhas: int = 200, inicio: str = "2023-01-01",
+                        dias: int = 1000, seed: int = 3):
+    """Escreve um CSV no formato do export do Google Ads (2 linhas de cabeçalho extra)."""
+    rng = np.random.default_rng(seed)
+    datas = pd.Timestamp(inicio) + pd.to_timedelta(rng.integers(0, dias, n_linhas), unit="D")
+    custo = rng.uniform(0, 2500, n_linhas)
+    conversoes = rng.integers(0, 40, n_linhas)
+
+    df = pd.DataFrame({
+        "Campanha": rng.choice(_campanhas("Google", n_campanhas), n_linhas),
+        "Tipo de campanha": rng.choice(["Pesquisa", "Performance Max", "Display"], n_linhas),
+        "Dia": datas.strftime("%Y-%m-%d"),
+        "Custo": _formatar_brl(custo),
+        "Conversões": [f"{c},00" for c in conversoes],
+        "Custo / conv.": _formatar_brl(np.where(conversoes > 0, custo / np.maximum(conversoes, 1), 0)),
+        "Impr.": rng.integers(0, 50_000, n_linhas),
+    })
+    # Linhas de total no final, como no export real (data inválida)
+    df.loc[len(df)] = ["Total: Conta", "--", "--", _formatar_brl([custo.sum()])[0], "--", "--", 0]
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("Relatório de campanha\n")
+        f.write(f"{inicio} - {(pd.Timestamp(inicio) + pd.Timedelta(days=dias)).date()}\n")
+        df.to_csv(f, index=False)
+    return path
+
+
+def gerar_export_meta(path, n_linhas: int, n_campanhas: int = 200, inicio: str = "2023-01-01",
+                      dias: int = 1000, seed: int = 5):
+    """Escreve um CSV no formato do export do Meta Ads (com campanhas 'Bilingual' para o filtro)."""
+    rng = np.random.default_rng(seed)
+    datas = pd.Timestamp(inicio) + pd.to_timedelta(rng.integers(0, dias, n_linhas), unit="D")
+    campanhas = _campanhas("Meta", n_campanhas) + [f"Bilingual School {i:02d}" for i in range(10)]
+
+    df = pd.DataFrame({
+        "Nome da campanha": rng.choice(campanhas, n_linhas),
+        "Dia": datas.strftime("%Y-%m-%d"),
+        "Valor usado (BRL)": np.round(rng.uniform(0, 900, n_linhas), 2),
+        "Resultados": rng.integers(0, 30, n_linhas),
+        "Alcance": rng.integers(0, 80_000, n_linhas),
+    })
+    df.to_csv(path, index=False, encoding="utf-8")
+    return path
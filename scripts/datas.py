@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+datas.py
+
+Conversão de datas com formato detectado por fonte.
+
+O pd.to_datetime(..., errors='coerce') sem formato infere o formato elemento a
+elemento (lento) e pode trocar dia e mês em exports brasileiros (dd/mm/aaaa).
+Aqui o formato de cada coluna de origem (HubSpot criação/fechamento, Meta 'Dia',
+Google 'Dia') é detectado uma vez a partir de uma amostra e depois aplicado
+explicitamente.
+
+Formatos na ordem ISO (aaaa-mm-dd..., caso do Meta e do Google) vão direto para
+o pd.to_datetime(format=...), cujo parser ISO já é o caminho rápido do pandas.
+Os demais (dd/mm do HubSpot) passam pelo caminho abaixo: quando muitas linhas
+repetem a mesma data, a conversão é feita só nos valores únicos e replicada
+por código, e formatos de largura fixa (ex: dd/mm/aaaa HH:MM) têm os
+caracteres reordenados para aaaa-mm-dd HH:MM com numpy, o que cai no parser ISO
+do pandas (bem mais rápido que o strptime genérico). Linhas fora do layout
+(ex: '5/3/2024') são convertidas com o formato detectado e, se ainda falharem,
+com a inferência do pandas.
+
+Cada conversão registra quantos valores viraram NaT (ver RELATORIO_DATAS).
+"""
+
+from __future__ import annotations
+
+from importacao_tardia import importar_tardio
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+# Formatos testados na detecção, em ordem de preferência.
+# dd/mm vem antes de mm/dd: em empate (ex: 05/03/2024) vale o padrão brasileiro.
+FORMATOS_CANDIDATOS = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d %H:%M:%S',
+    '%d/%m/%Y',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%y',
+    '%d-%m-%Y',
+    '%Y/%m/%d',
+    '%m/%d/%Y',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y %H:%M:%S',
+    'ISO8601',
+]
+
+TAMANHO_AMOSTRA = 500
+# Fração mínima da amostra que o formato precisa converter para ser aceito
+MIN_ACERTO_FORMATO = 0.95
+# Abaixo desta razão (únicos / linhas) a conversão é feita por valores únicos.
+# A razão é estimada nas primeiras LINHAS_ESTIMATIVA_UNICOS linhas.
+MAX_RAZAO_UNICOS = 0.5
+LINHAS_ESTIMATIVA_UNICOS = 20_000
+
+# Formato detectado por fonte (reaproveitado enquanto continuar servindo)
+FORMATOS_DETECTADOS = {}
+# Uma entrada por conversão: fonte, formato, linhas, valores únicos e NaT gerados
+RELATORIO_DATAS = []
+
+
+def _amostra(serie: pd.Series) -> pd.Series:
+    valores = serie.dropna()
+    if len(valores) > TAMANHO_AMOSTRA:
+        valores = valores.sample(TAMANHO_AMOSTRA, random_state=0)
+    valores = valores.astype(str).str.strip()
+    return valores[valores != '']
+
+
+def _taxa_acerto(amostra: pd.Series, formato: str) -> float:
+    if amostra.empty:
+        return 0.0
+    convertidas = pd.to_datetime(amostra, format=formato, errors='coerce')
+    return float(convertidas.notna().mean())
+
+
+def detectar_formato(serie: pd.Series):
+    """Retorna o formato que converte a maior fração da amostra (ou None se nenhum servir)."""
+    amostra = _amostra(serie)
+    melhor, melhor_taxa = None, 0.0
+    for formato in FORMATOS_CANDIDATOS:
+        taxa = _taxa_acerto(amostra, formato)
+        if taxa > melhor_taxa:
+            melhor, melhor_taxa = formato, taxa
+        if taxa == 1.0:
+            break
+    return melhor if melhor_taxa >= MIN_ACERTO_FORMATO else None
+
+
+def formato_da_fonte(fonte: str, serie: pd.Series):
+    """Usa o formato já detectado para a fonte se ele ainda servir; senão detecta de novo."""
+    formato = FORMATOS_DETECTADOS.get(fonte)
+    if formato is not None and _taxa_acerto(_amostra(serie).head(50), formato) >= MIN_ACERTO_FORMATO:
+        return formato
+    formato = detectar_formato(serie)
+    FORMATOS_DETECTADOS[fonte] = formato
+    return formato
+
+
+# Largura de cada campo nos formatos de largura fixa
+LARGURA_CAMPOS = {'%Y': 4, '%m': 2, '%d': 2, '%H': 2, '%M': 2, '%S': 2}
+ORDEM_ISO = [('%Y', ''), ('%m', '-'), ('%d', '-'), ('%H', ' '), ('%M', ':'), ('%S', ':')]
+
+
+def _layout(formato: str):
+    """
+    Posição (início, fim) de cada campo e de cada separador em um texto de
+    largura fixa. None se o formato não for de largura fixa com ano/mês/dia.
+    """
+    campos, separadores, pos, i = {}, [], 0, 0
+    while i < len(formato):
+        if formato[i] == '%':
+            diretiva = formato[i:i + 2]
+            if diretiva not in LARGURA_CAMPOS:
+                return None
+            campos[diretiva] = (pos, pos + LARGURA_CAMPOS[diretiva])
+            pos += LARGURA_CAMPOS[diretiva]
+            i += 2
+        else:
+            separadores.append((pos, formato[i]))
+            pos += 1
+            i += 1
+    if not {'%Y', '%m', '%d'} <= campos.keys():
+        return None
+    return campos, separadores, pos
+
+
+def _converter_largura_fixa(valores: np.ndarray, formato: str):
+    """
+    Reordena os caracteres de cada texto para a ordem ISO e converte com o
+    parser ISO. Linhas fora do layout saem NaT (tratadas no fallback).
+    Retorna None se o formato já estiver na ordem ISO ou não for de largura fixa.
+    """
+    layout = _layout(formato)
+    if layout is None or formato.startswith('%Y-%m-%d'):
+        return None
+    campos, separadores, largura = layout
+
+    texto = valores.astype(str)
+    if texto.dtype.itemsize // 4 < largura:
+        return None
+    matriz = texto.view(np.uint32).reshape(len(texto), -1)
+
+    # Mesma largura e separadores nos lugares certos
+    no_layout = matriz[:, largura - 1] != 0
+    if matriz.shape[1] > largura:
+        no_layout &= matriz[:, largura] == 0
+    for pos, sep in separadores:
+        no_layout &= matriz[:, pos] == ord(sep)
+
+    partes, formato_iso = [], ''
+    for diretiva, sep in ORDEM_ISO:
+        if diretiva in campos:
+            if sep:
+                partes.append(np.full((len(texto), 1), ord(sep), dtype=np.uint32))
+            inicio, fim = campos[diretiva]
+            partes.append(matriz[:, inicio:fim])
+            formato_iso += sep + diretiva
+    iso = np.ascontiguousarray(np.hstack(partes))
+    iso[~no_layout] = 0
+    iso = iso.view(f'U{iso.shape[1]}').ravel()
+    return np.asarray(pd.to_datetime(iso, format=formato_iso, errors='coerce'), dtype='datetime64[ns]')
+
+
+def formato_iso(formato) -> bool:
+    """Formato já na ordem ano-mês-dia (convertido direto pelo parser ISO do pandas)."""
+    return formato is not None and (formato == 'ISO8601' or formato.startswith('%Y'))
+
+
+def _converter(valores, formato):
+    """Converte com formato explícito; o que sobrar cai na inferência padrão do pandas."""
+    if formato is None:
+        return pd.to_datetime(valores, errors='coerce')
+
+    valores = np.asarray(valores, dtype=object)
+    convertidas = _converter_largura_fixa(valores, formato)
+    if convertidas is None:
+        convertidas = np.asarray(pd.to_datetime(valores, format=formato, errors='coerce'), dtype='datetime64[ns]')
+    return _completar_sobras(valores, convertidas, formato)
+
+
+def _completar_sobras(valores: np.ndarray, convertidas: np.ndarray, formato: str) -> np.ndarray:
+    """Reconverte os valores preenchidos que saíram NaT (formato detectado, depois inferência)."""
+    sobras = np.isnat(convertidas) & pd.notna(valores)
+    if sobras.any():
+        # Fallback por valor único das sobras (costumam ser poucos textos repetidos):
+        # primeiro o formato detectado, depois a inferência do pandas
+        codigos, unicos = pd.factorize(valores[sobras])
+        unicos = pd.Series(unicos, dtype=object).astype(str)
+        resto = pd.to_datetime(unicos, format=formato, errors='coerce')
+        faltam = resto.isna()
+        if faltam.any():
+            resto[faltam] = pd.to_datetime(
+                unicos[faltam], format='mixed', dayfirst=formato.startswith('%d'), errors='coerce'
+            )
+        convertidas = convertidas.copy()
+        convertidas[sobras] = np.asarray(resto, dtype='datetime64[ns]')[codigos]
+    return convertidas
+
+
+def converter_datas(serie: pd.Series, fonte: str, verbose: bool = True) -> pd.Series:
+    """
+    Converte uma coluna de datas de uma fonte para datetime64.
+    Valores inválidos viram NaT e são contados no RELATORIO_DATAS.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+
+    n_linhas = len(serie)
+    formato = formato_da_fonte(fonte, serie)
+
+    inicio = serie.iloc[:LINHAS_ESTIMATIVA_UNICOS]
+    if formato_iso(formato):
+        # Meta/Google: o parser ISO do pandas direto na coluna; só as sobras vão para o fallback
+        convertidas = np.asarray(pd.to_datetime(serie, format=formato, errors='coerce'), dtype='datetime64[ns]')
+        if np.isnat(convertidas).sum() > serie.isna().sum():
+            convertidas = _completar_sobras(serie.to_numpy(dtype=object), convertidas, formato)
+        resultado = pd.Series(convertidas, index=serie.index, name=serie.name, dtype='datetime64[ns]')
+        n_unicos = None
+        modo = 'ISO direto'
+    elif n_linhas and inicio.nunique() / len(inicio) <= MAX_RAZAO_UNICOS:
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        n_unicos = len(unicos)
+        convertidas_unicos = np.asarray(_converter(np.asarray(unicos, dtype=object), formato), dtype='datetime64[ns]')
+        valores = np.where(codigos >= 0, convertidas_unicos[np.maximum(codigos, 0)], np.datetime64('NaT'))
+        resultado = pd.Series(valores, index=serie.index, name=serie.name, dtype='datetime64[ns]')
+        modo = 'valores únicos'
+    else:
+        resultado = pd.Series(
+            np.asarray(_converter(serie.to_numpy(dtype=object), formato), dtype='datetime64[ns]'),
+            index=serie.index, name=serie.name
+        )
+        n_unicos = None
+        modo = 'vetorizado'
+
+    n_nat = int((resultado.isna() & serie.notna()).sum())
+    RELATORIO_DATAS.append({
+        'Fonte': fonte,
+        'Formato': formato or 'inferido',
+        'Modo': modo,
+        'Linhas': n_linhas,
+        'Valores_Unicos': n_unicos,
+        'Convertidos_NaT': n_nat,
+    })
+    if verbose:
+        aviso = f", {n_nat} valores inválidos -> NaT" if n_nat else ""
+        print(f"    📅 Datas '{fonte}': formato {formato or 'inferido'} ({modo}){aviso}")
+    return resultado
+
+
+def relatorio_datas() -> pd.DataFrame:
+    return pd.DataFrame(RELATORIO_DATAS, columns=['Fonte', 'Formato', 'Modo', 'Linhas', 'Valores_Unicos', 'Convertidos_NaT'])
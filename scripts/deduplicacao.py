@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+deduplicacao.py
+
+Remoção de negócios duplicados no export do HubSpot (reexportações, negócio
+movido de pipeline), logo depois do mapeamento de status.
+
+Cada coluna de identidade é fatorada uma vez (códigos inteiros por valor
+único) e os códigos são combinados em base mista numa chave int64 por linha,
+sem colisões (como o groupby do pandas). Duplicados são linhas com a mesma
+chave; entre elas fica a de Status_Principal mais avançado (ordem do
+ETAPA_FUNIL_MAP) e, no empate, a primeira do arquivo. Não há comparação par
+a par: só as linhas com chave repetida são ordenadas.
+
+As linhas removidas vão para output/duplicados_hubspot.csv com a impressão
+digital (hash de 64 bits dos valores de identidade, calculado só para elas)
+e o status da linha mantida.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+import mapeamento
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+
+def chaves_identidade(df: pd.DataFrame, colunas: list) -> np.ndarray:
+    """
+    Chave int64 por linha, igual só para linhas com os mesmos valores em 'colunas'.
+    Se o produto das cardinalidades passar de 63 bits, a chave parcial é refatorada.
+    """
+    chave, tamanho = np.zeros(len(df), dtype=np.int64), 1
+    for coluna in colunas:
+        codigos, unicos = mapeamento.fatorar(df[coluna])
+        n = max(len(unicos), 1)
+        if tamanho * n >= 2**63:
+            chave, unicos_chave = pd.factorize(chave)
+            tamanho = len(unicos_chave)
+        chave = chave * n + np.asarray(codigos, dtype=np.int64)
+        tamanho *= n
+    return chave
+
+
+def impressoes(df: pd.DataFrame, colunas: list) -> np.ndarray:
+    """Hash de 64 bits por linha sobre 'colunas' (independe do índice e da posição)."""
+    return pd.util.hash_pandas_object(df[colunas], index=False, categorize=True).to_numpy()
+
+
+def ranking_status(status: pd.Series, ordem: list) -> np.ndarray:
+    """Posição do status na ordem do funil (-1 para status fora dela), avaliada por valor único."""
+    posicoes = {valor: i for i, valor in enumerate(ordem)}
+    codigos, unicos = mapeamento.fatorar(status)
+    return np.array([posicoes.get(v, -1) for v in unicos], dtype=np.int64)[codigos]
+
+
+def deduplicar(df: pd.DataFrame, colunas: list, ordem_status: list,
+               coluna_status: str = 'Status_Principal') -> tuple:
+    """
+    Retorna (df sem duplicados, linhas removidas). As removidas trazem Impressao e
+    Status_Mantido (o status da linha que ficou no lugar delas).
+    """
+    nenhuma = df.iloc[:0].assign(Impressao=pd.Series(dtype=object), Status_Mantido=pd.Series(dtype=object))
+    if not colunas:
+        return df, nenhuma
+    chaves = chaves_identidade(df, colunas)
+    repetidos = pd.Series(chaves).duplicated(keep=False).to_numpy()
+    if not repetidos.any():
+        return df, nenhuma
+
+    # Só as linhas com chave repetida: chave, status mais avançado primeiro, posição no arquivo
+    posicoes = np.flatnonzero(repetidos)
+    rank = ranking_status(df[coluna_status].iloc[posicoes], ordem_status)
+    ordem = np.lexsort((posicoes, -rank, chaves[posicoes]))
+    c_ordenado = chaves[posicoes][ordem]
+    primeiro = np.r_[True, c_ordenado[1:] != c_ordenado[:-1]]
+
+    manter = np.ones(len(df), dtype=bool)
+    manter[posicoes[ordem[~primeiro]]] = False
+
+    # Status da linha mantida em cada grupo, para o relatório
+    grupo = np.cumsum(primeiro) - 1
+    status = df[coluna_status].astype(str).to_numpy()
+    status_mantido = status[posicoes[ordem[primeiro]]][grupo]
+
+    removidas = posicoes[ordem[~primeiro]]
+    relatorio = df.iloc[removidas].assign(
+        Impressao=[f"{h:016x}" for h in impressoes(df.iloc[removidas], colunas)],
+        Status_Mantido=status_mantido[~primeiro],
+    )
+    return df[manter], relatorio
+
+
+def salvar_relatorio(removidas: pd.DataFrame, colunas: list, path: Path, coluna_status: str = 'Status_Principal'):
+    """Grava as linhas removidas (colunas de identidade, status removido e mantido)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    removidas[['Impressao'] + colunas + [coluna_status, 'Status_Mantido']].to_csv(path, index=False, encoding='utf-8')
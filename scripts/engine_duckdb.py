@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+engine_duckdb.py
+
+Etapas do blend HubSpot reescritas em SQL (DuckDB), usadas só como conferência
+das regras do pandas (paridade.py, variante duckdb, e benchmark_engines.py):
+    - 3.5 Merge e prorrateio de investimento
+    - 3.7 Blend_Agregado_Dash
+    - 3.8 Agregado_Matriculas_Fechamento
+
+Não é um engine do blend: as entradas chegam como DataFrames já preparados
+pelo pandas (a limpeza dos exports CSV/xlsx é em Python), e a ida e volta
+pandas -> DuckDB -> pandas deixou o caminho mais lento que o pandas. Uma
+segunda implementação das mesmas regras, em outra linguagem, pega divergências
+que um teste contra o próprio pandas não pegaria.
+A geração de IDs (3.6) continua no pandas para manter os mesmos hashes.
+
+Uso:
+    python scripts/benchmark_engines.py
+    python scripts/paridade.py --variantes duckdb
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+except NameError:
+    BASE_DIR = Path.cwd()
+
+# --- Configurações do DuckDB ---
+DUCKDB_THREADS = os.cpu_count() or 1
+DUCKDB_MEMORY_LIMIT = "4GB"
+# Diretório usado para spill em disco quando a memória não for suficiente
+DUCKDB_TEMP_DIR = BASE_DIR / "output" / ".duckdb_tmp"
+
+# Chaves de agrupamento (mesma ordem do groupby do pandas)
+CHAVES_DASH = [
+    'Data', 'Origem_Principal', 'Detalhamento_fonte_original_1',
+    'Detalhamento_fonte_original_2', 'Status_Principal', 'Tipo', 'Unidade'
+]
+# Colunas do HubSpot usadas a partir da etapa 3.5 (projeção antes de registrar no DuckDB).
+# As colunas brutas do export ficam de fora: o DuckDB não diferencia maiúsculas de
+# minúsculas e 'fonte_original_do_trafego' colidiria com 'Fonte_Original_do_Trafego'.
+COLUNAS_HUB = [
+    'Data', 'Data_Fechamento', 'Ciclo_Captacao', 'Ciclo_Captacao_Fechamento',
+    'Unidade', 'Tipo', 'Total_Negocios', 'RVO', 'Matriculas',
+    'Status_Principal', 'Origem_Principal', 'Detalhamento_fonte_original_1',
+    'Detalhamento_fonte_original_2', 'Fonte_Original_do_Trafego', 'Nome_Conta_Final',
+    'Area_Gestao_RVO', 'Merge_Key_Meta', 'Merge_Key_Google'
+]
+CHAVES_MATRICULAS = [
+    'Data_Fechamento', 'Ciclo_Captacao_Fechamento', 'Origem_Principal',
+    'Detalhamento_fonte_original_1', 'Detalhamento_fonte_original_2',
+    'Tipo', 'Unidade'
+]
+
+
+def q(nome: str) -> str:
+    """Coloca um identificador entre aspas duplas para uso no SQL."""
+    return '"' + str(nome).replace('"', '""') + '"'
+
+
+def conectar():
+    """Abre uma conexão DuckDB em memória com threads e spill configurados."""
+    try:
+        import duckdb
+    except ImportError:
+        print("\n\n❌ ERRO: A BIBLIOTECA 'duckdb' NÃO ESTÁ INSTALADA.")
+        print("Para a conferência em SQL, rode: pip install duckdb")
+        sys.exit(1)
+
+    DUCKDB_TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(database=":memory:")
+    con.execute(f"SET threads = {int(DUCKDB_THREADS)}")
+    con.execute(f"SET memory_limit = '{DUCKDB_MEMORY_LIMIT}'")
+    con.execute(f"SET temp_directory = '{DUCKDB_TEMP_DIR.as_posix()}'")
+    # A ordem final é garantida pelos ORDER BY explícitos
+    con.execute("SET preserve_insertion_order = false")
+    print(f"    🦆 DuckDB conectado: {DUCKDB_THREADS} threads, limite {DUCKDB_MEMORY_LIMIT}, spill em '{DUCKDB_TEMP_DIR}'")
+    return con
+
+
+def registrar_fonte(con, nome: str, fonte: pd.DataFrame):
+    """Registra um DataFrame como view no DuckDB."""
+    con.register(nome, fonte)
+
+
+def _investimento_tipado(df: pd.DataFrame, col_chave: str, col_valor: str) -> pd.DataFrame:
+    """Garante tipos estáveis no investimento agregado (frames vazios chegam como object)."""
+    return pd.DataFrame({
+        'Data': pd.to_datetime(df['Data'], errors='coerce'),
+        col_chave: df[col_chave].astype(object),
+        col_valor: pd.to_numeric(df[col_valor], errors='coerce').astype('float64'),
+    })
+
+
+def merge_investimento(con, df_hub_filtrado: pd.DataFrame, df_meta_agg, df_google_agg, canal_meta: str) -> pd.DataFrame:
+    """
+    Versão SQL da etapa 3.5: left join com Meta/Google e prorrateio por (Data, Origem_Principal).
+    Mantém a ordem das linhas do HubSpot e a semântica do pandas (chaves NaT casam entre si,
+    linhas sem Data ficam com Midia_Paga = 0). canal_meta é o canal que recebe o investimento
+    Meta (os demais recebem o Google), vindo das regras.
+    """
+    print("\n🔗 Realizando merge e prorrateio de investimento (DuckDB)...")
+
+    cols_hub = COLUNAS_HUB + _colunas_ciclo(df_hub_filtrado)
+    hub = df_hub_filtrado[cols_hub].reset_index(drop=True)
+    hub = hub.assign(_ordem=range(len(hub)))
+    registrar_fonte(con, "hub_filtrado", hub)
+
+    for nome, fonte, col_chave, col_valor in [
+        ("meta_agg", df_meta_agg, 'Campanha_Merge_Key', 'Investimento_Meta'),
+        ("google_agg", df_google_agg, 'Termo_Merge_Key', 'Investimento_Google'),
+    ]:
+        if isinstance(fonte, pd.DataFrame):
+            fonte = _investimento_tipado(fonte, col_chave, col_valor)
+        registrar_fonte(con, nome, fonte)
+
+    select_hub = ", ".join(f"h.{q(c)}" for c in cols_hub)
+
+    sql = f"""
+        WITH merged AS (
+            SELECT
+                {select_hub},
+                h._ordem,
+                COALESCE(m.Investimento_Meta, 0) AS Investimento_Meta,
+                COALESCE(g.Investimento_Google, 0) AS Investimento_Google
+            FROM hub_filtrado h
+            LEFT JOIN meta_agg m
+                ON h.Data IS NOT DISTINCT FROM m.Data
+               AND h.Merge_Key_Meta IS NOT DISTINCT FROM m.Campanha_Merge_Key
+            LEFT JOIN google_agg g
+                ON h.Data IS NOT DISTINCT FROM g.Data
+               AND h.Merge_Key_Google IS NOT DISTINCT FROM g.Termo_Merge_Key
+        ),
+        prorrateio AS (
+            SELECT
+                *,
+                CASE WHEN Origem_Principal = $canal_meta
+                     THEN Investimento_Meta ELSE Investimento_Google END AS Investimento_Total_Dia,
+                CASE WHEN Data IS NULL THEN NULL
+                     ELSE COUNT(*) OVER (PARTITION BY Data, Origem_Principal) END AS Count_Leads
+            FROM merged
+        )
+        SELECT
+            * EXCLUDE (_ordem),
+            CASE WHEN Count_Leads > 0
+                 THEN Investimento_Total_Dia / Count_Leads ELSE 0 END AS Midia_Paga
+        FROM prorrateio
+        ORDER BY _ordem
+    """
+    df_merged = con.execute(sql, {'canal_meta': canal_meta}).df()
+
+    print(f"    ✅ Investimento prorrateado calculado")
+    print(f"    💰 Investimento total: R$ {df_merged['Midia_Paga'].sum():,.2f}")
+
+    return df_merged
+
+
+def _colunas_ciclo(df: pd.DataFrame) -> list:
+    return [c for c in df.columns if c.startswith('Matriculas_')]
+
+
+def _soma_inteira(col: str, alias: str) -> str:
+    return f"CAST(SUM({q(col)}) AS BIGINT) AS {q(alias)}"
+
+
+def agregar_dash(con, df_granular: pd.DataFrame) -> pd.DataFrame:
+    """Versão SQL da etapa 3.7 (Blend_Agregado_Dash)."""
+    print("\n🔄 Preparando visão agregada para o Dashboard (DuckDB)...")
+
+    registrar_fonte(con, "granular", df_granular)
+
+    renomear = {
+        'Origem_Principal': 'Canal',
+        'Detalhamento_fonte_original_1': 'Campanha',
+        'Detalhamento_fonte_original_2': 'Termo',
+        'Status_Principal': 'Etapas_de_Negocios',
+        'Tipo': 'Pipeline',
+        'Unidade': 'Unidade_Desejada',
+    }
+    select_chaves = ", ".join(f"{q(c)} AS {q(renomear.get(c, c))}" for c in CHAVES_DASH)
+    medidas = [
+        _soma_inteira('Total_Negocios', 'Volume_Total_Negocios'),
+        _soma_inteira('Matriculas', 'Matriculas'),
+        f"SUM(Midia_Paga) AS Investimento",
+        f"SUM(RVO) AS RVO_Total",
+    ] + [_soma_inteira(c, c) for c in _colunas_ciclo(df_granular)]
+    grupo = ", ".join(q(c) for c in CHAVES_DASH)
+    ordem = ", ".join(f"{q(c)} ASC NULLS LAST" for c in CHAVES_DASH)
+
+    sql = f"""
+        SELECT {select_chaves}, {", ".join(medidas)}
+        FROM granular
+        GROUP BY {grupo}
+        ORDER BY {ordem}
+    """
+    df_agregado = con.execute(sql).df()
+
+    print(f"    ✅ Visão agregada preparada com {len(df_agregado)} linhas")
+    return df_agregado
+
+
+def agregar_matriculas_fechamento(con, df_granular: pd.DataFrame, texto_nao_mapeado: str) -> pd.DataFrame:
+    """
+    Versão SQL da etapa 3.8 (Agregado_Matriculas_Fechamento).
+    texto_nao_mapeado: ciclo sem data (DEFAULT_NA_TEXT das regras), que não vira coluna.
+    """
+    print("\n🔄 Preparando visão agregada de matrículas por data de fechamento (DuckDB)...")
+
+    registrar_fonte(con, "granular", df_granular)
+
+    ciclos = [
+        r[0] for r in con.execute(
+            "SELECT DISTINCT Ciclo_Captacao_Fechamento FROM granular WHERE Matriculas = 1"
+        ).fetchall()
+    ]
+    if not ciclos:
+        print("    ⚠️  Nenhuma matrícula encontrada para gerar a aba Agregado_Matriculas_Fechamento")
+        return pd.DataFrame()
+
+    # Mesma regra do pandas: colunas de ciclo de fechamento sobrescrevem as de criação
+    # com o mesmo nome; ciclos novos entram no final.
+    ciclos_fechamento = {}
+    for ciclo in sorted(c for c in ciclos if c != texto_nao_mapeado):
+        ciclos_fechamento[f"Matriculas_{ciclo.replace('.', '_').replace(' ', '_')}"] = ciclo
+
+    cols_ciclo = _colunas_ciclo(df_granular)
+    cols_ciclo += [c for c in ciclos_fechamento if c not in cols_ciclo]
+
+    medidas_ciclo = []
+    for col in cols_ciclo:
+        if col in ciclos_fechamento:
+            literal = ciclos_fechamento[col].replace("'", "''")
+            expr = f"CASE WHEN Ciclo_Captacao_Fechamento = '{literal}' THEN 1 ELSE 0 END"
+        else:
+            expr = q(col)
+        medidas_ciclo.append(f"CAST(SUM({expr}) AS BIGINT) AS {q(col)}")
+
+    renomear = {
+        'Ciclo_Captacao_Fechamento': 'Ciclo_Captacao',
+        'Origem_Principal': 'Canal',
+        'Detalhamento_fonte_original_1': 'Campanha',
+        'Detalhamento_fonte_original_2': 'Termo',
+        'Tipo': 'Pipeline',
+        'Unidade': 'Unidade_Desejada',
+    }
+    select_chaves = ", ".join(f"{q(c)} AS {q(renomear.get(c, c))}" for c in CHAVES_MATRICULAS)
+    medidas = [
+        _soma_inteira('Total_Negocios', 'Volume_Matriculas'),
+        _soma_inteira('Matriculas', 'Matriculas'),
+        "SUM(Midia_Paga) AS Investimento",
+        "SUM(RVO) AS RVO_Total",
+    ] + medidas_ciclo
+    grupo = ", ".join(q(c) for c in CHAVES_MATRICULAS)
+    ordem = ", ".join(f"{q(c)} ASC NULLS LAST" for c in CHAVES_MATRICULAS)
+
+    sql = f"""
+        SELECT {select_chaves}, {", ".join(medidas)}
+        FROM granular
+        WHERE Matriculas = 1
+        GROUP BY {grupo}
+        ORDER BY {ordem}
+    """
+    df_matriculas_fechamento = con.execute(sql).df()
+
+    # Ordenar por Data_Fechamento (mesmo critério do pandas)
+    df_matriculas_fechamento = df_matriculas_fechamento.sort_values('Data_Fechamento')
+
+    print(f"    ✅ Visão de matrículas preparada com {len(df_matriculas_fechamento)} linhas")
+    print(f"    ✅ Total de matrículas na aba: {df_matriculas_fechamento['Matriculas'].sum()}")
+    return df_matriculas_fechamento
+
+
+def executar_blend(df_hub_filtrado: pd.DataFrame, df_meta_agg, df_google_agg) -> tuple:
+    """
+    Etapas 3.5 a 3.8 (último clique, IDs globais) com 3.5/3.7/3.8 em SQL, para comparar
+    com analise_performance_hubspot.executar_blend. Retorna as mesmas três abas.
+    """
+    import analise_performance_hubspot as blend
+
+    blend.carregar_regras()
+    con = conectar()
+    try:
+        df_merged = merge_investimento(con, df_hub_filtrado, df_meta_agg, df_google_agg, blend.CANAL_PLATAFORMA['meta'])
+        df_granular = blend.preparar_granular(df_merged)
+        df_agregado = agregar_dash(con, df_granular)
+        df_matriculas_fechamento = agregar_matriculas_fechamento(con, df_granular, blend.DEFAULT_NA_TEXT)
+    finally:
+        con.close()
+    return df_granular, df_agregado, df_matriculas_fechamento
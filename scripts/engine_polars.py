@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+engine_polars.py
+
+Engine opcional em Polars (LazyFrame) para o processamento dos exports de
+Meta Ads e Google Ads. Mesma interface dos scripts em pandas:
+
+    processar_google(path) -> (df, df_daily_agg)
+    processar_meta(path)   -> (df, df_daily_agg)
+
+Os DataFrames retornados são pandas e iguais aos do caminho pandas, então o
+restante do script (abas por ano, Excel, confirmação) não muda.
+
+O plano lazy usa:
+    - leitura do CSV multi-thread (scan_csv);
+    - predicate pushdown para descartar datas inválidas e linhas 'bilingual';
+    - projection pushdown na agregação diária (só lê Data/Investimento/Conversões).
+As datas são convertidas uma vez por valor único com o mesmo datas.converter_datas
+do caminho pandas (mesmo formato detectado por fonte).
+
+Uso:
+    python scripts/analise_performance_google.py --engine polars
+    python scripts/analise_performance_meta_teste.py --engine polars
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+import datas
+
+# Linhas usadas para inferir o schema antes de cair para a leitura completa
+INFER_SCHEMA_LINHAS = 10_000
+
+
+def importar_polars():
+    try:
+        import polars as pl
+    except ImportError:
+        print("\n\n❌ ERRO: A BIBLIOTECA 'polars' NÃO ESTÁ INSTALADA.")
+        print("Para usar --engine polars, rode: pip install polars pyarrow")
+        sys.exit(1)
+    return pl
+
+
+# --- Expressões Utilitárias ---
+
+def expr_parse_number(pl, nome: str, dtype, remover_aspas: bool):
+    """Equivalente vetorizado de parse_number (formato brasileiro -> float, inválido -> 0.0)."""
+    col = pl.col(nome)
+    if dtype.is_numeric() or dtype == pl.Boolean:
+        return col.cast(pl.Float64).fill_nan(0.0).fill_null(0.0)
+
+    s = col.cast(pl.String).str.strip_chars().str.replace_all(" ", "", literal=True)
+    if remover_aspas:
+        s = s.str.replace_all('"', "", literal=True)
+    tem_ponto_e_virgula = s.str.contains(".", literal=True) & s.str.contains(",", literal=True)
+    s = (
+        pl.when(tem_ponto_e_virgula)
+        .then(s.str.replace_all(".", "", literal=True).str.replace_all(",", ".", literal=True))
+        .otherwise(s.str.replace_all(",", ".", literal=True))
+    )
+    return s.cast(pl.Float64, strict=False).fill_null(0.0)
+
+
+def expr_datas(pl, lf, nome: str, fonte: str):
+    """
+    Converte a coluna de data com datas.converter_datas só nos valores únicos
+    (mesmo formato do caminho pandas) e aplica o mapa com replace_strict.
+    """
+    unicos = lf.select(pl.col(nome).unique(maintain_order=True)).collect().to_series()
+    convertidas = datas.converter_datas(unicos.to_pandas(), fonte)
+    novas = pl.from_pandas(pd.Series(convertidas, name='Data_Datetime')).cast(pl.Datetime("ns"))
+    return pl.col(nome).replace_strict(unicos, novas, default=None, return_dtype=pl.Datetime("ns"))
+
+
+def renomear_colunas(pl, lf, normalizar):
+    """Aplica a normalização de nomes de colunas do script pandas ao LazyFrame."""
+    colunas = lf.collect_schema().names()
+    mapa = {c: normalizar(c) for c in colunas}
+    return lf.rename({k: v for k, v in mapa.items() if k != v})
+
+
+def coletar(pl, lazy_frames: list) -> list:
+    """Executa os planos juntos (a leitura do CSV é compartilhada entre eles)."""
+    return pl.collect_all(lazy_frames)
+
+
+def detectar_separador(path: Path) -> str:
+    """Detecta o separador como o sep=None do pandas (csv.Sniffer na primeira linha)."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        amostra = f.readline()
+    try:
+        return csv.Sniffer().sniff(amostra).delimiter
+    except csv.Error:
+        return ","
+
+
+def scan(pl, path: Path, skip_rows: int = 0, separador: str = ",", infer_schema_length=INFER_SCHEMA_LINHAS):
+    return pl.scan_csv(
+        path, skip_rows=skip_rows, separator=separador, encoding="utf8",
+        infer_schema_length=infer_schema_length,
+    )
+
+
+def carregar_lazy(pl, path: Path, skip_rows: int = 0, separador: str = ","):
+    """Abre o CSV como LazyFrame, validando a existência e se há linhas."""
+    if not path.exists():
+        print(f"❌ ERRO: Arquivo não encontrado em: {path.resolve()}")
+        print("   Verifique se o caminho e o nome do arquivo estão corretos.")
+        sys.exit(1)
+    try:
+        lf = scan(pl, path, skip_rows, separador)
+        n_linhas = lf.select(pl.len()).collect().item()
+    except Exception as e:
+        print(f"❌ ERRO ao carregar o arquivo: {e}")
+        sys.exit(1)
+    if n_linhas == 0:
+        print(f"❌ ERRO ao carregar o arquivo: O DataFrame está vazio após o carregamento.")
+        sys.exit(1)
+    return lf, n_linhas
+
+
+def coletar_com_schema_completo(pl, construir, path: Path, skip_rows: int, separador: str):
+    """
+    Executa o plano com schema inferido nas primeiras linhas; se alguma linha
+    posterior não couber no tipo inferido, refaz inferindo no arquivo inteiro
+    (o mesmo que o pandas faz).
+    """
+    try:
+        return construir(scan(pl, path, skip_rows, separador))
+    except pl.exceptions.ComputeError:
+        print("  ⚠️ Schema inferido nas primeiras linhas não serviu. Relendo com inferência completa...")
+        return construir(scan(pl, path, skip_rows, separador, infer_schema_length=None))
+
+
+# =====================================================================
+# --- GOOGLE ADS ---
+# =====================================================================
+
+def processar_google(path: Path) -> tuple:
+    pl = importar_polars()
+    import analise_performance_google as google
+
+    print(f"\n📂 Carregando dados de: {path} (polars)")
+    _, n_linhas = carregar_lazy(pl, path, skip_rows=google.SKIP_ROWS)
+    print(f"✅ {n_linhas} linhas brutas carregadas")
+
+    def construir(lf):
+        print("\n🔧 Normalizando colunas...")
+        lf = renomear_colunas(pl, lf, google.normalizar_nome_coluna)
+        print("\n📋 Colunas detectadas (normalizadas):")
+        print(lf.collect_schema().names())
+
+        print("\n🔧 Mapeando colunas do Google Ads...")
+        colunas = lf.collect_schema().names()
+        for col_original, col_nova in google.COL_MAPPING.items():
+            if col_original in colunas:
+                lf = lf.rename({col_original: col_nova})
+                colunas = lf.collect_schema().names()
+        google.validar_colunas(colunas, path)
+        schema = lf.collect_schema()
+
+        print(f"\n🔧 Processando coluna de data...")
+        lf = lf.with_columns(expr_datas(pl, lf, 'Data', 'google_dia').alias('Data_Datetime'))
+        lf_na = lf.select(pl.col('Data_Datetime').is_null().sum().alias('n'))
+        # Predicate pushdown: o filtro de data vai direto para a leitura
+        lf = lf.filter(pl.col('Data_Datetime').is_not_null())
+
+        lf = lf.with_columns(
+            expr_parse_number(pl, 'Investimento', schema['Investimento'], remover_aspas=True).alias('Investimento_Google'),
+            expr_parse_number(pl, 'Conversoes', schema['Conversoes'], remover_aspas=True).alias('Leads_Google'),
+            pl.col('Data_Datetime').dt.year().cast(pl.Int32).alias('Ano'),
+            pl.col('Data_Datetime').dt.month().cast(pl.Int32).alias('Mes'),
+        )
+        # Projection pushdown: o agregado diário só precisa de 3 colunas
+        lf_diario = lf.group_by('Data_Datetime').agg(
+            pl.col('Investimento_Google').sum(),
+            pl.col('Leads_Google').sum(),
+        )
+        return coletar(pl, [lf, lf_diario, lf_na])
+
+    df_pl, diario_pl, na_pl = coletar_com_schema_completo(pl, construir, path, google.SKIP_ROWS, ",")
+
+    num_na_dates = na_pl.item()
+    if num_na_dates > 0:
+        print(f"⚠️ {num_na_dates} linhas com data inválida serão removidas.")
+    if df_pl.height == 0:
+        print("❌ ERRO: Nenhuma linha válida após conversão de data.")
+        sys.exit(1)
+    print(f"✅ {df_pl.height} linhas válidas")
+    print(f"\n🔧 Processando valores numéricos...")
+    print(f"\n🔧 Adicionando colunas de tempo...")
+
+    df = df_pl.to_pandas()
+    df['Mes_Ano'] = df['Data_Datetime'].dt.to_period('M')
+    print(f"\n🔧 Adicionando coluna 'Tipo_campanha_HUBSPOT' = 'Pesquisa Paga'")
+    df['Tipo_campanha_HUBSPOT'] = 'Pesquisa Paga'
+    print("\n✅ Processamento básico concluído com sucesso!")
+
+    print(f"  Processando dados para a aba 'Google_YoY'...")
+    df_daily_agg = google.finalizar_diario(diario_pl.to_pandas())
+    return df, df_daily_agg
+
+
+# =====================================================================
+# --- META ADS ---
+# =====================================================================
+
+def processar_meta(path: Path) -> tuple:
+    pl = importar_polars()
+    import analise_performance_meta_teste as meta
+
+    if path.suffix.lower() != '.csv':
+        # Excel não tem leitura lazy: lê com pandas e segue no Polars
+        df_raw = meta.carregar_dados(path)
+        lf_base = pl.from_pandas(df_raw).lazy()
+        separador = None
+        n_linhas = len(df_raw)
+    else:
+        print(f"📊 Carregando dados de: {path} (polars)")
+        separador = detectar_separador(path)
+        lf_base, n_linhas = carregar_lazy(pl, path, separador=separador)
+        print(f"✅ {n_linhas} linhas carregadas")
+
+    def construir(lf):
+        print("\n🔧 Processando dados...")
+        lf = renomear_colunas(pl, lf, meta.normalizar_nome_coluna)
+        print("\n📋 Colunas detectadas (normalizadas):")
+        print(lf.collect_schema().names())
+
+        # A heurística de data só precisa de uma amostra, não do arquivo inteiro
+        amostra = lf.head(1000).collect().to_pandas()
+        col_data = meta.encontrar_coluna_data(amostra)
+        col_invest = meta.encontrar_coluna_investimento(amostra.columns)
+        schema = lf.collect_schema()
+        colunas_texto = [c for c, t in schema.items() if t == pl.String and c != col_invest]
+
+        print(f"\n🔧 Usando coluna de data: '{col_data}' -> convertendo para datetime")
+        lf = lf.with_columns(expr_datas(pl, lf, col_data, 'meta_dia').alias('Data_Datetime'))
+        lf_na = lf.select(pl.col('Data_Datetime').is_null().sum().alias('n'))
+        lf = lf.filter(pl.col('Data_Datetime').is_not_null())
+        lf_validas = lf.select(pl.len().alias('n'))
+
+        lf = lf.with_columns(
+            expr_parse_number(pl, col_invest, schema[col_invest], remover_aspas=False),
+            pl.col('Data_Datetime').dt.year().cast(pl.Int32).alias('Ano'),
+            pl.col('Data_Datetime').dt.month().cast(pl.Int32).alias('Mes'),
+        )
+
+        # Filtro 'bilingual' em qualquer coluna de texto (predicate pushdown)
+        if colunas_texto:
+            mask_bilingual = pl.any_horizontal([
+                pl.col(c).str.to_lowercase().str.contains('bilingual', literal=True).fill_null(False)
+                for c in colunas_texto
+            ])
+            lf = lf.filter(~mask_bilingual)
+
+        lf_diario = lf.group_by('Data_Datetime').agg(pl.col(col_invest).sum().alias('Investimento'))
+        return (col_data, col_invest) + tuple(coletar(pl, [lf, lf_diario, lf_na, lf_validas]))
+
+    if separador is None:
+        resultado = construir(lf_base)
+    else:
+        resultado = coletar_com_schema_completo(pl, construir, path, 0, separador)
+    col_data, col_invest, df_pl, diario_pl, na_pl, validas_pl = resultado
+
+    num_na_dates = na_pl.item()
+    if num_na_dates > 0:
+        print(f"⚠️ Atenção: {num_na_dates} linhas não puderam ser convertidas para data e serão ignoradas.")
+    linhas_antes = validas_pl.item()
+    if linhas_antes == 0:
+        print("❌ ERRO: Nenhuma linha restou após a limpeza das datas. Verifique o formato da data no arquivo.")
+        sys.exit(1)
+
+    print(f"\n🔧 Usando coluna de investimento: '{col_invest}' -> convertendo para número")
+    print("\n🔧 Processando dados... (Ex: Ano, Mês, etc.)")
+    df = df_pl.to_pandas()
+    df['Mes_Ano'] = df['Data_Datetime'].dt.to_period('M')
+
+    print("\n🔧 Aplicando filtro: Excluindo registros com 'bilingual'...")
+    print(f"  ✅ Filtro aplicado: {linhas_antes - len(df)} linhas removidas (contendo 'bilingual')")
+    print(f"  ✅ Linhas restantes: {len(df)}")
+    if df.empty:
+        print("❌ ERRO: Nenhuma linha restou após a exclusão de 'bilingual'. Verifique os dados.")
+        sys.exit(1)
+    print("\n✅ Processamento básico concluído com sucesso!")
+
+    print(f"  Processando dados para a aba 'Meta_YoY'...")
+    df_daily_agg = meta.finalizar_diario(diario_pl.to_pandas())
+    return df, df_daily_agg
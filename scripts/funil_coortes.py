@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+funil_coortes.py
+
+Funil e coortes pré-agregados a partir da Visao_Granular_Final, para o
+dashboard não precisar ler a base linha a linha.
+
+Abas geradas (formato longo, uma métrica por linha de chave):
+
+    Funil_Etapas        negócios por etapa (1 a 8) em cada coorte
+                        (Base_Ciclo, Ciclo_Captacao, Canal, Unidade), com o
+                        total da coorte, a participação da etapa (status
+                        atual), os que alcançaram a etapa (status >= etapa na
+                        ordem do ETAPA_FUNIL_MAP) e as conversões etapa a
+                        etapa e desde a entrada no funil
+    Coorte_Matriculas   matrículas por mês de criação x meses até o fechamento,
+                        com o tamanho da coorte e a taxa de matrícula acumulada
+    Tempo_Faixas        distribuição dos dias entre criação e matrícula
+    Tempo_Resumo        média e percentis dos dias até a matrícula
+
+Base_Ciclo cobre os dois ciclos de captação: 'Criação' agrupa pelo
+Ciclo_Captacao (data de criação) e 'Fechamento' pelo Ciclo_Captacao_Fechamento
+(só negócios com data de fechamento). Cada aba sai de um único groupby por
+base; as taxas são calculadas sobre o resultado agregado.
+
+Uso:
+    python scripts/analise_performance_hubspot.py --funil
+    python scripts/funil_coortes.py                       # último blend em output/
+    python scripts/funil_coortes.py --blend output/dataset_geral_melhorado_20250101_120000.xlsx
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+import analise_performance_hubspot as blend
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+# Nome na Base_Ciclo -> coluna de ciclo da visão granular
+BASES_CICLO = {'Criação': 'Ciclo_Captacao', 'Fechamento': 'Ciclo_Captacao_Fechamento'}
+CHAVES_COORTE = ['Base_Ciclo', 'Ciclo_Captacao', 'Canal', 'Unidade']
+
+# Faixas de dias entre criação e matrícula (limite superior de cada faixa)
+FAIXAS_DIAS = [7, 14, 30, 60, 90, 180]
+PERCENTIS = {'P25_Dias': 0.25, 'Mediana_Dias': 0.5, 'P75_Dias': 0.75, 'P90_Dias': 0.9}
+
+FUNIL_BASE_NAME = "funil_coortes"
+COLUNAS_FUNIL = ['Etapa', 'Ordem_Etapa', 'Negocios_Etapa', 'Negocios_Coorte', 'Participacao',
+                 'Negocios_Alcancaram', 'Conversao_Etapa', 'Conversao_Total']
+
+
+def rotulos_faixas() -> list:
+    inicios = [0] + [fim + 1 for fim in FAIXAS_DIAS]
+    return [f"{ini}-{fim}" for ini, fim in zip(inicios, FAIXAS_DIAS)] + [f"{inicios[-1]}+"]
+
+
+def _por_base(df_granular: pd.DataFrame, bases: list = None, **colunas) -> list:
+    """
+    Uma visão por base de ciclo, com Base_Ciclo, Ciclo_Captacao (o ciclo da base), Canal,
+    Unidade e as colunas extras (alinhadas às linhas da visão granular).
+    """
+    visoes = []
+    for nome in bases or BASES_CICLO:
+        df = pd.DataFrame({
+            'Base_Ciclo': nome,
+            'Ciclo_Captacao': df_granular[BASES_CICLO[nome]].astype(str).to_numpy(),
+            'Canal': df_granular['Origem_Principal'].astype(str).to_numpy(),
+            'Unidade': df_granular['Unidade'].astype(str).to_numpy(),
+            **{coluna: np.asarray(valores) for coluna, valores in colunas.items()},
+        })
+        # Negócio sem fechamento não tem ciclo de fechamento
+        visoes.append(df[df['Ciclo_Captacao'] != blend.DEFAULT_NA_TEXT])
+    return visoes
+
+
+def dias_ate_matricula(df_granular: pd.DataFrame) -> pd.Series:
+    """Dias entre criação e fechamento das matrículas (NaN para os demais negócios)."""
+    dias = (df_granular['Data_Fechamento'] - df_granular['Data']).dt.days.clip(lower=0)
+    return dias.where(df_granular['Matriculas'] == 1)
+
+
+def ordem_funil() -> list:
+    """Etapas do funil na ordem dos valores do ETAPA_FUNIL_MAP (sem repetição)."""
+    return list(dict.fromkeys(blend.ETAPA_FUNIL_MAP.values()))
+
+
+def funil_etapas(df_granular: pd.DataFrame) -> pd.DataFrame:
+    """
+    Negócios por etapa em cada coorte, com o total da coorte, a participação (status
+    atual) e a conversão pelo funil:
+        Negocios_Alcancaram   status na etapa ou em uma posterior (ordem do ETAPA_FUNIL_MAP)
+        Conversao_Etapa       alcançaram a etapa / alcançaram a anterior (vazio na primeira)
+        Conversao_Total       alcançaram a etapa / alcançaram a primeira (entrada no funil)
+    Cada coorte traz todas as etapas do funil (0 nas que não aparecem); status fora do
+    funil (não mapeado) entram só no total e na participação, com Ordem_Etapa 0.
+    """
+    etapas = ordem_funil()
+    partes = []
+    for df in _por_base(df_granular, Etapa=df_granular['Status_Principal'].astype(str)):
+        if df.empty:
+            continue
+        # Um groupby por base; o resto é aritmética na matriz coorte x etapa
+        matriz = df.groupby(CHAVES_COORTE + ['Etapa'], sort=True).size().unstack('Etapa', fill_value=0)
+        fora = [e for e in matriz.columns if e not in etapas]
+        matriz = matriz.reindex(columns=etapas + fora, fill_value=0)
+        contagem = matriz.to_numpy()
+        n_coortes, n_colunas = contagem.shape
+
+        alcancaram = np.full(contagem.shape, np.nan)
+        alcancaram[:, :len(etapas)] = contagem[:, :len(etapas)][:, ::-1].cumsum(axis=1)[:, ::-1]
+        anterior = np.roll(alcancaram, 1, axis=1)
+        anterior[:, 0] = np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            conversao_etapa = np.where(anterior > 0, alcancaram / anterior, np.nan)
+            conversao_total = np.where(alcancaram[:, :1] > 0, alcancaram / alcancaram[:, :1], np.nan)
+
+        funil = matriz.index.to_frame(index=False).loc[np.repeat(np.arange(n_coortes), n_colunas)].reset_index(drop=True)
+        funil['Etapa'] = np.tile(matriz.columns.to_numpy(), n_coortes)
+        funil['Ordem_Etapa'] = np.tile(np.r_[np.arange(1, len(etapas) + 1), np.zeros(len(fora), dtype=int)], n_coortes)
+        funil['Negocios_Etapa'] = contagem.ravel()
+        funil['Negocios_Coorte'] = np.repeat(contagem.sum(axis=1), n_colunas)
+        funil['Negocios_Alcancaram'] = alcancaram.ravel()
+        funil['Conversao_Etapa'] = conversao_etapa.ravel()
+        funil['Conversao_Total'] = conversao_total.ravel()
+        # Status fora do funil só aparecem nas coortes em que existem
+        partes.append(funil[(funil['Ordem_Etapa'] > 0) | (funil['Negocios_Etapa'] > 0)])
+    if not partes:
+        return pd.DataFrame(columns=CHAVES_COORTE + COLUNAS_FUNIL)
+    funil = pd.concat(partes, ignore_index=True)
+    funil.insert(funil.columns.get_loc('Negocios_Alcancaram'), 'Participacao',
+                 funil['Negocios_Etapa'] / funil['Negocios_Coorte'])
+    return funil
+
+
+def coorte_matriculas(df_granular: pd.DataFrame) -> pd.DataFrame:
+    """Matrículas por mês de criação x meses até o fechamento, com a taxa acumulada da coorte."""
+    criacao, fechamento = df_granular['Data'], df_granular['Data_Fechamento']
+    matricula = (df_granular['Matriculas'] == 1) & fechamento.notna()
+    meses = (fechamento.dt.year - criacao.dt.year) * 12 + (fechamento.dt.month - criacao.dt.month)
+    ciclo_fechamento = df_granular['Ciclo_Captacao_Fechamento'].astype(str)
+
+    # Só a base de criação: a coorte é o mês em que o negócio entrou.
+    # Negócios sem matrícula ficam com Meses_Ate_Matricula = -1 (só contam no tamanho da coorte).
+    df, = _por_base(
+        df_granular, bases=['Criação'],
+        Mes_Criacao=criacao.dt.strftime('%Y-%m'),
+        Meses_Ate_Matricula=meses.clip(lower=0).where(matricula, -1).astype('int64'),
+        Ciclo_Fechamento=ciclo_fechamento.where(matricula, blend.DEFAULT_NA_TEXT),
+    )
+    chaves = ['Ciclo_Captacao', 'Mes_Criacao', 'Canal', 'Unidade']
+
+    coorte = df.groupby(chaves + ['Meses_Ate_Matricula', 'Ciclo_Fechamento'], sort=True).size().rename('Matriculas').reset_index()
+    coorte['Negocios_Coorte'] = coorte.groupby(chaves)['Matriculas'].transform('sum')
+    coorte = coorte[coorte['Meses_Ate_Matricula'] >= 0].reset_index(drop=True)
+    coorte['Taxa_Matricula_Acumulada'] = coorte.groupby(chaves)['Matriculas'].cumsum() / coorte['Negocios_Coorte']
+    return coorte.rename(columns={'Ciclo_Fechamento': 'Ciclo_Captacao_Fechamento'})
+
+
+def tempo_ate_matricula(df_granular: pd.DataFrame) -> tuple:
+    """(faixas, resumo) dos dias até a matrícula por coorte."""
+    faixas, resumos = [], []
+    for df in _por_base(df_granular, Dias=dias_ate_matricula(df_granular)):
+        df = df.dropna(subset=['Dias'])
+        if df.empty:
+            continue
+        df = df.assign(Faixa_Dias=pd.cut(df['Dias'], [-1] + FAIXAS_DIAS + [np.inf], labels=rotulos_faixas()))
+
+        contagem = df.groupby(CHAVES_COORTE + ['Faixa_Dias'], sort=True, observed=True).size().rename('Matriculas').reset_index()
+        contagem['Participacao'] = contagem['Matriculas'] / contagem.groupby(CHAVES_COORTE)['Matriculas'].transform('sum')
+        faixas.append(contagem)
+
+        grupos = df.groupby(CHAVES_COORTE, sort=True)['Dias']
+        resumo = grupos.agg(Matriculas='size', Media_Dias='mean')
+        percentis = grupos.quantile(list(PERCENTIS.values())).unstack()
+        percentis.columns = list(PERCENTIS)
+        resumos.append(resumo.join(percentis).reset_index())
+
+    if not faixas:
+        print("    ⚠️  Nenhuma matrícula com data de fechamento: tempo até a matrícula não calculado")
+        return (pd.DataFrame(columns=CHAVES_COORTE + ['Faixa_Dias', 'Matriculas', 'Participacao']),
+                pd.DataFrame(columns=CHAVES_COORTE + ['Matriculas', 'Media_Dias'] + list(PERCENTIS)))
+    faixas = pd.concat(faixas, ignore_index=True)
+    faixas['Faixa_Dias'] = faixas['Faixa_Dias'].astype(str)
+    return faixas, pd.concat(resumos, ignore_index=True)
+
+
+def calcular(df_granular: pd.DataFrame) -> dict:
+    """Todas as abas pré-agregadas: {aba: DataFrame}."""
+    print("\n🔄 Calculando funil e coortes...")
+    faixas, resumo = tempo_ate_matricula(df_granular)
+    tabelas = {
+        'Funil_Etapas': funil_etapas(df_granular),
+        'Coorte_Matriculas': coorte_matriculas(df_granular),
+        'Tempo_Faixas': faixas,
+        'Tempo_Resumo': resumo,
+    }
+    for aba, df in tabelas.items():
+        print(f"    ✅ {aba}: {len(df):,} linhas")
+    return tabelas
+
+
+def salvar(tabelas: dict, output_dir: Path = None) -> Path:
+    """Grava as abas em <output_dir>/funil_coortes_<timestamp>.xlsx."""
+    output_dir = output_dir or blend.OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{FUNIL_BASE_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    print(f"\n💾 Salvando funil e coortes em: {path.resolve()}")
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for aba, df in tabelas.items():
+            df.to_excel(writer, sheet_name=aba, index=False)
+    return path
+
+
+def blend_xlsx_mais_recente() -> Path:
+    candidatos = list(blend.OUTPUT_DIR.glob(f"{blend.BLEND_BASE_NAME}_*.xlsx"))
+    return max(candidatos, key=lambda p: p.stat().st_mtime) if candidatos else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Funil e coortes pré-agregados da Visao_Granular_Final.")
+    parser.add_argument("--blend", type=Path, default=None,
+                        help="xlsx do blend. Padrão: o mais recente em output/.")
+    return parser.parse_args(argv)
+
+
+def carregar_granular(path: Path = None) -> pd.DataFrame:
+    """Visao_Granular_Final do xlsx do blend (padrão: o mais recente em output/)."""
+    path = path or blend_xlsx_mais_recente()
+    if path is None or not path.is_file():
+        print(f"❌ ERRO: Nenhum blend xlsx encontrado em {blend.OUTPUT_DIR} (rode o script do HubSpot antes).")
+        sys.exit(1)
+
+    import troca_arrow
+
+    print(f"📥 Lendo Visao_Granular_Final de: {path}")
+    return troca_arrow.ler_aba(path, 'Visao_Granular_Final', lambda: pd.read_excel(
+        path, sheet_name='Visao_Granular_Final', parse_dates=['Data', 'Data_Fechamento']
+    ))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return salvar(calcular(carregar_granular(args.blend)))
+
+
+if __name__ == "__main__":
+    main()
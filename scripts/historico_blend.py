@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+historico_blend.py
+
+Histórico das execuções do blend, só de acréscimo, com diff barato entre duas
+execuções.
+
+Cada execução (run) guarda as três abas do blend (Visao_Granular_Final,
+Blend_Agregado_Dash, Agregado_Matriculas_Fechamento) com um hash por dia
+(Data; Data_Fechamento na aba de matrículas). Os dias são gravados juntos por
+mês: cada mês vira um Parquet (zstd) endereçado pelo hash dos seus dias:
+
+    output/historico/
+        objetos/ab/ab12...ef.parquet    um mês de uma tabela (gravado uma vez só)
+        runs/20250101_120000.json       manifesto: tabela -> dia -> (hash, objeto do mês)
+
+Meses sem nenhum dia alterado apontam para o mesmo objeto, então o histórico
+cresce só com os meses alterados. Nada é sobrescrito nem apagado.
+
+O hash de cada dia usa as colunas numéricas como float arredondado a
+CASAS_HASH casas (a mesma tolerância do diff): a ida e volta pelo xlsx muda o
+último dígito dos floats e não deve marcar o dia como alterado.
+
+O diff compara os manifestos: dias com o mesmo hash são pulados sem leitura.
+Só os meses com dias alterados são lidos, e só esses dias são comparados:
+    - granular: negócios novos, removidos e alterados (por ID_Negocio_Completo),
+      com as colunas que mudaram;
+    - agregados: linhas novas/removidas e células alteradas (chave do groupby x medida).
+
+Uso:
+    python scripts/analise_performance_hubspot.py --snapshot   # registra ao fim do blend
+    python scripts/historico_blend.py registrar output/dataset_geral_melhorado_*.xlsx
+    python scripts/historico_blend.py listar
+    python scripts/historico_blend.py diff                     # duas últimas execuções
+    python scripts/historico_blend.py diff 20250101_120000 20250102_120000
+
+Precisa do pyarrow (Parquet).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+try:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+except NameError:
+    BASE_DIR = Path.cwd()
+
+HISTORICO_DIR = BASE_DIR / "output" / "historico"
+COMPRESSAO_PARQUET = 'zstd'
+SEM_DATA = "sem_data"
+CASAS_HASH = 6  # atol=1e-6 do _diferentes
+MAX_LINHAS_TELA = 10
+
+CHAVES_AGREGADO = ['Data', 'Canal', 'Campanha', 'Termo', 'Etapas_de_Negocios', 'Pipeline', 'Unidade_Desejada']
+CHAVES_MATRICULAS = ['Data_Fechamento', 'Ciclo_Captacao', 'Canal', 'Campanha', 'Termo', 'Pipeline', 'Unidade_Desejada']
+
+# Tabela -> (aba do xlsx, coluna de partição, chave das linhas)
+TABELAS = {
+    'granular': ('Visao_Granular_Final', 'Data', ['ID_Negocio_Completo']),
+    'agregado': ('Blend_Agregado_Dash', 'Data', CHAVES_AGREGADO),
+    'matriculas': ('Agregado_Matriculas_Fechamento', 'Data_Fechamento', CHAVES_MATRICULAS),
+}
+
+
+# =====================================================================
+# --- Armazenamento ---
+# =====================================================================
+
+def _caminho_objeto(pasta: Path, hash_: str) -> Path:
+    return pasta / "objetos" / hash_[:2] / f"{hash_}.parquet"
+
+
+def _caminho_run(pasta: Path, run_id: str) -> Path:
+    return pasta / "runs" / f"{run_id}.json"
+
+
+def _gravar_atomico(path: Path, gravar):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    gravar(tmp)
+    os.replace(tmp, path)
+
+
+def _gravar_parquet(df: pd.DataFrame, path: Path):
+    try:
+        df.to_parquet(path, index=False, compression=COMPRESSAO_PARQUET)
+    except ImportError:
+        print("\n\n❌ ERRO: A BIBLIOTECA 'pyarrow' NÃO ESTÁ INSTALADA.")
+        print("Para usar o histórico do blend, rode: pip install pyarrow")
+        sys.exit(1)
+
+
+def _mes(dia: str) -> str:
+    return dia if dia == SEM_DATA else dia[:7]
+
+
+def _dias(serie: pd.Series) -> np.ndarray:
+    return pd.to_datetime(serie, errors='coerce').dt.strftime('%Y-%m-%d').fillna(SEM_DATA).to_numpy()
+
+
+def _para_hash(df: pd.DataFrame) -> pd.DataFrame:
+    """Numéricas como float arredondado (int/float e ruído do xlsx no último dígito dão o mesmo hash)."""
+    numericas = [c for c in df.columns
+                 if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+    # + 0.0 junta -0.0 e 0.0
+    return df.assign(**{c: df[c].astype(float).round(CASAS_HASH) + 0.0 for c in numericas})
+
+
+def _normalizar(df: pd.DataFrame, coluna_particao: str) -> pd.DataFrame:
+    """Mesmo conteúdo -> mesmo hash, venha o DataFrame do blend ou do xlsx."""
+    df = df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    if not pd.api.types.is_datetime64_any_dtype(df[coluna_particao]):
+        df[coluna_particao] = pd.to_datetime(df[coluna_particao], errors='coerce')
+    return df
+
+
+def particionar(df: pd.DataFrame, coluna_particao: str, chave: list) -> list:
+    """
+    Ordena por (dia, chave) e retorna [(dia, partição, hash)]. Os hashes por linha
+    são calculados uma vez para o DataFrame inteiro (ver _para_hash) e combinados por dia.
+    """
+    df = df.sort_values([coluna_particao] + chave, na_position='last', kind='stable').reset_index(drop=True)
+    dias = _dias(df[coluna_particao])
+    hashes_linhas = pd.util.hash_pandas_object(_para_hash(df), index=False).to_numpy()
+    cabecalho = json.dumps(list(df.columns)).encode("utf-8")
+
+    inicios = np.flatnonzero(np.r_[True, dias[1:] != dias[:-1]]) if len(df) else []
+    fins = list(inicios[1:]) + [len(df)]
+    particoes = []
+    for inicio, fim in zip(inicios, fins):
+        h = hashlib.sha256(cabecalho)
+        h.update(hashes_linhas[inicio:fim].tobytes())
+        particoes.append((dias[inicio], df.iloc[inicio:fim], h.hexdigest()))
+    return particoes
+
+
+def _novo_run_id(pasta: Path) -> str:
+    base = datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_id, n = base, 2
+    while _caminho_run(pasta, run_id).exists():
+        run_id, n = f"{base}_{n}", n + 1
+    return run_id
+
+
+def registrar(tabelas: dict, pasta: Path = HISTORICO_DIR, origem: str = "") -> str:
+    """
+    Registra uma execução. tabelas: {'granular'|'agregado'|'matriculas': DataFrame}.
+    Só os meses com conteúdo novo são gravados. Retorna o run_id.
+    """
+    inicio = time.perf_counter()
+    run_id = _novo_run_id(pasta)
+    manifesto = {
+        'run_id': run_id,
+        'criado_em': datetime.now().isoformat(timespec="seconds"),
+        'origem': origem,
+        'tabelas': {},
+    }
+    novos = reaproveitados = 0
+    for nome, (_, coluna_particao, chave) in TABELAS.items():
+        df = tabelas.get(nome)
+        if df is None or df.empty:
+            manifesto['tabelas'][nome] = {'colunas': [], 'linhas': 0, 'particoes': {}}
+            continue
+        df = _normalizar(df, coluna_particao)
+        meses = {}
+        for dia, parte, hash_ in particionar(df, coluna_particao, chave):
+            meses.setdefault(_mes(dia), []).append((dia, parte, hash_))
+
+        particoes = {}
+        for dias in meses.values():
+            h = hashlib.sha256()
+            for _, _, hash_ in dias:
+                h.update(hash_.encode("ascii"))
+            objeto = h.hexdigest()
+            path = _caminho_objeto(pasta, objeto)
+            if path.exists():
+                reaproveitados += 1
+            else:
+                mes = pd.concat([parte for _, parte, _ in dias], ignore_index=True)
+                _gravar_atomico(path, lambda tmp: _gravar_parquet(mes, tmp))
+                novos += 1
+            for dia, parte, hash_ in dias:
+                particoes[dia] = {'hash': hash_, 'objeto': objeto, 'linhas': len(parte)}
+        manifesto['tabelas'][nome] = {'colunas': list(df.columns), 'linhas': len(df), 'particoes': particoes}
+
+    def gravar_manifesto(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=1)
+
+    _gravar_atomico(_caminho_run(pasta, run_id), gravar_manifesto)
+    print(f"\n🗂️  Histórico: execução '{run_id}' registrada em {time.perf_counter() - inicio:.2f}s "
+          f"({novos} meses novos, {reaproveitados} reaproveitados)")
+    return run_id
+
+
+def registrar_xlsx(path: Path, pasta: Path = HISTORICO_DIR) -> str:
+    """Registra um xlsx de blend já gerado (ex: para migrar os arquivos antigos de output/)."""
+    abas = pd.read_excel(path, sheet_name=None)
+    tabelas = {nome: abas.get(aba) for nome, (aba, _, _) in TABELAS.items()}
+    return registrar(tabelas, pasta, origem=str(path))
+
+
+def listar_runs(pasta: Path = HISTORICO_DIR) -> list:
+    return sorted(p.stem for p in (pasta / "runs").glob("*.json"))
+
+
+def carregar_manifesto(pasta: Path, run_id: str) -> dict:
+    path = _caminho_run(pasta, run_id)
+    if not path.exists():
+        print(f"❌ ERRO: Execução '{run_id}' não encontrada no histórico ({pasta}).")
+        sys.exit(1)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# =====================================================================
+# --- Diff ---
+# =====================================================================
+
+def _hash_dia(particao: dict):
+    # Manifestos antigos (um objeto por dia) não têm 'hash': o objeto é o hash do dia
+    return particao.get('hash', particao.get('objeto'))
+
+
+def _ler_particoes(pasta: Path, particoes: dict, dias: list, colunas: list, coluna_particao: str) -> pd.DataFrame:
+    """Lê os objetos (meses) que contêm os dias pedidos, cada um uma vez, e fica só com esses dias."""
+    objetos = dict.fromkeys(particoes[d]['objeto'] for d in dias if d in particoes)
+    partes = [pd.read_parquet(_caminho_objeto(pasta, objeto)) for objeto in objetos]
+    if not partes:
+        return pd.DataFrame(columns=colunas)
+    df = pd.concat(partes, ignore_index=True)
+    return df[np.isin(_dias(df[coluna_particao]), dias)].reset_index(drop=True)
+
+
+def _diferentes(antes: pd.Series, depois: pd.Series) -> np.ndarray:
+    """Máscara de valores alterados (NaN == NaN; floats com tolerância de centavo)."""
+    if pd.api.types.is_numeric_dtype(antes) and pd.api.types.is_numeric_dtype(depois):
+        return ~np.isclose(antes.to_numpy(dtype=float), depois.to_numpy(dtype=float), rtol=1e-9, atol=1e-6, equal_nan=True)
+    return (~((antes == depois) | (antes.isna() & depois.isna()))).to_numpy()
+
+
+def comparar_linhas(a: pd.DataFrame, b: pd.DataFrame, chave: list) -> dict:
+    """Linhas novas/removidas e células alteradas entre duas versões da mesma tabela."""
+    m = a.merge(b, on=chave, how='outer', suffixes=('_antes', '_depois'), indicator=True)
+    comuns = m[m['_merge'] == 'both']
+    colunas = [c for c in a.columns if c in b.columns and c not in chave]
+
+    alteracoes = []
+    for coluna in colunas:
+        antes, depois = comuns[f"{coluna}_antes"], comuns[f"{coluna}_depois"]
+        mascara = _diferentes(antes, depois)
+        if mascara.any():
+            alteracoes.append(comuns.loc[mascara, chave].assign(
+                Coluna=coluna, Antes=antes[mascara].to_numpy(), Depois=depois[mascara].to_numpy()
+            ))
+    alteracoes = pd.concat(alteracoes, ignore_index=True) if alteracoes else pd.DataFrame(columns=chave + ['Coluna', 'Antes', 'Depois'])
+
+    return {
+        'novas': m.loc[m['_merge'] == 'right_only', chave].reset_index(drop=True),
+        'removidas': m.loc[m['_merge'] == 'left_only', chave].reset_index(drop=True),
+        'alteracoes': alteracoes,
+        'colunas_novas': [c for c in b.columns if c not in a.columns],
+        'colunas_removidas': [c for c in a.columns if c not in b.columns],
+    }
+
+
+def diff(run_a: str, run_b: str, pasta: Path = HISTORICO_DIR) -> dict:
+    """Compara duas execuções lendo só os dias cujo hash mudou. Retorna {tabela: resultado}."""
+    man_a, man_b = carregar_manifesto(pasta, run_a), carregar_manifesto(pasta, run_b)
+    resultados = {}
+    for nome, (_, coluna_particao, chave) in TABELAS.items():
+        tab_a = man_a['tabelas'].get(nome, {'colunas': [], 'particoes': {}})
+        tab_b = man_b['tabelas'].get(nome, {'colunas': [], 'particoes': {}})
+        part_a, part_b = tab_a['particoes'], tab_b['particoes']
+        dias = sorted(set(part_a) | set(part_b))
+        alterados = [d for d in dias if _hash_dia(part_a.get(d, {})) != _hash_dia(part_b.get(d, {}))]
+
+        resultado = {'dias': len(dias), 'dias_alterados': alterados}
+        if alterados:
+            a = _ler_particoes(pasta, part_a, alterados, tab_a['colunas'], coluna_particao)
+            b = _ler_particoes(pasta, part_b, alterados, tab_b['colunas'], coluna_particao)
+            # Só dias novos (ou só removidos): o lado vazio herda os tipos do outro para o merge
+            if a.empty:
+                a = b.iloc[:0]
+            elif b.empty:
+                b = a.iloc[:0]
+            resultado.update(comparar_linhas(a, b, chave))
+        resultados[nome] = resultado
+    return resultados
+
+
+def imprimir_diff(run_a: str, run_b: str, resultados: dict):
+    print(f"\n🔀 Diff do blend: {run_a} -> {run_b}")
+    for nome, r in resultados.items():
+        aba, _, chave = TABELAS[nome]
+        print(f"\n    📄 {aba}: {len(r['dias_alterados'])} de {r['dias']} dias alterados")
+        if not r['dias_alterados']:
+            continue
+        unidade = "negócios" if nome == 'granular' else "linhas"
+        alteracoes = r['alteracoes']
+        n_alteradas = len(alteracoes.drop_duplicates(chave)) if len(alteracoes) else 0
+        print(f"       ➕ {len(r['novas'])} {unidade} novos | ➖ {len(r['removidas'])} removidos | "
+              f"✏️  {n_alteradas} alterados ({len(alteracoes)} células)")
+        if r['colunas_novas'] or r['colunas_removidas']:
+            print(f"       ⚠️  colunas novas: {r['colunas_novas']} | removidas: {r['colunas_removidas']}")
+        if len(alteracoes):
+            por_coluna = alteracoes['Coluna'].value_counts()
+            print("       Células alteradas por coluna: " + ", ".join(f"{c}={n}" for c, n in por_coluna.items()))
+            for _, linha in alteracoes.head(MAX_LINHAS_TELA).iterrows():
+                ident = " | ".join(str(linha[c]) for c in chave)
+                print(f"          {ident} :: {linha['Coluna']}: {linha['Antes']} -> {linha['Depois']}")
+
+
+def salvar_diff(resultados: dict, path: Path):
+    """Um CSV com todas as diferenças (tabela, tipo, chave, coluna, antes, depois)."""
+    partes = []
+    for nome, r in resultados.items():
+        chave = TABELAS[nome][2]
+        for tipo in ('novas', 'removidas', 'alteracoes'):
+            df = r.get(tipo)
+            if df is None or df.empty:
+                continue
+            df = df.copy()
+            df.insert(0, 'Chave', df[chave].astype(str).agg(" | ".join, axis=1))
+            partes.append(df.drop(columns=chave).assign(Tabela=TABELAS[nome][0], Tipo=tipo))
+    colunas = ['Tabela', 'Tipo', 'Chave', 'Coluna', 'Antes', 'Depois']
+    detalhe = pd.concat(partes, ignore_index=True).reindex(columns=colunas) if partes else pd.DataFrame(columns=colunas)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    detalhe.to_csv(path, index=False, encoding="utf-8-sig")
+    print(f"\n    📄 Detalhe do diff: {path}")
+
+
+# =====================================================================
+# --- CLI ---
+# =====================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Histórico das execuções do blend e diff entre execuções.")
+    parser.add_argument("--pasta", type=Path, default=HISTORICO_DIR, help=f"Pasta do histórico. Padrão: {HISTORICO_DIR}.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("registrar", help="Registra xlsx de blend já gerados (um run por arquivo, na ordem dada).")
+    p.add_argument("arquivos", nargs="+", type=Path, metavar="XLSX")
+    sub.add_parser("listar", help="Lista as execuções registradas.")
+    p = sub.add_parser("diff", help="Compara duas execuções. Padrão: as duas últimas.")
+    p.add_argument("runs", nargs="*", metavar="RUN_ID", help="Nenhum (duas últimas), um (contra a última) ou dois.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pasta = args.pasta
+
+    if args.comando == "registrar":
+        for path in args.arquivos:
+            print(f"📥 {path}")
+            registrar_xlsx(path, pasta)
+        return
+
+    runs = listar_runs(pasta)
+    if args.comando == "listar":
+        if not runs:
+            print(f"⚠️  Nenhuma execução no histórico ({pasta}).")
+        for run_id in runs:
+            man = carregar_manifesto(pasta, run_id)
+            tabelas = man['tabelas']
+            print(f"    {run_id}  {tabelas['granular']['linhas']:>9,} negócios  "
+                  f"{len(tabelas['granular']['particoes']):>5} dias  {man['origem']}")
+        return
+
+    if len(args.runs) == 2:
+        run_a, run_b = args.runs
+    elif len(args.runs) == 1 and runs:
+        run_a, run_b = args.runs[0], runs[-1]
+    elif not args.runs and len(runs) >= 2:
+        run_a, run_b = runs[-2:]
+    else:
+        print("❌ ERRO: Informe até duas execuções (sem argumentos, o histórico precisa ter pelo menos duas).")
+        sys.exit(1)
+
+    inicio = time.perf_counter()
+    resultados = diff(run_a, run_b, pasta)
+    imprimir_diff(run_a, run_b, resultados)
+    salvar_diff(resultados, pasta / f"diff_{run_a}_{run_b}.csv")
+    print(f"    ⏱️  Diff em {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ids_particionados.py
+
+Geração de ID_Negocio_Completo / Lead_Key por partição de dias, em paralelo.
+
+generate_unique_id() ordena a base inteira por ['Chave_ID', 'RVO'] e numera
+com um cumcount global. Como a Chave_ID começa pela data (aaaammdd_unidade_
+origem), a sequência de desempate nunca cruza dias: cada fatia de dias inteiros
+pode ser numerada sozinha e as fatias, concatenadas em ordem de data, dão a
+mesma ordenação global.
+
+Diferença em relação ao modo global: negócios empatados em (Chave_ID, RVO) são
+desempatados pela impressão digital da linha (hash de todas as colunas), e não
+pela posição no arquivo. Assim o ID não depende da ordem em que as linhas
+chegam nem de como os dias foram fatiados entre processos; só muda em relação
+ao modo global nesses empates.
+
+Uso:
+    python scripts/analise_performance_hubspot.py --ids particionado --processos 8
+    python scripts/benchmark_ids.py --linhas 500000
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from importacao_tardia import importar_tardio
+
+import mapeamento
+import pool_processos
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+MODOS = ['global', 'particionado']
+# Fatias por processo: dias com volumes diferentes ficam balanceados entre os workers
+FATIAS_POR_PROCESSO = 4
+
+
+def abreviar(texto: str, tamanho: int) -> str:
+    """Letras A-Z do texto em maiúsculas, sem acentos, cortado/completado com 'X' (mesma regra de create_long_id)."""
+    letras = unicodedata.normalize('NFKD', str(texto).upper()).encode('ascii', 'ignore').decode('utf-8')
+    return re.sub(r'[^A-Z]', '', letras)[:tamanho].ljust(tamanho, 'X')
+
+
+def chaves_para_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """Só o que a numeração precisa, com a posição original e a impressão digital de cada linha."""
+    return pd.DataFrame({
+        'Data': df['Data'].to_numpy(),
+        'Unidade': df['Unidade'].astype(str).to_numpy(),
+        'Origem_Principal': df['Origem_Principal'].astype(str).to_numpy(),
+        'RVO': df['RVO'].to_numpy(),
+        'Impressao': pd.util.hash_pandas_object(df, index=False).to_numpy(),
+        'Posicao': np.arange(len(df)),
+    })
+
+
+def fatiar(chaves: pd.DataFrame, n_fatias: int) -> list:
+    """Divide em até n_fatias blocos de dias inteiros e consecutivos (em ordem de data)."""
+    dias = chaves['Data'].to_numpy(dtype='datetime64[D]')
+    ordem = np.argsort(dias, kind='stable')
+    dias_ordenados = dias[ordem]
+    unicos = np.unique(dias_ordenados)
+    limites = [grupo[0] for grupo in np.array_split(unicos, max(1, min(n_fatias, len(unicos)))) if len(grupo)]
+    cortes = np.searchsorted(dias_ordenados, limites[1:], 'left')
+    return [chaves.iloc[pedaco] for pedaco in np.split(ordem, cortes)]
+
+
+def ids_da_fatia(fatia: pd.DataFrame) -> pd.DataFrame:
+    """Numera uma fatia de dias inteiros. Retorna Posicao, ID_Negocio_Completo e Lead_Key na ordem final."""
+    data_str = fatia['Data'].dt.strftime('%Y%m%d')
+    chave_id = data_str + '_' + fatia['Unidade'] + '_' + fatia['Origem_Principal']
+    fatia = fatia.assign(Chave_ID=chave_id, Data_Str=data_str).sort_values(
+        ['Chave_ID', 'RVO', 'Impressao', 'Posicao'], ascending=[True, False, True, True], kind='stable'
+    )
+    seq_str = (fatia.groupby('Chave_ID', sort=False).cumcount() + 1).astype(str).str.zfill(3)
+
+    unidade_str = mapeamento.aplicar_em_unicos(fatia['Unidade'], lambda v: abreviar(v, 10), categorico=False)
+    origem_str = mapeamento.aplicar_em_unicos(fatia['Origem_Principal'], lambda v: abreviar(v, 5), categorico=False)
+    hash_val = pd.Series([
+        hashlib.sha1(f"{chave}_{seq}".encode()).hexdigest()[:4].upper()
+        for chave, seq in zip(fatia['Chave_ID'], seq_str)
+    ], index=fatia.index, dtype=object)
+
+    ids = fatia['Data_Str'] + '_' + unidade_str + '_' + origem_str + '_' + seq_str + '_' + hash_val
+    lead_key = fatia['Data_Str'].str[-2:] + hash_val + seq_str
+    return pd.DataFrame({
+        'Posicao': fatia['Posicao'].to_numpy(),
+        'ID_Negocio_Completo': ids.to_numpy(),
+        'Lead_Key': lead_key.to_numpy(),
+    })
+
+
+def gerar_ids(df: pd.DataFrame, processos: int = None, n_fatias: int = None) -> pd.DataFrame:
+    """
+    Equivalente particionado de generate_unique_id(): mesma ordem de linhas e mesmas
+    colunas ID_Negocio_Completo / Lead_Key, numerando fatias de dias em um pool de processos.
+    processos=1 numera tudo no processo atual; n_fatias sobrescreve o fatiamento padrão.
+    """
+    processos = processos or os.cpu_count() or 1
+    n_fatias = n_fatias or processos * FATIAS_POR_PROCESSO
+    print(f"    🔑 Gerando IDs por partição de dias ({processos} processo(s))...")
+
+    fatias = fatiar(chaves_para_ids(df), n_fatias)
+    if processos == 1 or len(fatias) == 1:
+        resultados = [ids_da_fatia(fatia) for fatia in fatias]
+    else:
+        with ProcessPoolExecutor(max_workers=processos, mp_context=pool_processos.contexto_pool()) as pool:
+            resultados = list(pool.map(ids_da_fatia, fatias))
+
+    # Fatias em ordem de data e Chave_ID começando pela data: a concatenação já é a ordem global
+    ids = pd.concat(resultados, ignore_index=True)
+    df = df.iloc[ids['Posicao'].to_numpy()].copy()
+    df['ID_Negocio_Completo'] = ids['ID_Negocio_Completo'].to_numpy()
+    df['Lead_Key'] = ids['Lead_Key'].to_numpy()
+    print(f"    ✅ IDs gerados com sucesso ({len(fatias)} fatias).")
+    return df
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+importacao_tardia.py
+
+Importação tardia das bibliotecas pesadas (pandas, numpy). O módulo só é
+carregado de verdade no primeiro acesso a um atributo (importlib.util.LazyLoader),
+então caminhos que só leem cabeçalhos (midiapaga inspect / --dry-run) não pagam
+o import do pandas (~0,3s).
+
+Uso nos scripts (junto com 'from __future__ import annotations', para que as
+anotações pd.DataFrame não disparem o carregamento):
+
+    pd = importar_tardio("pandas")
+"""
+
+import importlib.util
+import sys
+
+
+def importar_tardio(nome: str):
+    """Retorna o módulo 'nome', carregado só quando for usado pela primeira vez."""
+    if nome in sys.modules:
+        return sys.modules[nome]
+
+    spec = importlib.util.find_spec(nome)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{nome}'", name=nome)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    loader.exec_module(modulo)
+    return modulo
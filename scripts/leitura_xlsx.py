@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+leitura_xlsx.py
+
+Leitura rápida de uma aba de xlsx, só com as colunas usadas, para quando os
+relatórios Meta_Completo / Google_Completo só existem em xlsx (sem o .arrow
+de troca_arrow.py).
+
+Motores, em ordem de preferência no modo 'auto':
+
+    calamine         python-calamine (Rust): lê a aba inteira fora do Python e
+                     só as colunas pedidas viram listas Python
+    openpyxl_stream  openpyxl read_only: percorre as linhas da aba em streaming,
+                     guardando só as colunas pedidas (sem DataFrame da aba inteira)
+    pandas           pd.read_excel com openpyxl (leitura anterior, todas as colunas)
+
+As colunas vêm de resolver(cabeçalho) -> índices, o mesmo contrato de
+validar_investimentos.linhas_xlsx e troca_arrow.linhas. Se alguma coluna não
+for encontrada, a aba é lida inteira e quem chamou reporta a coluna ausente.
+Células vazias saem como None/NaN e datas como datetime64, como no read_excel.
+
+Uso:
+    python scripts/benchmark_xlsx.py --linhas 500000   # tempo por motor na Google_Completo
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+pd = importar_tardio("pandas")
+
+MOTORES = ['calamine', 'openpyxl_stream', 'pandas']
+# 'auto' = primeiro motor instalado de MOTORES
+MOTOR = "auto"
+
+
+def disponivel(motor: str) -> bool:
+    if motor == 'calamine':
+        return importlib.util.find_spec("python_calamine") is not None
+    return importlib.util.find_spec("openpyxl") is not None
+
+
+def escolher_motor(motor: str = None) -> str:
+    motor = motor or MOTOR
+    if motor != "auto":
+        return motor
+    return next((m for m in MOTORES if disponivel(m)), 'pandas')
+
+
+def _nomes(cabecalho: list, indices: list) -> list:
+    return [f"Unnamed: {i}" if cabecalho[i] is None else str(cabecalho[i]) for i in indices]
+
+
+def _selecionar(cabecalho: list, resolver) -> list:
+    """Índices das colunas pedidas; todas se não houver resolver ou faltar alguma."""
+    indices = resolver(cabecalho) if resolver else None
+    if indices is None or None in indices:
+        if resolver:
+            print("    ⚠️  Nem todas as colunas foram encontradas no cabeçalho; lendo a aba inteira")
+        return list(range(len(cabecalho)))
+    return list(indices)
+
+
+def _montar(cabecalho: list, indices: list, colunas: list) -> pd.DataFrame:
+    """DataFrame das colunas lidas (o construtor infere float/datetime64, None vira NaN/NaT)."""
+    return pd.DataFrame(dict(zip(_nomes(cabecalho, indices), colunas)))
+
+
+def ler_calamine(path: Path, aba: str, resolver=None) -> pd.DataFrame:
+    from python_calamine import CalamineWorkbook
+
+    linhas = CalamineWorkbook.from_path(str(path)).get_sheet_by_name(aba).to_python()
+    if not linhas:
+        return pd.DataFrame()
+    cabecalho = [None if c == "" else c for c in linhas[0]]
+    indices = _selecionar(cabecalho, resolver)
+    corpo = linhas[1:]
+    # calamine devolve "" nas células vazias; o read_excel devolve NaN
+    colunas = [[None if linha[i] == "" else linha[i] for linha in corpo] for i in indices]
+    return _montar(cabecalho, indices, colunas)
+
+
+def ler_openpyxl_stream(path: Path, aba: str, resolver=None) -> pd.DataFrame:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[aba]
+        cabecalho = list(next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ()))
+        indices = _selecionar(cabecalho, resolver)
+        colunas = [[] for _ in indices]
+        for linha in ws.iter_rows(min_row=2, max_col=max(indices, default=-1) + 1, values_only=True):
+            for coluna, i in zip(colunas, indices):
+                coluna.append(linha[i] if i < len(linha) else None)
+    finally:
+        wb.close()
+    return _montar(cabecalho, indices, colunas)
+
+
+def ler_pandas(path: Path, aba: str, resolver=None) -> pd.DataFrame:
+    return pd.read_excel(path, sheet_name=aba)
+
+
+LEITORES = {'calamine': ler_calamine, 'openpyxl_stream': ler_openpyxl_stream, 'pandas': ler_pandas}
+
+
+def ler_aba(path: Path, aba: str, resolver=None, motor: str = None) -> pd.DataFrame:
+    """Lê só a aba 'aba' (e só as colunas do resolver) com o motor escolhido."""
+    motor = escolher_motor(motor)
+    print(f"    📊 Lendo aba '{aba}' ({motor}): {Path(path).name}")
+    return LEITORES[motor](Path(path), aba, resolver)
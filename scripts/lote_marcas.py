@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lote_marcas.py
+
+Execução em lote do pipeline para várias marcas (escolas) em um só comando,
+sem copiar os scripts para mudar as constantes.
+
+Cada marca tem a sua pasta de dados, a sua pasta de saída e os seus rótulos.
+As marcas rodam em um pool de processos (uma marca por vez em cada worker,
+meta -> google -> hubspot em sequência dentro da marca):
+
+    - pandas/openpyxl, os scripts e as tabelas de mapeamento (ETAPA_FUNIL_MAP,
+      CANAL_MAP_FINAL...) são importados uma vez no processo principal; no
+      Linux os workers nascem por fork e herdam tudo já carregado. No Windows
+      cada worker importa uma vez e é reaproveitado pelas marcas seguintes.
+    - Antes de cada marca as constantes dos scripts voltam ao padrão e recebem
+      os valores da marca (pastas, rótulos, arquivo de regras, filtro de
+      canais, palavras-chave).
+    - O log de cada marca vai para <pasta_saida>/execucao.log e o relatório da
+      execução (status e duração por etapa, arquivos gerados, conversões de
+      data) para <pasta_saida>/relatorio_execucao.json.
+
+Uso:
+    python scripts/lote_marcas.py marcas.json
+    python scripts/lote_marcas.py marcas.json --workers 4 --engine-exports polars
+
+Formato do arquivo (caminhos relativos à raiz do projeto):
+    [
+        {
+            "nome": "red_balloon",
+            "pasta_dados": "data/red_balloon",
+            "pasta_saida": "saidas/red_balloon",
+            "meta_account_label": "Red Balloon - Contas Meta",
+            "area_gestao_default": "Gestão Antiga",
+            "regras": "data/red_balloon/regras_negocio.toml",
+            "canal_filtro": ["social pago", "pesquisa paga", "cpc"],
+            "colunas_hubspot": {"unidade": ["escola", "unidade_desejada"]}
+        }
+    ]
+
+Só 'nome' e 'pasta_dados' são obrigatórios; os demais campos usam os
+valores dos scripts (ver CAMPOS_MARCA).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pool_processos
+import regras_negocio
+
+try:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+except NameError:
+    BASE_DIR = Path.cwd()
+
+ETAPAS = ["meta", "google", "hubspot"]
+ARQUIVO_LOG = "execucao.log"
+ARQUIVO_RELATORIO = "relatorio_execucao.json"
+
+# Campos aceitos no arquivo de marcas -> descrição (para a mensagem de erro)
+CAMPOS_MARCA = {
+    'nome': "identificador da marca (pasta de saída padrão: saidas/<nome>)",
+    'pasta_dados': "pasta com meta_dataset.csv, googleads_dataset.csv e hubspot_dataset.csv",
+    'pasta_saida': "pasta dos relatórios, do blend, do log e do relatório da execução",
+    'meta_account_label': "Nome_Conta_Final dos negócios do canal da plataforma meta",
+    'google_account_label': "Nome_Conta_Final dos negócios do canal da plataforma google",
+    'area_gestao_default': "Area_Gestao_RVO",
+    'regras': "arquivo TOML de regras de negócio (ver regras_negocio.py) no lugar do padrão",
+    'canal_filtro': "fontes de tráfego (chaves do CANAL_MAP_FINAL) consideradas mídia paga (desliga os padrões regex)",
+    'colunas_hubspot': "palavras-chave do find_col por campo (substituem as do script)",
+    'nomes_data': "nomes aceitos para a coluna de data do Meta",
+    'nomes_invest': "nomes aceitos para a coluna de investimento do Meta",
+    'etapas': "etapas a rodar, na ordem (padrão: meta, google, hubspot)",
+}
+
+# Constantes de cada script que uma marca pode trocar (restauradas antes de cada marca)
+CONSTANTES = {
+    'meta': ['FILE_PATH', 'OUTPUT_DIR', 'OUT_EXCEL_FILE', 'POSSIVEIS_NOMES_DATA', 'POSSIVEIS_NOMES_INVEST'],
+    'google': ['FILE_PATH', 'OUTPUT_DIR', 'OUT_EXCEL_FILE'],
+    'hubspot': [
+        'HUBSPOT_FILE', 'META_REPORT_FILE', 'GOOGLE_REPORT_FILE', 'OUTPUT_DIR', 'DIAGNOSTICO_MAPEAMENTO_FILE',
+        'DUPLICADOS_HUBSPOT_FILE',
+        'META_ACCOUNT_OTHER_LABEL', 'GOOGLE_ACCOUNT_LABEL', 'AREA_GESTAO_DEFAULT',
+        'REGRAS_FILE', 'REGRAS', 'DEFAULT_NA_TEXT', 'CANAL_MAP_FINAL', 'CANAL_PADROES', 'ETAPA_FUNIL_MAP',
+        'ETAPA_PADROES', 'MATRICULA_NOME_FINAL', 'ETAPAS_NEGOCIO', 'CANAL_PLATAFORMA',
+        'COLUNAS_HUBSPOT', 'COLUNAS_META_RELATORIO', 'COLUNAS_GOOGLE_RELATORIO',
+    ],
+}
+
+# Preenchidos por aquecer() / iniciar_worker() em cada processo
+MODULOS = {}
+PADROES = {}
+
+
+# =====================================================================
+# --- Arquivo de marcas ---
+# =====================================================================
+
+def _caminho(valor) -> Path:
+    return (BASE_DIR / valor).resolve()
+
+
+def carregar_marcas(path: Path) -> list:
+    """Lê e valida o arquivo de marcas. Qualquer erro encerra antes de subir o pool."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            marcas = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ ERRO: Não foi possível ler o arquivo de marcas '{path}': {e}")
+        sys.exit(1)
+
+    if not isinstance(marcas, list) or not marcas:
+        print("❌ ERRO: O arquivo de marcas deve ser uma lista com pelo menos uma marca.")
+        sys.exit(1)
+
+    erros = []
+    for i, marca in enumerate(marcas):
+        nome = marca.get('nome', f"#{i + 1}") if isinstance(marca, dict) else f"#{i + 1}"
+        if not isinstance(marca, dict):
+            erros.append(f"{nome}: cada marca deve ser um objeto")
+            continue
+        desconhecidos = sorted(set(marca) - set(CAMPOS_MARCA))
+        if desconhecidos:
+            erros.append(f"{nome}: campos desconhecidos {desconhecidos}")
+        for obrigatorio in ('nome', 'pasta_dados'):
+            if not marca.get(obrigatorio):
+                erros.append(f"{nome}: campo '{obrigatorio}' obrigatório")
+        invalidas = [e for e in marca.get('etapas', ETAPAS) if e not in ETAPAS]
+        if invalidas:
+            erros.append(f"{nome}: etapas inválidas {invalidas} (escolha entre {ETAPAS})")
+        if marca.get('pasta_dados') and not _caminho(marca['pasta_dados']).is_dir():
+            erros.append(f"{nome}: pasta de dados não encontrada ({_caminho(marca['pasta_dados'])})")
+        if marca.get('regras'):
+            try:
+                regras_negocio.carregar(_caminho(marca['regras']))
+            except ValueError as e:
+                erros.append(f"{nome}: {e}")
+
+    nomes = [m.get('nome') for m in marcas if isinstance(m, dict)]
+    repetidos = sorted({n for n in nomes if nomes.count(n) > 1})
+    if repetidos:
+        erros.append(f"nomes repetidos: {repetidos}")
+
+    if erros:
+        print("❌ ERRO: Arquivo de marcas inválido:")
+        for erro in erros:
+            print(f"    - {erro}")
+        print(f"    Campos aceitos: {', '.join(CAMPOS_MARCA)}")
+        sys.exit(1)
+
+    for marca in marcas:
+        marca.setdefault('pasta_saida', f"saidas/{marca['nome']}")
+        marca.setdefault('etapas', list(ETAPAS))
+    saidas = [_caminho(m['pasta_saida']) for m in marcas]
+    if len(set(saidas)) != len(saidas):
+        print("❌ ERRO: Duas marcas gravariam na mesma pasta_saida.")
+        sys.exit(1)
+    return marcas
+
+
+# =====================================================================
+# --- Workers ---
+# =====================================================================
+
+def aquecer():
+    """Importa bibliotecas e scripts uma vez (no processo principal, antes do fork)."""
+    import numpy
+    import openpyxl  # noqa: F401  (usado pelo pandas na leitura/escrita de xlsx)
+    import pandas
+    import cache_etapas  # noqa: F401
+    import datas  # noqa: F401
+    import analise_performance_google
+    import analise_performance_hubspot
+    import analise_performance_meta_teste
+
+    # Os scripts importam pandas/numpy de forma tardia: o acesso força a carga
+    # agora, para os workers criados por fork já receberem tudo carregado
+    pandas.DataFrame, numpy.ndarray
+    # Regras de negócio padrão (lidas no primeiro uso) antes de guardar os padrões das constantes
+    analise_performance_hubspot.carregar_regras()
+
+    MODULOS.update({
+        "meta": analise_performance_meta_teste,
+        "google": analise_performance_google,
+        "hubspot": analise_performance_hubspot,
+    })
+
+
+def iniciar_worker():
+    """Guarda os valores originais das constantes (o processo ainda não rodou nenhuma marca)."""
+    aquecer()
+    for etapa, nomes in CONSTANTES.items():
+        PADROES[etapa] = {nome: getattr(MODULOS[etapa], nome) for nome in nomes}
+
+
+def aplicar_marca(marca: dict):
+    """Restaura as constantes dos scripts e aplica as da marca."""
+    for etapa, valores in PADROES.items():
+        for nome, valor in valores.items():
+            setattr(MODULOS[etapa], nome, valor)
+
+    meta, google, hubspot = MODULOS["meta"], MODULOS["google"], MODULOS["hubspot"]
+    dados = _caminho(marca['pasta_dados'])
+    saida = _caminho(marca['pasta_saida'])
+
+    # Meta/Google: relatórios em <saida>/outputs, como o 'outputs/' do projeto
+    for etapa in ("meta", "google"):
+        modulo, padroes = MODULOS[etapa], PADROES[etapa]
+        modulo.FILE_PATH = dados / padroes['FILE_PATH'].name
+        modulo.OUTPUT_DIR = saida / "outputs"
+        modulo.OUT_EXCEL_FILE = modulo.OUTPUT_DIR / padroes['OUT_EXCEL_FILE'].name
+    if 'nomes_data' in marca:
+        meta.POSSIVEIS_NOMES_DATA = list(marca['nomes_data'])
+    if 'nomes_invest' in marca:
+        meta.POSSIVEIS_NOMES_INVEST = list(marca['nomes_invest'])
+
+    # HubSpot: lê os relatórios gerados acima e grava o blend em <saida>/output
+    hubspot.HUBSPOT_FILE = dados / PADROES['hubspot']['HUBSPOT_FILE'].name
+    hubspot.META_REPORT_FILE = meta.OUT_EXCEL_FILE
+    hubspot.GOOGLE_REPORT_FILE = google.OUT_EXCEL_FILE
+    hubspot.OUTPUT_DIR = saida / "output"
+    hubspot.DIAGNOSTICO_MAPEAMENTO_FILE = hubspot.OUTPUT_DIR / PADROES['hubspot']['DIAGNOSTICO_MAPEAMENTO_FILE'].name
+    hubspot.DUPLICADOS_HUBSPOT_FILE = hubspot.OUTPUT_DIR / PADROES['hubspot']['DUPLICADOS_HUBSPOT_FILE'].name
+    hubspot.META_ACCOUNT_OTHER_LABEL = marca.get('meta_account_label', hubspot.META_ACCOUNT_OTHER_LABEL)
+    hubspot.GOOGLE_ACCOUNT_LABEL = marca.get('google_account_label', hubspot.GOOGLE_ACCOUNT_LABEL)
+    hubspot.AREA_GESTAO_DEFAULT = marca.get('area_gestao_default', hubspot.AREA_GESTAO_DEFAULT)
+    if 'regras' in marca:
+        hubspot.usar_regras(_caminho(marca['regras']))
+    if 'canal_filtro' in marca:
+        desconhecidos = [c for c in marca['canal_filtro'] if c not in hubspot.CANAL_MAP_FINAL]
+        if desconhecidos:
+            raise ValueError(f"canal_filtro com fontes sem canal final: {desconhecidos} (aceitas: {list(hubspot.CANAL_MAP_FINAL)})")
+        hubspot.CANAL_MAP_FINAL = {c: hubspot.CANAL_MAP_FINAL[c] for c in marca['canal_filtro']}
+        hubspot.CANAL_PADROES = []
+    if 'colunas_hubspot' in marca:
+        hubspot.COLUNAS_HUBSPOT = {**hubspot.COLUNAS_HUBSPOT, **marca['colunas_hubspot']}
+
+    for pasta in (meta.OUTPUT_DIR, hubspot.OUTPUT_DIR):
+        pasta.mkdir(parents=True, exist_ok=True)
+
+
+def executar_etapa(etapa: str, argumentos: list) -> dict:
+    """Roda o main() do script; sys.exit dos scripts vira status, como no servico_pipeline."""
+    resultado = {'etapa': etapa, 'status': 'ok', 'erro': None, 'duracao_s': None}
+    inicio = time.perf_counter()
+    try:
+        retorno = MODULOS[etapa].main(argumentos)
+    except SystemExit as e:
+        retorno = None
+        if e.code not in (0, None):
+            resultado.update(status='erro', erro=f"sys.exit({e.code})")
+    except Exception as e:
+        retorno = None
+        resultado.update(status='erro', erro=repr(e))
+        traceback.print_exc(file=sys.stdout)
+    resultado['duracao_s'] = round(time.perf_counter() - inicio, 2)
+
+    if resultado['status'] == 'ok':
+        modulo = MODULOS[etapa]
+        if etapa == 'hubspot':
+            resultado['arquivos'] = [str(p) for p in (retorno, modulo.DIAGNOSTICO_MAPEAMENTO_FILE) if p]
+        else:
+            resultado['arquivos'] = [str(modulo.OUT_EXCEL_FILE)]
+    return resultado
+
+
+def executar_marca(marca: dict, argumentos_etapas: dict) -> dict:
+    """Roda as etapas de uma marca no worker atual e grava log e relatório na pasta de saída."""
+    import datas
+
+    saida = _caminho(marca['pasta_saida'])
+    saida.mkdir(parents=True, exist_ok=True)
+    relatorio = {
+        'marca': marca['nome'],
+        'pid': os.getpid(),
+        'inicio': datetime.now().isoformat(timespec="seconds"),
+        'fim': None,
+        'duracao_s': None,
+        'status': 'ok',
+        'erro': None,
+        'etapas': [],
+        'datas': [],
+    }
+    inicio = time.perf_counter()
+    datas.RELATORIO_DATAS.clear()
+
+    with open(saida / ARQUIVO_LOG, "w", encoding="utf-8") as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        print(f"🏫 Marca: {marca['nome']} (pid {os.getpid()})")
+        try:
+            aplicar_marca(marca)
+        except Exception as e:
+            relatorio.update(status='erro', erro=repr(e))
+            print(f"❌ ERRO na configuração da marca: {e}")
+        else:
+            for etapa in marca['etapas']:
+                resultado = executar_etapa(etapa, argumentos_etapas.get(etapa, []))
+                relatorio['etapas'].append(resultado)
+                if resultado['status'] != 'ok':
+                    # O blend lê os relatórios de Meta/Google: não segue com uma etapa faltando
+                    relatorio.update(status='erro', erro=f"etapa '{etapa}': {resultado['erro']}")
+                    break
+
+    relatorio['datas'] = list(datas.RELATORIO_DATAS)
+    relatorio['duracao_s'] = round(time.perf_counter() - inicio, 2)
+    relatorio['fim'] = datetime.now().isoformat(timespec="seconds")
+    with open(saida / ARQUIVO_RELATORIO, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2, default=str)
+    return relatorio
+
+
+# =====================================================================
+# --- Execução ---
+# =====================================================================
+
+def executar_lote(marcas: list, argumentos_etapas: dict, workers: int) -> list:
+    relatorios = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_processos.contexto_pool(), initializer=iniciar_worker) as pool:
+        futuros = {pool.submit(executar_marca, marca, argumentos_etapas): marca for marca in marcas}
+        for futuro in as_completed(futuros):
+            marca = futuros[futuro]
+            try:
+                relatorio = futuro.result()
+            except Exception as e:
+                # Worker morto (ex: falta de memória): a marca fica como erro, as outras seguem
+                relatorio = {'marca': marca['nome'], 'status': 'erro', 'erro': repr(e), 'duracao_s': None, 'etapas': []}
+            relatorios.append(relatorio)
+
+            simbolo = "✅" if relatorio['status'] == 'ok' else "❌"
+            detalhe = f" - {relatorio['erro']}" if relatorio['erro'] else ""
+            print(f"{simbolo} {relatorio['marca']}: {relatorio['status']} em {relatorio['duracao_s']}s{detalhe}")
+            print(f"    📄 {_caminho(marca['pasta_saida']) / ARQUIVO_RELATORIO}")
+    return relatorios
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Roda o pipeline para várias marcas em um pool de processos.")
+    parser.add_argument("config", type=Path, help="Arquivo JSON com a lista de marcas.")
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Processos em paralelo. Padrão: número de núcleos (limitado ao número de marcas)."
+    )
+    parser.add_argument("--engine-exports", choices=["pandas", "polars"], default="pandas", help="Engine de Meta/Google.")
+    parser.add_argument(
+        "--sem-cache", dest="cache", action="store_false",
+        help="Ignora o cache de etapas e reprocessa todas as marcas do zero."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("=" * 80)
+    print("🏫 PIPELINE EM LOTE - várias marcas")
+    print("=" * 80)
+
+    marcas = carregar_marcas(args.config)
+    workers = min(args.workers or os.cpu_count() or 1, len(marcas))
+
+    # Os scripts de Meta/Google usam caminhos relativos à raiz do projeto
+    os.chdir(BASE_DIR)
+    inicio = time.perf_counter()
+    try:
+        aquecer()
+    except ValueError as e:
+        print(f"❌ ERRO: {e}")
+        sys.exit(1)
+    print(f"🔥 Bibliotecas e scripts carregados em {time.perf_counter() - inicio:.2f}s")
+    print(f"⚙️  {len(marcas)} marcas, {workers} workers")
+
+    sem_cache = [] if args.cache else ["--sem-cache"]
+    argumentos_etapas = {
+        "meta": ["--engine", args.engine_exports] + sem_cache,
+        "google": ["--engine", args.engine_exports] + sem_cache,
+        "hubspot": sem_cache,
+    }
+    relatorios = executar_lote(marcas, argumentos_etapas, workers)
+
+    erros = [r['marca'] for r in relatorios if r['status'] != 'ok']
+    print(f"\n📊 Lote concluído em {time.perf_counter() - inicio:.2f}s: "
+          f"{len(relatorios) - len(erros)} ok, {len(erros)} com erro")
+    if erros:
+        print(f"❌ Marcas com erro: {', '.join(sorted(erros))} (ver {ARQUIVO_LOG} na pasta de saída de cada uma)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mapeamento.py
+
+Camada de mapeamento por valores únicos. As regras de negócio (status base,
+etapa do funil, canal, nome da conta, limpeza de chaves) são aplicadas uma
+única vez por valor distinto da coluna; cada linha recebe só o código do
+valor correspondente. O resultado sai como categórico, com as categorias em
+ordem alfabética (groupby/ordenação ficam iguais aos de uma coluna de texto).
+
+Os mapas de regras (regras_negocio.py) são resolvidos com uma busca vetorizada
+das chaves sobre os únicos; padrões regex só são testados nos que não casaram.
+
+Valores que caem no texto padrão (ex: 'Não Mapeado') são registrados em uma
+tabela de diagnóstico em vez de serem impressos linha a linha.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+pd = importar_tardio("pandas")
+np = importar_tardio("numpy")
+
+COLUNAS_DIAGNOSTICO = ['Coluna', 'Valor_Original', 'Valor_Mapeado', 'Linhas']
+
+
+def fatorar(serie: pd.Series) -> tuple:
+    """Retorna (códigos por linha, valores únicos). NaN vira um valor único como os outros."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+        unicos = np.asarray(serie.cat.categories, dtype=object)
+        if (codigos == -1).any():
+            codigos = np.where(codigos == -1, len(unicos), codigos)
+            unicos = np.append(unicos, np.nan)
+        return codigos, unicos
+    return pd.factorize(serie, use_na_sentinel=False)
+
+
+def categorico_de_unicos(codigos: np.ndarray, mapeados, index=None, name=None) -> pd.Series:
+    """Monta a série categórica a partir dos códigos por linha e do valor mapeado de cada único."""
+    mapeados = np.asarray(mapeados, dtype=object)
+    codigos_mapa, categorias = pd.factorize(mapeados, use_na_sentinel=True)
+
+    # Categorias em ordem alfabética para manter a ordem de groupby/sort do texto
+    ordem = np.argsort(np.asarray(categorias, dtype=object), kind="stable")
+    posicao = np.empty_like(ordem)
+    posicao[ordem] = np.arange(len(ordem))
+    codigos_mapa = np.where(codigos_mapa >= 0, posicao[codigos_mapa], -1)
+
+    cat = pd.Categorical.from_codes(codigos_mapa[codigos], categories=np.asarray(categorias, dtype=object)[ordem])
+    return pd.Series(cat, index=index, name=name)
+
+
+def aplicar_em_unicos(serie: pd.Series, funcao, categorico: bool = True,
+                      diagnostico: list = None, valor_padrao=None) -> pd.Series:
+    """
+    Aplica funcao() uma vez por valor único da série.
+    Se diagnostico for uma lista e o resultado for valor_padrao, o valor original
+    é registrado nela com a contagem de linhas.
+    """
+    codigos, unicos = fatorar(serie)
+    mapeados = [funcao(v) for v in unicos]
+
+    if diagnostico is not None and valor_padrao is not None:
+        registrar_nao_mapeados(diagnostico, serie.name, codigos, unicos, mapeados, valor_padrao)
+
+    if categorico:
+        return categorico_de_unicos(codigos, mapeados, index=serie.index, name=serie.name)
+    return pd.Series(np.asarray(mapeados, dtype=object)[codigos], index=serie.index, name=serie.name)
+
+
+def buscar(unicos, mapa: dict, valor_padrao, padroes=()) -> np.ndarray:
+    """
+    Valor mapeado de cada único: busca vetorizada das chaves do mapa (Index.get_indexer)
+    e, para os que não casaram, o primeiro padrão [(regex compilada, valor)] que casar.
+    """
+    chaves = pd.Index(list(mapa), dtype=object)
+    valores = np.array(list(mapa.values()) + [valor_padrao], dtype=object)  # -1 cai no padrão
+    posicoes = chaves.get_indexer(pd.Index(unicos, dtype=object))
+    mapeados = valores[posicoes]
+    if padroes:
+        for i in np.flatnonzero(posicoes == -1):
+            if isinstance(unicos[i], str):
+                mapeados[i] = next((valor for regex, valor in padroes if regex.search(unicos[i])), valor_padrao)
+    return mapeados
+
+
+def mapear_dict(serie: pd.Series, mapa: dict, valor_padrao, diagnostico: list = None,
+                padroes=()) -> pd.Series:
+    """Equivalente a serie.map(mapa).fillna(valor_padrao), avaliado por valor único (+ padroes regex)."""
+    codigos, unicos = fatorar(serie)
+    mapeados = buscar(unicos, mapa, valor_padrao, padroes)
+
+    if diagnostico is not None:
+        registrar_nao_mapeados(diagnostico, serie.name, codigos, unicos, mapeados, valor_padrao)
+    return categorico_de_unicos(codigos, mapeados, index=serie.index, name=serie.name)
+
+
+def registrar_nao_mapeados(diagnostico: list, coluna: str, codigos, unicos, mapeados, valor_padrao):
+    contagens = np.bincount(codigos, minlength=len(unicos))
+    for valor, mapeado, linhas in zip(unicos, mapeados, contagens):
+        if mapeado == valor_padrao and linhas > 0:
+            diagnostico.append({
+                'Coluna': coluna,
+                'Valor_Original': valor,
+                'Valor_Mapeado': mapeado,
+                'Linhas': int(linhas),
+            })
+
+
+def tabela_diagnostico(diagnostico: list) -> pd.DataFrame:
+    df = pd.DataFrame(diagnostico, columns=COLUNAS_DIAGNOSTICO)
+    return df.sort_values(['Coluna', 'Linhas'], ascending=[True, False]).reset_index(drop=True)
+
+
+def salvar_diagnostico(diagnostico: list, path: Path) -> pd.DataFrame:
+    """Salva a tabela de valores não mapeados em CSV e imprime um resumo por coluna."""
+    df = tabela_diagnostico(diagnostico)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+
+    if df.empty:
+        print("    ✅ Diagnóstico de mapeamento: todos os valores mapeados")
+    else:
+        resumo = df.groupby('Coluna')['Linhas'].agg(['count', 'sum'])
+        print(f"    ⚠️  Diagnóstico de mapeamento salvo em: {path}")
+        for coluna, linha in resumo.iterrows():
+            print(f"       - {coluna}: {linha['count']} valores não mapeados ({linha['sum']} linhas)")
+    return df
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+midiapaga.py
+
+Ponto de entrada único do pipeline de mídia paga (rodar da raiz do projeto).
+
+    python scripts/midiapaga.py meta    [--engine pandas|polars] [--sem-cache] [--dry-run]
+    python scripts/midiapaga.py google  [--engine pandas|polars] [--sem-cache] [--dry-run]
+    python scripts/midiapaga.py hubspot [--sem-cache] [--dry-run]
+    python scripts/midiapaga.py validate                 # pré-validação de todas as entradas
+    python scripts/midiapaga.py inspect [meta google hubspot]
+    python scripts/midiapaga.py lote marcas.json [--workers N]   # várias marcas (ver lote_marcas.py)
+    python scripts/midiapaga.py investimentos [--tolerancia 0.05]  # plataformas x blend
+    python scripts/midiapaga.py historico diff [RUN_A RUN_B]       # execuções do blend
+    python scripts/midiapaga.py funil [--blend arquivo.xlsx]       # funil e coortes do blend
+    python scripts/midiapaga.py kpis [--formato parquet|csv.gz]    # cubo de KPIs do blend
+    python scripts/midiapaga.py anomalias [--bloquear aviso]       # dias anômalos no investimento
+    python scripts/midiapaga.py paridade [--fixture NOME]          # paridade + orçamentos (paridade.json)
+
+Os argumentos depois de comandos de script vão direto para o script
+(ex: 'midiapaga.py meta -h' mostra a ajuda do script do Meta).
+
+Os imports pesados (pandas, numpy, openpyxl) só acontecem quando o
+processamento roda de verdade: inspect, validate e --dry-run leem apenas o
+cabeçalho e as primeiras linhas de cada fonte (ver cabecalhos.py). O
+orçamento de tempo de import é medido por scripts/benchmark_importtime.py.
+"""
+
+import importlib
+import sys
+
+SCRIPTS = {
+    'meta': 'analise_performance_meta_teste',
+    'google': 'analise_performance_google',
+    'hubspot': 'analise_performance_hubspot',
+}
+DESCRICOES = {
+    'meta': "Processa o export do Meta Ads (meta_dataset_dashboard.xlsx).",
+    'google': "Processa o export do Google Ads (google_dashboard.xlsx).",
+    'hubspot': "Blend HubSpot + investimento Meta/Google.",
+}
+# Comandos que repassam os argumentos para outro script (sem fazer parte do inspect/validate)
+COMANDOS_SCRIPT = {
+    'lote': ('lote_marcas', "Roda o pipeline para várias marcas em um pool de processos."),
+    'investimentos': ('validar_investimentos', "Confere o investimento Meta/Google contra a mídia paga do blend."),
+    'historico': ('historico_blend', "Histórico das execuções do blend (registrar, listar, diff)."),
+    'funil': ('funil_coortes', "Funil e coortes pré-agregados a partir do último blend."),
+    'kpis': ('cubo_kpis', "Cubo de KPIs (CPL, custo por negócio/matrícula, ROAS) por dia, semana, mês e ciclo."),
+    'anomalias': ('anomalias', "Dias anômalos no investimento diário (Meta, Google e mídia paga do blend)."),
+    'paridade': ('paridade', "Paridade das saídas e orçamento de tempo/memória dos caminhos otimizados."),
+    'regras': ('regras_negocio', "Valida o arquivo de regras de negócio (canais, etapas do funil, colunas)."),
+}
+
+
+def modulo(fonte: str):
+    return importlib.import_module(SCRIPTS[fonte])
+
+
+def inspecionar(fontes: list, n_linhas: int) -> list:
+    resultados = []
+    for fonte in fontes:
+        resultados.extend(modulo(fonte).inspecionar(n_linhas=n_linhas))
+    return resultados
+
+
+def comando_inspect(args) -> int:
+    import cabecalhos
+    return cabecalhos.imprimir_inspecoes(inspecionar(args.fontes or list(SCRIPTS), args.linhas))
+
+
+def comando_validate(args) -> int:
+    import cabecalhos
+
+    print(f"🔍 Pré-validação das entradas (cabeçalho + {args.linhas} linhas)")
+    resultados = inspecionar(list(SCRIPTS), args.linhas)
+    for r in resultados:
+        problemas = cabecalhos.resumir_problemas(r)
+        if not cabecalhos.inspecao_ok(r):
+            print(f"    ❌ {r['fonte']}: {problemas} ({r['arquivo']})")
+        elif problemas:
+            print(f"    ⚠️  {r['fonte']}: {problemas} ({r['arquivo']})")
+        else:
+            print(f"    ✅ {r['fonte']}: {len(r['colunas'])} colunas, campos resolvidos sem ambiguidade")
+    codigo = 0 if all(cabecalhos.inspecao_ok(r) for r in resultados) else 1
+    print("✅ Entradas prontas para processar." if codigo == 0 else "❌ Corrija as entradas acima antes de rodar o pipeline.")
+    return codigo
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="midiapaga", description="Pipeline de mídia paga (Meta, Google, HubSpot).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    # Sem -h próprio: a ajuda e os demais argumentos são os do script
+    for fonte in SCRIPTS:
+        sub.add_parser(fonte, add_help=False, help=DESCRICOES[fonte])
+    for comando, (_, descricao) in COMANDOS_SCRIPT.items():
+        sub.add_parser(comando, add_help=False, help=descricao)
+
+    p = sub.add_parser("validate", help="Pré-validação: arquivos, colunas obrigatórias e formato da amostra.")
+    p.add_argument("--linhas", type=int, default=200, help="Linhas de amostra por fonte. Padrão: 200.")
+    p = sub.add_parser("inspect", help="Mostra colunas e campos detectados em cada entrada (cabeçalho + amostra).")
+    p.add_argument("fontes", nargs="*", metavar="FONTE", help=f"{' | '.join(SCRIPTS)}. Padrão: todas.")
+    p.add_argument("--linhas", type=int, default=200, help="Linhas de amostra por fonte. Padrão: 200.")
+
+    args, resto = parser.parse_known_args(argv)
+    if args.comando not in SCRIPTS and args.comando not in COMANDOS_SCRIPT and resto:
+        parser.error(f"argumentos não reconhecidos: {' '.join(resto)}")
+    invalidas = [f for f in getattr(args, "fontes", []) if f not in SCRIPTS]
+    if invalidas:
+        parser.error(f"fonte inválida: {', '.join(invalidas)} (escolha entre {', '.join(SCRIPTS)})")
+    args.argumentos = resto
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.comando in SCRIPTS:
+        return modulo(args.comando).main(args.argumentos)
+    if args.comando in COMANDOS_SCRIPT:
+        return importlib.import_module(COMANDOS_SCRIPT[args.comando][0]).main(args.argumentos)
+    if args.comando == "inspect":
+        sys.exit(comando_inspect(args))
+    if args.comando == "validate":
+        sys.exit(comando_validate(args))
+
+
+if __name__ == "__main__":
+    main()
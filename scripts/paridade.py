@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+paridade.py
+
+Paridade das saídas ("golden output") e orçamento de tempo/memória por etapa.
+
+Para cada fixture de paridade.json, roda a implementação de referência
+(pandas, último clique, IDs globais, sem cache) etapa por etapa e, sobre as
+mesmas entradas, cada caminho otimizado:
+
+    polars            processar() do Meta e do Google com engine polars
+    duckdb            etapas 3.5, 3.7 e 3.8 reescritas em SQL (engine_duckdb.py, só conferência)
+    ids_particionado  IDs por fatias de dias em um pool de processos
+    cache             blend pelo cache_etapas (execução fria, que grava, e quente, que lê)
+    arrow             visão granular gravada e relida pelo Arrow IPC (troca_arrow.py)
+    estrela           visão granular reconstruída da fato + dimensões (saida_estrela.py)
+    xlsx              agregados Meta/Google da referência gravados em xlsx e relidos por
+                      carregar_investimentos com cada motor de leitura_xlsx.py (calamine,
+                      openpyxl_stream) x o motor pandas (pd.read_excel)
+    csv_paralelo      export do HubSpot gravado em CSV e lido pelo csv_paralelo.py x read_any
+
+Todas as abas são comparadas célula a célula com a referência (floats com a
+tolerância da configuração). No ids_particionado, negócios empatados em
+(Chave_ID, RVO) podem trocar de ID entre si (ver ids_particionados.py): as
+colunas de ID são comparadas como conjunto e o resto negócio a negócio.
+Variantes cujo pacote não está instalado são puladas.
+
+Fixtures:
+    sintetico  bases de dados_sinteticos.py ('linhas' do HubSpot, 'linhas_plataformas' dos exports)
+    pasta      export do HubSpot e relatórios Meta/Google numa pasta (ex: um export real
+               anonimizado), com os mesmos nomes de arquivo de data/ e outputs/
+               (pasta ausente = fixture pulada)
+
+Orçamentos por fixture e etapa: {"segundos": ..., "memoria_mb": ...}. O tempo é
+o de parede de uma execução; a memória é o pico do tracemalloc numa segunda
+execução, feita só quando a etapa tem orçamento de memória (alocações nativas
+de polars/duckdb e dos processos filhos não entram na conta). Etapas sem
+orçamento só aparecem na tabela.
+
+Uso:
+    python scripts/paridade.py [--config scripts/paridade.json] [--fixture sintetico_200k]
+    python scripts/paridade.py --variantes duckdb cache
+    python scripts/midiapaga.py paridade
+Retorna código 1 se alguma aba divergir ou alguma etapa estourar o orçamento.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+import analise_performance_google as google
+import analise_performance_hubspot as blend
+import analise_performance_meta_teste as meta
+import cache_etapas
+import csv_paralelo
+import dados_sinteticos
+import engine_duckdb
+import leitura_xlsx
+import saida_estrela
+import troca_arrow
+from benchmark_engines import ABAS, comparar_abas
+from benchmark_saida import reconstruir
+
+CONFIG_PADRAO = Path(__file__).with_name("paridade.json")
+VARIANTES = ['polars', 'duckdb', 'ids_particionado', 'cache', 'arrow', 'estrela', 'xlsx', 'csv_paralelo']
+# Variante -> pacote opcional de que ela depende
+DEPENDENCIAS = {'polars': 'polars', 'duckdb': 'duckdb', 'arrow': 'pyarrow', 'xlsx': 'openpyxl'}
+PLATAFORMAS = {'meta': (meta, ['Meta_Completo', 'Meta_YoY']), 'google': (google, ['Google_Completo', 'Google_YoY'])}
+COLUNAS_ID = ['ID_Negocio_Completo', 'Lead_Key']
+
+
+@contextlib.contextmanager
+def constantes(modulo, **valores):
+    """Troca constantes de um módulo durante o bloco (como lote_marcas faz por marca)."""
+    antigos = {nome: getattr(modulo, nome) for nome in valores}
+    for nome, valor in valores.items():
+        setattr(modulo, nome, valor)
+    try:
+        yield
+    finally:
+        for nome, valor in antigos.items():
+            setattr(modulo, nome, valor)
+
+
+class Medidor:
+    """Executa etapas em silêncio, guardando tempo e pico de memória de cada uma."""
+
+    def __init__(self, orcamentos: dict):
+        self.orcamentos = orcamentos
+        self.medicoes = []
+
+    def medir(self, etapa: str, funcao):
+        """Roda funcao() (sem argumentos: copie as entradas que ela altera) e retorna o resultado."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            resultado = funcao()
+            segundos = time.perf_counter() - inicio
+
+            memoria_mb = None
+            if 'memoria_mb' in self.orcamentos.get(etapa, {}):
+                tracemalloc.start()
+                try:
+                    funcao()
+                    memoria_mb = tracemalloc.get_traced_memory()[1] / 2**20
+                finally:
+                    tracemalloc.stop()
+        self.medicoes.append({'etapa': etapa, 'segundos': segundos, 'memoria_mb': memoria_mb})
+        return resultado
+
+    def estouros(self, medicao: dict) -> list:
+        orcamento = self.orcamentos.get(medicao['etapa'], {})
+        estouros = []
+        if 'segundos' in orcamento and medicao['segundos'] > orcamento['segundos']:
+            estouros.append(f"tempo {medicao['segundos']:.2f}s > {orcamento['segundos']}s")
+        if medicao['memoria_mb'] is not None and medicao['memoria_mb'] > orcamento['memoria_mb']:
+            estouros.append(f"memória {medicao['memoria_mb']:.0f} MB > {orcamento['memoria_mb']} MB")
+        return estouros
+
+    def relatorio(self) -> bool:
+        """Imprime a tabela de etapas e retorna False se alguma estourou o orçamento."""
+        print("\n⏱️  Tempo e memória por etapa:")
+        print(f"       {'etapa':<32} {'tempo':>9} {'orçamento':>10} {'memória':>10} {'orçamento':>10}")
+        ok = True
+        for m in self.medicoes:
+            orcamento = self.orcamentos.get(m['etapa'], {})
+            estouros = self.estouros(m)
+            ok &= not estouros
+            memoria = '-' if m['memoria_mb'] is None else f"{m['memoria_mb']:.0f} MB"
+            print(f"    {'❌' if estouros else '✅'} {m['etapa']:<32} {m['segundos']:8.2f}s "
+                  f"{str(orcamento.get('segundos', '-')):>10} {memoria:>10} {str(orcamento.get('memoria_mb', '-')):>10}")
+            for estouro in estouros:
+                print(f"       ⚠️  {estouro}")
+        medidas = {m['etapa'] for m in self.medicoes}
+        for etapa in sorted(set(self.orcamentos) - medidas):
+            print(f"    ℹ️  {etapa}: tem orçamento mas não rodou nesta execução")
+        return ok
+
+
+# --- Fixtures ---
+
+def carregar_sintetico(fixture: dict, tmp: Path) -> dict:
+    linhas_plataformas = fixture.get('linhas_plataformas', 0)
+    entradas = {
+        'hubspot': blend.clean_cols(dados_sinteticos.gerar_hubspot(fixture['linhas'])),
+        'meta_agg': dados_sinteticos.gerar_meta_agg(),
+        'google_agg': dados_sinteticos.gerar_google_agg(),
+    }
+    if linhas_plataformas:
+        entradas['meta'] = dados_sinteticos.gerar_export_meta(tmp / meta.FILE_PATH.name, linhas_plataformas)
+        entradas['google'] = dados_sinteticos.gerar_export_google(tmp / google.FILE_PATH.name, linhas_plataformas)
+    return entradas
+
+
+def carregar_pasta(fixture: dict, tmp: Path) -> dict:
+    """Export anonimizado + relatórios Meta/Google; None se a pasta não tiver o export do HubSpot."""
+    pasta = blend.BASE_DIR / fixture['pasta']
+    hubspot = pasta / blend.HUBSPOT_FILE.name
+    if not hubspot.exists():
+        return None
+
+    def investimentos():
+        with constantes(blend, META_REPORT_FILE=pasta / blend.META_REPORT_FILE.name,
+                        GOOGLE_REPORT_FILE=pasta / blend.GOOGLE_REPORT_FILE.name):
+            return blend.carregar_investimentos()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        entradas = {'hubspot': blend.clean_cols(blend.read_any(hubspot)), 'investimentos': investimentos}
+    for plataforma, (modulo, _) in PLATAFORMAS.items():
+        export = pasta / modulo.FILE_PATH.name
+        if export.exists():
+            entradas[plataforma] = export
+    return entradas
+
+
+FIXTURES = {'sintetico': carregar_sintetico, 'pasta': carregar_pasta}
+
+
+# --- Referência ---
+
+def referencia(entradas: dict, medidor: Medidor) -> dict:
+    """Saídas da implementação de referência, medidas etapa por etapa."""
+    ref = {}
+    for plataforma, (modulo, _) in PLATAFORMAS.items():
+        if plataforma in entradas:
+            ref[plataforma] = medidor.medir(plataforma, partial(modulo.processar, entradas[plataforma], engine="pandas"))
+
+    ref['hub'] = medidor.medir('preparar_hubspot', lambda: blend.preparar_hubspot(entradas['hubspot'].copy()))
+    if 'investimentos' in entradas:
+        ref['meta_agg'], ref['google_agg'] = medidor.medir('carregar_investimentos', entradas['investimentos'])
+    else:
+        ref['meta_agg'], ref['google_agg'] = entradas['meta_agg'], entradas['google_agg']
+
+    df_merged = medidor.medir('merge_investimento', lambda: blend.merge_investimento(
+        ref['hub'].copy(), ref['meta_agg'], ref['google_agg']))
+    df_granular = medidor.medir('preparar_granular', lambda: blend.preparar_granular(df_merged.copy()))
+    df_agregado = medidor.medir('agregar_dash', lambda: blend.agregar_dash(df_granular.copy()))
+    df_matriculas_fechamento = medidor.medir(
+        'agregar_matriculas_fechamento', lambda: blend.agregar_matriculas_fechamento(df_granular.copy()))
+    ref['blend'] = (df_granular, df_agregado, df_matriculas_fechamento)
+    return ref
+
+
+def executar_blend(ref: dict, **kwargs) -> tuple:
+    return blend.executar_blend(ref['hub'].copy(), ref['meta_agg'], ref['google_agg'], **kwargs)
+
+
+# --- Variantes: cada uma roda o caminho otimizado e retorna [ok por aba] ---
+
+def variante_polars(ref, entradas, medidor, comparar, config) -> list:
+    resultados = []
+    for plataforma, (modulo, abas) in PLATAFORMAS.items():
+        if plataforma in ref:
+            obtido = medidor.medir(f"{plataforma}_polars", partial(modulo.processar, entradas[plataforma], engine="polars"))
+            resultados += [comparar(e, o, f"{aba} (polars)") for e, o, aba in zip(ref[plataforma], obtido, abas)]
+    return resultados
+
+
+def variante_duckdb(ref, entradas, medidor, comparar, config) -> list:
+    obtido = medidor.medir('blend_duckdb', lambda: engine_duckdb.executar_blend(
+        ref['hub'].copy(), ref['meta_agg'], ref['google_agg']))
+    return [comparar(e, o, f"{aba} (duckdb)") for e, o, aba in zip(ref['blend'], obtido, ABAS)]
+
+
+def variante_ids_particionado(ref, entradas, medidor, comparar, config) -> list:
+    obtido = medidor.medir('blend_ids_particionado', partial(
+        executar_blend, ref, ids="particionado", processos=config.get('processos')))
+    # Negócio a negócio pelo índice de df_merged (a ordem entre empatados pode mudar)
+    esperado, granular = ref['blend'][0].sort_index(), obtido[0].sort_index()
+    resultados = [comparar(esperado.drop(columns=COLUNAS_ID), granular.drop(columns=COLUNAS_ID),
+                           f"{ABAS[0]} sem IDs (ids particionado)")]
+    for coluna in COLUNAS_ID:
+        resultados.append(comparar(esperado[[coluna]].sort_values(coluna, ignore_index=True),
+                                   granular[[coluna]].sort_values(coluna, ignore_index=True),
+                                   f"{ABAS[0]}.{coluna} como conjunto (ids particionado)"))
+    return resultados + [comparar(e, o, f"{aba} (ids particionado)") for e, o, aba in zip(ref['blend'][1:], obtido[1:], ABAS[1:])]
+
+
+def variante_cache(ref, entradas, medidor, comparar, config) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "etapas"
+        arquivo = Path(tmp) / "entradas_blend.pkl"
+        pd.to_pickle((ref['hub'], ref['meta_agg'], ref['google_agg']), arquivo)
+
+        def em_cache():
+            return cache_etapas.executar_em_cache(
+                'blend', [arquivo] + cache_etapas.arquivos_codigo(Path(blend.__file__)), blend.config_cache(),
+                partial(executar_blend, ref))
+
+        def frio():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            return em_cache()
+
+        with constantes(cache_etapas, CACHE_DIR=cache_dir, INDICE_HASHES_FILE=cache_dir / "indice_hashes.json",
+                        MEMORIA={}, MEMORIA_ATIVA=False):
+            obtido_frio = medidor.medir('blend_cache_frio', frio)
+            obtido_quente = medidor.medir('blend_cache_quente', em_cache)
+
+    resultados = []
+    for rotulo, obtido in (('cache frio', obtido_frio), ('cache quente', obtido_quente)):
+        resultados += [comparar(e, o, f"{aba} ({rotulo})") for e, o, aba in zip(ref['blend'], obtido, ABAS)]
+    return resultados
+
+
+def variante_arrow(ref, entradas, medidor, comparar, config) -> list:
+    granular = ref['blend'][0]
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = Path(tmp) / f"{blend.BLEND_BASE_NAME}.xlsx"
+
+        def ida_e_volta():
+            path = troca_arrow.salvar(granular, xlsx, ABAS[0])
+            return None if path is None else troca_arrow.ler_df(path)
+
+        obtido = medidor.medir('arrow_ida_e_volta', ida_e_volta)
+    if obtido is None:
+        print(f"    ❌ {ABAS[0]} (arrow): não convertida para Arrow")
+        return [False]
+    return [comparar(granular, obtido, f"{ABAS[0]} (arrow)")]
+
+
+def variante_estrela(ref, entradas, medidor, comparar, config) -> list:
+    granular = ref['blend'][0]
+    obtido = medidor.medir('estrela_ida_e_volta', lambda: reconstruir(saida_estrela.montar_estrela(granular))[granular.columns])
+    return [comparar(granular, obtido, f"{ABAS[0]} (estrela)")]
+
+
+def variante_xlsx(ref, entradas, medidor, comparar, config) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        relatorios = {}
+        for atributo, aba, df, chave, valor in [
+            ('META_REPORT_FILE', blend.META_SHEET_NAME, ref['meta_agg'], 'Campanha_Merge_Key', 'Investimento_Meta'),
+            ('GOOGLE_REPORT_FILE', blend.GOOGLE_SHEET_NAME, ref['google_agg'], 'Termo_Merge_Key', 'Investimento_Google'),
+        ]:
+            path = Path(tmp) / getattr(blend, atributo).name
+            df.rename(columns={chave: 'Campanha', valor: 'Investimento'}).to_excel(path, sheet_name=aba, index=False)
+            relatorios[atributo] = path
+
+        def investimentos(motor):
+            with constantes(blend, **relatorios), constantes(leitura_xlsx, MOTOR=motor):
+                return blend.carregar_investimentos()
+
+        esperado = medidor.medir('investimentos_xlsx_pandas', partial(investimentos, 'pandas'))
+        resultados = []
+        for motor in leitura_xlsx.MOTORES:
+            if motor == 'pandas':
+                continue
+            if not leitura_xlsx.disponivel(motor):
+                print(f"    ⏭️  xlsx {motor}: pulado (não instalado)")
+                continue
+            obtido = medidor.medir(f'investimentos_xlsx_{motor}', partial(investimentos, motor))
+            resultados += [comparar(e, o, f"{nome} (xlsx {motor})")
+                           for e, o, nome in zip(esperado, obtido, ['Meta agregado', 'Google agregado'])]
+    return resultados
+
+
+def variante_csv_paralelo(ref, entradas, medidor, comparar, config) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"{blend.HUBSPOT_FILE.stem}.csv"
+        entradas['hubspot'].to_csv(path, index=False, encoding="utf-8")
+        esperado = medidor.medir('hubspot_csv_read_any', partial(blend.read_any, path))
+        obtido = medidor.medir('hubspot_csv_paralelo', partial(csv_paralelo.ler_csv, path, config.get('processos')))
+    return [comparar(esperado, obtido, "HubSpot CSV (csv_paralelo)")]
+
+
+FUNCOES_VARIANTES = {
+    'polars': variante_polars,
+    'duckdb': variante_duckdb,
+    'ids_particionado': variante_ids_particionado,
+    'cache': variante_cache,
+    'arrow': variante_arrow,
+    'estrela': variante_estrela,
+    'xlsx': variante_xlsx,
+    'csv_paralelo': variante_csv_paralelo,
+}
+
+
+def rodar_fixture(nome: str, fixture: dict, variantes: list, config: dict) -> bool:
+    print(f"\n{'=' * 80}\n📦 Fixture '{nome}' ({fixture['tipo']})\n{'=' * 80}")
+    tolerancia = config.get('tolerancia', {})
+    comparar = partial(comparar_abas, rtol=tolerancia.get('rtol', 1e-9), atol=tolerancia.get('atol', 1e-6))
+    medidor = Medidor(fixture.get('orcamentos', {}))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        entradas = FIXTURES[fixture['tipo']](fixture, Path(tmp))
+        if entradas is None:
+            print(f"    ⚠️  Fixture pulada: '{fixture.get('pasta')}' sem {blend.HUBSPOT_FILE.name}")
+            return True
+        print(f"    ✅ HubSpot: {len(entradas['hubspot']):,} linhas | "
+              f"exports Meta/Google: {', '.join(p for p in PLATAFORMAS if p in entradas) or 'nenhum'}")
+
+        ref = referencia(entradas, medidor)
+        print(f"    ✅ Referência: {len(ref['blend'][0]):,} linhas na {ABAS[0]}")
+
+        print("\n🔍 Paridade com a referência:")
+        resultados = []
+        for variante in variantes:
+            pacote = DEPENDENCIAS.get(variante)
+            if pacote and importlib.util.find_spec(pacote) is None:
+                print(f"    ⏭️  {variante}: pulada ({pacote} não instalado)")
+                continue
+            resultados += FUNCOES_VARIANTES[variante](ref, entradas, medidor, comparar, config)
+
+    return medidor.relatorio() & all(resultados)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Paridade das saídas e orçamento por etapa dos caminhos otimizados.")
+    parser.add_argument("--config", type=Path, default=CONFIG_PADRAO, help=f"Padrão: {CONFIG_PADRAO.name}.")
+    parser.add_argument("--fixture", nargs="*", default=None, metavar="NOME", help="Fixtures a rodar. Padrão: todas.")
+    parser.add_argument("--variantes", nargs="*", choices=VARIANTES, default=None,
+                        help="Variantes a comparar. Padrão: as da configuração.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    fixtures = config['fixtures']
+    desconhecidas = [n for n in args.fixture or [] if n not in fixtures]
+    if desconhecidas:
+        print(f"❌ Fixture(s) fora de {args.config.name}: {', '.join(desconhecidas)}")
+        sys.exit(1)
+    variantes = args.variantes if args.variantes is not None else config.get('variantes', VARIANTES)
+
+    print("=" * 80)
+    print(f"🏁 PARIDADE E ORÇAMENTO - {args.config.name} | variantes: {', '.join(variantes)}")
+    print("=" * 80)
+
+    ok = True
+    for nome in args.fixture or fixtures:
+        ok &= rodar_fixture(nome, fixtures[nome], variantes, config)
+
+    print(f"\n{'✅ Paridade e orçamentos OK' if ok else '❌ Paridade ou orçamento falhou'}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+pool_processos.py
+
+Contexto de multiprocessing dos pools de processos (ids_particionados,
+csv_paralelo, lote_marcas).
+
+    fork         processo com uma única thread (CLI, worker do lote): os
+                 workers herdam pandas/numpy e os scripts já importados.
+    forkserver   quando há outras threads vivas (servico_pipeline: API,
+                 observador e worker em threads). fork copia só a thread que
+                 chamou, e um lock que outra thread segurava naquele instante
+                 (import, logging, malloc) fica travado para sempre no filho.
+    spawn        o mesmo caso, onde forkserver não existe.
+
+Sem fork (Windows) vale o padrão da plataforma.
+
+Uso:
+    with ProcessPoolExecutor(max_workers=n, mp_context=pool_processos.contexto_pool()) as pool:
+        ...
+"""
+
+import multiprocessing
+import threading
+
+
+def contexto_pool():
+    """Contexto para o ProcessPoolExecutor: fork só com uma thread viva (None = padrão da plataforma)."""
+    metodos = multiprocessing.get_all_start_methods()
+    if "fork" not in metodos:
+        return None
+    if threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("forkserver" if "forkserver" in metodos else "spawn")
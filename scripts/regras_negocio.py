@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+regras_negocio.py
+
+Regras de negócio do blend (canal final, canal de cada plataforma de
+investimento, etapa do funil, etapas de negócio e de matrícula, palavras-chave
+das colunas) lidas de um arquivo TOML versionado
+(regras_negocio.toml), em vez de fixas no código.
+
+1. O arquivo é lido com tomllib (biblioteca padrão) e validado por inteiro:
+   todos os problemas são listados de uma vez, antes de qualquer leitura de
+   dados.
+2. A validação compila as regras uma única vez: dicionários exatos, lista
+   ordenada das etapas do funil e regex (re.compile) para os padrões.
+3. O resultado fica em memória pelo hash do conteúdo do arquivo: carregar o
+   mesmo arquivo de novo (outra marca do lote, outra execução do serviço) não
+   relê nem recompila.
+
+As regras são aplicadas por mapeamento.mapear_dict, uma vez por valor único
+da coluna: o custo depende do número de valores distintos, não de linhas.
+
+Uso:
+    (automático no primeiro uso das regras no analise_performance_hubspot; --regras troca o arquivo)
+    python scripts/regras_negocio.py [regras_negocio.toml]
+Retorna código 1 se o arquivo tiver algum problema.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import sys
+from pathlib import Path
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+REGRAS_FILE = Path(__file__).with_name("regras_negocio.toml")
+VERSOES_SUPORTADAS = {1}
+
+SECOES = {'versao', 'geral', 'canais', 'plataformas', 'etapas_funil', 'colunas'}
+# Plataformas de investimento (relatórios Meta/Google) que precisam de um canal em [plataformas]
+PLATAFORMAS = ['meta', 'google']
+# Campos que o blend procura com find_col em cada base (todos obrigatórios no arquivo)
+CAMPOS_COLUNAS = {
+    'hubspot': ['data_criacao', 'data_fechamento', 'unidade', 'tipo', 'status', 'rvo', 'fonte',
+                'detalhamento_1', 'detalhamento_2', 'id_negocio', 'nome_negocio'],
+    'meta_relatorio': ['data', 'investimento', 'campanha'],
+    'google_relatorio': ['data', 'investimento', 'campanha'],
+}
+
+# hash do conteúdo -> Regras já compiladas
+COMPILADAS = {}
+
+
+class Regras:
+    """Regras validadas e compiladas de um arquivo (somente leitura)."""
+
+    def __init__(self, dados: dict, hash_arquivo: str, path: Path):
+        geral = dados['geral']
+        self.path = path
+        self.hash = hash_arquivo
+        self.versao = dados['versao']
+        self.texto_nao_mapeado = geral['texto_nao_mapeado']
+        self.etapa_matricula = geral['etapa_matricula']
+        self.canais = dict(dados['canais']['exatos'])
+        self.canais_padroes = _compilar(dados['canais'].get('padroes', {}))
+        self.plataformas = {p: dados['plataformas'][p] for p in PLATAFORMAS}
+        self.etapas_funil = dict(dados['etapas_funil']['exatos'])
+        self.etapas_padroes = _compilar(dados['etapas_funil'].get('padroes', {}))
+        self.etapas_negocio = etapas_negocio(dados)
+        self.colunas = {base: {campo: list(v) for campo, v in campos.items()}
+                        for base, campos in dados['colunas'].items()}
+
+    def resumo(self) -> dict:
+        return {
+            'versao': self.versao,
+            'hash': self.hash[:12],
+            'canais': f"{len(self.canais)} fontes + {len(self.canais_padroes)} padrões -> "
+                      f"{len(set(self.canais.values()) | {c for _, c in self.canais_padroes})} canais",
+            'plataformas': self.plataformas,
+            'etapas_funil': f"{len(self.etapas_funil)} status + {len(self.etapas_padroes)} padrões",
+            'etapa_matricula': self.etapa_matricula,
+            'etapas_negocio': self.etapas_negocio,
+            'colunas': {base: len(campos) for base, campos in self.colunas.items()},
+        }
+
+
+def _compilar(padroes: dict) -> list:
+    return [(re.compile(padrao), destino) for padrao, destino in padroes.items()]
+
+
+# --- Validação ---
+
+def _e_texto(valor) -> bool:
+    return isinstance(valor, str) and valor.strip() != ""
+
+
+def etapas_negocio(dados: dict) -> list:
+    """Etapas que contam como negócio: de etapa_negocio em diante na ordem do funil, menos etapas_fora_negocio."""
+    geral = dados['geral']
+    funil = list(dict.fromkeys(dados['etapas_funil']['exatos'].values()))
+    fora = set(geral.get('etapas_fora_negocio', []))
+    return [etapa for etapa in funil[funil.index(geral['etapa_negocio']):] if etapa not in fora]
+
+
+def _validar_mapa(dados: dict, secao: str, problemas: list) -> set:
+    """Valida [secao.exatos] e [secao.padroes]; retorna os valores de destino."""
+    bloco = dados.get(secao)
+    if not isinstance(bloco, dict):
+        problemas.append(f"[{secao}] ausente")
+        return set()
+    for chave in sorted(set(bloco) - {'exatos', 'padroes'}):
+        problemas.append(f"[{secao}] chave desconhecida: '{chave}' (aceitas: exatos, padroes)")
+
+    destinos = set()
+    exatos = bloco.get('exatos')
+    if not isinstance(exatos, dict) or not exatos:
+        problemas.append(f"[{secao}.exatos] ausente ou vazio")
+        exatos = {}
+    padroes = bloco.get('padroes', {})
+    if not isinstance(padroes, dict):
+        problemas.append(f"[{secao}.padroes] deve ser uma tabela 'regex = destino'")
+        padroes = {}
+
+    for origem, destino in exatos.items():
+        if not _e_texto(destino):
+            problemas.append(f"[{secao}.exatos] '{origem}': destino deve ser um texto não vazio")
+        else:
+            destinos.add(destino)
+    for padrao, destino in padroes.items():
+        try:
+            re.compile(padrao)
+        except re.error as e:
+            problemas.append(f"[{secao}.padroes] regex inválida '{padrao}': {e}")
+        if not _e_texto(destino):
+            problemas.append(f"[{secao}.padroes] '{padrao}': destino deve ser um texto não vazio")
+        else:
+            destinos.add(destino)
+    return destinos
+
+
+def validar(dados: dict) -> list:
+    """Lista de problemas do arquivo (vazia se estiver tudo certo)."""
+    problemas = []
+    for chave in sorted(set(dados) - SECOES):
+        problemas.append(f"chave desconhecida no topo: '{chave}' (aceitas: {', '.join(sorted(SECOES))})")
+
+    versao = dados.get('versao')
+    if versao not in VERSOES_SUPORTADAS:
+        problemas.append(f"versao {versao!r} não suportada (suportadas: {sorted(VERSOES_SUPORTADAS)})")
+
+    geral = dados.get('geral')
+    if not isinstance(geral, dict):
+        problemas.append("[geral] ausente")
+        geral = {}
+    for chave in ('texto_nao_mapeado', 'etapa_matricula', 'etapa_negocio'):
+        if not _e_texto(geral.get(chave)):
+            problemas.append(f"[geral] {chave} deve ser um texto não vazio")
+    fora_negocio = geral.get('etapas_fora_negocio', [])
+    if not isinstance(fora_negocio, list) or not all(_e_texto(e) for e in fora_negocio):
+        problemas.append("[geral] etapas_fora_negocio deve ser uma lista de textos")
+        fora_negocio = []
+
+    canais = _validar_mapa(dados, 'canais', problemas)
+    etapas = _validar_mapa(dados, 'etapas_funil', problemas)
+    texto_nao_mapeado = geral.get('texto_nao_mapeado')
+    if texto_nao_mapeado in canais | etapas:
+        problemas.append(f"'{texto_nao_mapeado}' (texto_nao_mapeado) não pode ser destino de canal ou etapa")
+    if _e_texto(geral.get('etapa_matricula')) and etapas and geral['etapa_matricula'] not in etapas:
+        problemas.append(f"[geral] etapa_matricula '{geral['etapa_matricula']}' não é uma etapa de [etapas_funil]")
+    # A ordem do funil só existe em [etapas_funil.exatos]: etapa_negocio precisa estar lá
+    exatos = dados.get('etapas_funil', {}).get('exatos')
+    funil = list(dict.fromkeys(exatos.values())) if isinstance(exatos, dict) else []
+    if _e_texto(geral.get('etapa_negocio')) and funil:
+        if geral['etapa_negocio'] not in funil:
+            problemas.append(f"[geral] etapa_negocio '{geral['etapa_negocio']}' não é uma etapa de [etapas_funil.exatos]")
+        elif geral.get('etapa_matricula') not in etapas_negocio(dados):
+            problemas.append(f"[geral] etapa_matricula '{geral.get('etapa_matricula')}' precisa contar como negócio "
+                             f"(depois de etapa_negocio e fora de etapas_fora_negocio)")
+    for etapa in fora_negocio:
+        if etapas and etapa not in etapas:
+            problemas.append(f"[geral] etapas_fora_negocio: '{etapa}' não é uma etapa de [etapas_funil]")
+
+    plataformas = dados.get('plataformas')
+    if not isinstance(plataformas, dict):
+        problemas.append("[plataformas] ausente")
+        plataformas = {}
+    for chave in sorted(set(plataformas) - set(PLATAFORMAS)):
+        problemas.append(f"[plataformas] plataforma desconhecida: '{chave}' (aceitas: {', '.join(PLATAFORMAS)})")
+    for plataforma in PLATAFORMAS:
+        canal = plataformas.get(plataforma)
+        if not _e_texto(canal):
+            problemas.append(f"[plataformas] {plataforma} deve ser um texto não vazio")
+        elif canais and canal not in canais:
+            problemas.append(f"[plataformas] {plataforma} = '{canal}' não é um canal de [canais]")
+    if len({plataformas.get(p) for p in PLATAFORMAS}) < len(PLATAFORMAS):
+        problemas.append("[plataformas] cada plataforma precisa de um canal diferente")
+
+    colunas = dados.get('colunas')
+    if not isinstance(colunas, dict):
+        problemas.append("[colunas] ausente")
+        colunas = {}
+    for base in sorted(set(colunas) - set(CAMPOS_COLUNAS)):
+        problemas.append(f"[colunas] base desconhecida: '{base}' (aceitas: {', '.join(CAMPOS_COLUNAS)})")
+    for base, campos in CAMPOS_COLUNAS.items():
+        bloco = colunas.get(base)
+        if not isinstance(bloco, dict):
+            problemas.append(f"[colunas.{base}] ausente")
+            continue
+        for campo in campos:
+            if campo not in bloco:
+                problemas.append(f"[colunas.{base}] campo obrigatório ausente: {campo}")
+        for campo, palavras in bloco.items():
+            if campo not in campos:
+                problemas.append(f"[colunas.{base}] campo desconhecido: {campo}")
+            elif not isinstance(palavras, list) or not palavras or not all(_e_texto(p) for p in palavras):
+                problemas.append(f"[colunas.{base}] {campo} deve ser uma lista não vazia de textos")
+    return problemas
+
+
+# --- Carga ---
+
+def carregar(path: Path = None) -> Regras:
+    """Regras do arquivo, compiladas uma vez por conteúdo. ValueError lista todos os problemas."""
+    path = Path(path or REGRAS_FILE)
+    try:
+        conteudo = path.read_bytes()
+    except OSError as e:
+        raise ValueError(f"Arquivo de regras não encontrado: {path} ({e})") from e
+
+    hash_arquivo = hashlib.sha256(conteudo).hexdigest()
+    if hash_arquivo in COMPILADAS:
+        return COMPILADAS[hash_arquivo]
+
+    try:
+        dados = tomllib.loads(conteudo.decode("utf-8"))
+    except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+        raise ValueError(f"Arquivo de regras inválido: {path} ({e})") from e
+    problemas = validar(dados)
+    if problemas:
+        raise ValueError(f"Arquivo de regras com {len(problemas)} problema(s): {path}\n"
+                         + "\n".join(f"  - {p}" for p in problemas))
+
+    COMPILADAS[hash_arquivo] = Regras(dados, hash_arquivo, path)
+    return COMPILADAS[hash_arquivo]
+
+
+# --- Execução direta ---
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Valida o arquivo de regras de negócio do blend.")
+    parser.add_argument("arquivo", nargs="?", type=Path, default=REGRAS_FILE,
+                        help=f"Arquivo TOML de regras (padrão: {REGRAS_FILE.name}).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"🔍 Validando regras: {args.arquivo}")
+    try:
+        regras = carregar(args.arquivo)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for chave, valor in regras.resumo().items():
+        print(f"    - {chave}: {valor}")
+    print("✅ Regras válidas")
+
+
+if __name__ == "__main__":
+    main()
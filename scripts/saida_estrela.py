@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+saida_estrela.py
+
+Exportação compacta da Visao_Granular_Final em esquema estrela, para o
+Looker Studio.
+
+Na planilha, cada linha repete textos longos (Nome_Conta_Final,
+Area_Gestao_RVO, Fonte_Original_do_Trafego, detalhamentos). Aqui esses textos
+vão para tabelas de dimensão pequenas e a tabela fato guarda só as chaves
+inteiras e as medidas:
+
+    fato_negocios   ID_Negocio_Completo, Lead_Key, datas/ciclos, ID_* e medidas
+    dim_detalhamento_1  ID_Detalhamento_1, Detalhamento_fonte_original_1
+    dim_detalhamento_2  ID_Detalhamento_2, Detalhamento_fonte_original_2
+    dim_unidade     ID_Unidade, Unidade
+    dim_pipeline    ID_Pipeline, Tipo
+    dim_etapa       ID_Etapa, Status_Principal
+    dim_canal       ID_Canal, Origem_Principal, Fonte_Original_do_Trafego,
+                    Nome_Conta_Final, Area_Gestao_RVO
+
+Formatos:
+    parquet (zstd) -> carregar no BigQuery (bq load --source_format=PARQUET)
+                      e usar o conector BigQuery do Looker Studio, com as
+                      dimensões ligadas à fato por 'Combinar dados' (blend).
+                      Precisa do pyarrow.
+    csv.gz         -> um CSV por tabela (datas em aaaa-mm-dd), para o conector
+                      de arquivos do Looker Studio depois de descompactar.
+
+Uso:
+    python scripts/analise_performance_hubspot.py --saida estrela
+    python scripts/analise_performance_hubspot.py --saida ambos --formato-estrela csv.gz
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+pd = importar_tardio("pandas")
+
+# Nome da tabela -> (chave inteira, colunas de texto da dimensão)
+# Um detalhamento por dimensão: o par (1, 2) tem quase tantas combinações quanto negócios
+DIMENSOES = {
+    'dim_detalhamento_1': ('ID_Detalhamento_1', ['Detalhamento_fonte_original_1']),
+    'dim_detalhamento_2': ('ID_Detalhamento_2', ['Detalhamento_fonte_original_2']),
+    'dim_unidade': ('ID_Unidade', ['Unidade']),
+    'dim_pipeline': ('ID_Pipeline', ['Tipo']),
+    'dim_etapa': ('ID_Etapa', ['Status_Principal']),
+    'dim_canal': ('ID_Canal', ['Origem_Principal', 'Fonte_Original_do_Trafego', 'Nome_Conta_Final', 'Area_Gestao_RVO']),
+}
+TABELA_FATO = 'fato_negocios'
+# As chaves entram na fato logo depois desta coluna (identificação, datas e ciclos antes; medidas depois)
+COLUNA_ANTES_DAS_CHAVES = 'Ciclo_Captacao_Fechamento'
+
+FORMATOS = {'parquet': '.parquet', 'csv.gz': '.csv.gz'}
+COMPRESSAO_PARQUET = 'zstd'
+
+
+def montar_estrela(df_granular: pd.DataFrame) -> dict:
+    """Separa a visão granular em {tabela: DataFrame} (fato + dimensões)."""
+    colunas_dim = [c for _, colunas in DIMENSOES.values() for c in colunas]
+    fato = df_granular.drop(columns=colunas_dim).reset_index(drop=True)
+    posicao = fato.columns.get_loc(COLUNA_ANTES_DAS_CHAVES) + 1
+
+    tabelas = {}
+    for nome, (chave, colunas) in DIMENSOES.items():
+        # Chaves 1..n na ordem alfabética dos valores (estáveis entre execuções com os mesmos dados)
+        ids = df_granular.groupby(colunas, dropna=False, observed=True, sort=True).ngroup().to_numpy() + 1
+        dim = df_granular[colunas].reset_index(drop=True).assign(**{chave: ids})
+        dim = dim.drop_duplicates(chave).sort_values(chave)[[chave] + colunas].reset_index(drop=True)
+        tabelas[nome] = dim.astype({c: object for c in colunas})
+
+        fato.insert(posicao, chave, ids.astype('int32'))
+        posicao += 1
+
+    return {TABELA_FATO: fato, **tabelas}
+
+
+def gravar_tabela(df: pd.DataFrame, path: Path, formato: str):
+    """Grava uma tabela em parquet (zstd) ou csv.gz."""
+    if formato == 'parquet':
+        try:
+            df.to_parquet(path, index=False, compression=COMPRESSAO_PARQUET)
+        except ImportError:
+            print("\n\n❌ ERRO: A BIBLIOTECA 'pyarrow' NÃO ESTÁ INSTALADA.")
+            print("Para gravar em Parquet, rode: pip install pyarrow (ou use --formato-estrela csv.gz)")
+            sys.exit(1)
+    else:
+        df.to_csv(path, index=False, encoding='utf-8', date_format='%Y-%m-%d', compression='gzip')
+
+
+def salvar_estrela(df_granular: pd.DataFrame, pasta: Path, formato: str = 'parquet') -> list:
+    """
+    Grava fato e dimensões em 'pasta', um arquivo por tabela.
+    Retorna [{tabela, arquivo, linhas, colunas, bytes, segundos}] (a montagem entra na linha da fato).
+    """
+    pasta.mkdir(parents=True, exist_ok=True)
+    print(f"\n💾 Salvando esquema estrela ({formato}) em: {pasta.resolve()}")
+
+    inicio = time.perf_counter()
+    tabelas = montar_estrela(df_granular)
+    t_montagem = time.perf_counter() - inicio
+
+    resumo = []
+    for nome, df in tabelas.items():
+        path = pasta / f"{nome}{FORMATOS[formato]}"
+        inicio = time.perf_counter()
+        gravar_tabela(df, path, formato)
+        segundos = time.perf_counter() - inicio + (t_montagem if nome == TABELA_FATO else 0)
+        resumo.append({
+            'tabela': nome, 'arquivo': path, 'linhas': len(df), 'colunas': len(df.columns),
+            'bytes': path.stat().st_size, 'segundos': segundos,
+        })
+        print(f"    ✅ {nome:<15} {len(df):>9,} linhas  {_formatar_bytes(path.stat().st_size):>10}")
+    return resumo
+
+
+def salvar(df_granular: pd.DataFrame, output_dir: Path, base_name: str, formato: str = 'parquet') -> list:
+    """Grava em <output_dir>/<base_name>_<timestamp>_estrela/, ao lado do xlsx do blend."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return salvar_estrela(df_granular, output_dir / f"{base_name}_{timestamp}_estrela", formato)
+
+
+def _formatar_bytes(n: int) -> str:
+    for unidade in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f"{n:.0f} {unidade}" if unidade == 'B' else f"{n:.1f} {unidade}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def imprimir_comparacao(resumo: list, bytes_xlsx: int = None, segundos_xlsx: float = None):
+    """Tamanho e tempo de gravação do esquema estrela, comparados ao xlsx do blend (se houver)."""
+    total_bytes = sum(r['bytes'] for r in resumo)
+    total_segundos = sum(r['segundos'] for r in resumo)
+    print("\n📏 Esquema estrela x xlsx:")
+    print(f"    - estrela: {_formatar_bytes(total_bytes):>10} em {total_segundos:6.2f}s ({len(resumo)} arquivos)")
+    if bytes_xlsx is None:
+        return
+    print(f"    - xlsx:    {_formatar_bytes(bytes_xlsx):>10} em {segundos_xlsx:6.2f}s")
+    print(f"    - tamanho: {bytes_xlsx / max(total_bytes, 1):.1f}x menor | "
+          f"gravação: {segundos_xlsx / max(total_segundos, 1e-9):.1f}x mais rápida")
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+servico_pipeline.py
+
+Modo serviço do pipeline: um processo de longa duração que mantém o
+interpretador aquecido (pandas/openpyxl e os scripts já importados) e os
+resultados das etapas em memória (cache_etapas.ativar_memoria).
+
+    - Fila de jobs com um único worker: um refresh por vez, na ordem de chegada.
+      Se a mesma etapa já estiver na fila, o job antigo é cancelado e o novo vai
+      para o fim (a ordem meta/google -> hubspot continua valendo).
+    - Observa os exports em data/ por polling (funciona igual no Windows) e
+      enfileira o refresh quando um arquivo muda e fica estável por uma rodada.
+    - API HTTP local, em TCP (127.0.0.1) ou Unix socket, para disparar e
+      consultar jobs.
+
+Um novo export do HubSpot só refaz a preparação do HubSpot e o blend; o
+investimento Meta/Google continua em memória.
+
+Os prints de cada job vão para o log do próprio job: sys.stdout/sys.stderr
+viram um SaidaPorThread, que escolhe o destino pela thread que escreve (o
+contextlib.redirect_stdout troca o stdout do processo inteiro e levaria para o
+job os prints da API e do observador). O relatório de datas
+(datas.RELATORIO_DATAS) é zerado a cada job, como no lote_marcas por marca.
+
+Uso:
+    python scripts/servico_pipeline.py
+    python scripts/servico_pipeline.py --socket /tmp/midiapaga.sock --engine-exports polars
+
+API:
+    GET  /status          estado do serviço (job atual, fila, etapas em memória)
+    GET  /jobs            últimos jobs
+    GET  /jobs/<id>       um job, com o final do log
+    POST /jobs/<etapa>    enfileira meta | google | hubspot | todos
+
+    curl -X POST http://127.0.0.1:8765/jobs/hubspot
+    curl --unix-socket /tmp/midiapaga.sock http://localhost/status
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import queue
+import signal
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+try:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+except NameError:
+    BASE_DIR = Path.cwd()
+
+HOST = "127.0.0.1"
+PORTA = 8765
+INTERVALO_POLLING = 2.0  # segundos
+MAX_JOBS_HISTORICO = 100
+MAX_LINHAS_LOG = 200
+
+ETAPAS = ["meta", "google", "hubspot"]
+# O blend lê os relatórios gerados por meta/google, então roda depois deles
+DEPENDENTES = {"meta": ["meta", "hubspot"], "google": ["google", "hubspot"], "hubspot": ["hubspot"]}
+
+
+class SaidaJob(io.TextIOBase):
+    """Escreve no terminal do serviço e guarda as últimas linhas no log do job."""
+
+    def __init__(self, terminal, linhas: list):
+        self.terminal = terminal
+        self.linhas = linhas
+        self._parcial = ""
+
+    def write(self, texto):
+        self.terminal.write(texto)
+        self._parcial += texto
+        *completas, self._parcial = self._parcial.split("\n")
+        self.linhas.extend(completas)
+        del self.linhas[:-MAX_LINHAS_LOG]
+        return len(texto)
+
+    def flush(self):
+        self.terminal.flush()
+
+
+class SaidaPorThread(io.TextIOBase):
+    """
+    Substituto de sys.stdout/sys.stderr: cada thread escreve no destino que
+    registrou com redirecionar() (a SaidaJob do job) ou, sem destino, no terminal.
+    """
+
+    def __init__(self, terminal):
+        self.terminal = terminal
+        self.local = threading.local()
+
+    def destino(self):
+        return getattr(self.local, "saida", None) or self.terminal
+
+    def write(self, texto):
+        return self.destino().write(texto)
+
+    def flush(self):
+        self.destino().flush()
+
+    @property
+    def encoding(self):
+        return self.terminal.encoding
+
+    def isatty(self):
+        return self.terminal.isatty()
+
+    def fileno(self):
+        return self.terminal.fileno()
+
+    @contextlib.contextmanager
+    def redirecionar(self, saida):
+        """Só a thread atual passa a escrever em saida até o fim do bloco."""
+        anterior = getattr(self.local, "saida", None)
+        self.local.saida = saida
+        try:
+            yield saida
+        finally:
+            self.local.saida = anterior
+
+
+def saidas_por_thread() -> tuple:
+    """Instala (uma vez) o SaidaPorThread em sys.stdout e sys.stderr e devolve os dois."""
+    if not isinstance(sys.stdout, SaidaPorThread):
+        sys.stdout = SaidaPorThread(sys.stdout)
+    if not isinstance(sys.stderr, SaidaPorThread):
+        sys.stderr = SaidaPorThread(sys.stderr)
+    return sys.stdout, sys.stderr
+
+
+class Servico:
+    def __init__(self, argumentos_etapas: dict):
+        self.argumentos_etapas = argumentos_etapas
+        self.fila = queue.Queue()
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.job_atual = None
+        self.parar = threading.Event()
+        self.modulos = {}
+        self.datas = None
+
+    # --- Aquecimento ---
+
+    def aquecer(self):
+        """Importa bibliotecas e scripts uma vez; as execuções seguintes não pagam esse custo."""
+        inicio = time.perf_counter()
+        import openpyxl  # noqa: F401  (usado pelo pandas na leitura/escrita de xlsx)
+        import cache_etapas
+        import datas
+        import analise_performance_google
+        import analise_performance_hubspot
+        import analise_performance_meta_teste
+
+        cache_etapas.ativar_memoria()
+        self.datas = datas
+        self.modulos = {
+            "meta": analise_performance_meta_teste,
+            "google": analise_performance_google,
+            "hubspot": analise_performance_hubspot,
+        }
+        print(f"🔥 Interpretador aquecido em {time.perf_counter() - inicio:.2f}s")
+
+    def arquivos_observados(self) -> dict:
+        """Export de entrada de cada etapa (caminhos absolutos)."""
+        return {
+            (BASE_DIR / self.modulos["meta"].FILE_PATH).resolve(): "meta",
+            (BASE_DIR / self.modulos["google"].FILE_PATH).resolve(): "google",
+            Path(self.modulos["hubspot"].HUBSPOT_FILE).resolve(): "hubspot",
+        }
+
+    # --- Fila ---
+
+    def enfileirar(self, etapa: str, origem: str) -> list:
+        etapas = ETAPAS if etapa == "todos" else [etapa]
+        criados = []
+        with self.lock:
+            for nome in etapas:
+                for job in self.jobs.values():
+                    if job["etapa"] == nome and job["status"] == "na_fila":
+                        job["status"] = "cancelado"
+                        job["erro"] = "substituído por um job mais novo"
+                job = {
+                    "id": next(self.ids),
+                    "etapa": nome,
+                    "origem": origem,
+                    "status": "na_fila",
+                    "criado_em": datetime.now().isoformat(timespec="seconds"),
+                    "inicio": None,
+                    "fim": None,
+                    "duracao_s": None,
+                    "erro": None,
+                    "log": [],
+                }
+                self.jobs[job["id"]] = job
+                criados.append(job)
+                self.fila.put(job["id"])
+            for antigo in sorted(self.jobs)[:-MAX_JOBS_HISTORICO]:
+                if self.jobs[antigo]["status"] not in ("na_fila", "executando"):
+                    del self.jobs[antigo]
+        for job in criados:
+            print(f"📥 Job {job['id']} ({job['etapa']}) enfileirado via {origem}")
+        return [self.resumo(job) for job in criados]
+
+    def executar_job(self, job: dict):
+        modulo = self.modulos[job["etapa"]]
+        job["status"] = "executando"
+        job["inicio"] = datetime.now().isoformat(timespec="seconds")
+        self.job_atual = job["id"]
+        inicio = time.perf_counter()
+        stdout, stderr = saidas_por_thread()
+        # Conversões de datas de jobs anteriores não entram no relatório deste
+        self.datas.RELATORIO_DATAS.clear()
+        try:
+            with stdout.redirecionar(SaidaJob(stdout.terminal, job["log"])), \
+                    stderr.redirecionar(SaidaJob(stderr.terminal, job["log"])):
+                modulo.main(self.argumentos_etapas.get(job["etapa"], []))
+            job["status"] = "ok"
+        except SystemExit as e:
+            # Os scripts usam sys.exit(1) nos erros de entrada/saída
+            job["status"] = "ok" if e.code in (0, None) else "erro"
+            if job["status"] == "erro":
+                job["erro"] = f"sys.exit({e.code})"
+        except Exception as e:
+            job["status"] = "erro"
+            job["erro"] = repr(e)
+            job["log"].extend(traceback.format_exc().splitlines()[-20:])
+        finally:
+            job["duracao_s"] = round(time.perf_counter() - inicio, 2)
+            job["fim"] = datetime.now().isoformat(timespec="seconds")
+            self.job_atual = None
+        simbolo = "✅" if job["status"] == "ok" else "❌"
+        print(f"{simbolo} Job {job['id']} ({job['etapa']}) {job['status']} em {job['duracao_s']}s")
+
+    def worker(self):
+        while not self.parar.is_set():
+            try:
+                job_id = self.fila.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            job = self.jobs.get(job_id)
+            if job is not None and job["status"] == "na_fila":
+                self.executar_job(job)
+            self.fila.task_done()
+
+    # --- Observador de data/ ---
+
+    def observar(self, intervalo: float):
+        """
+        Polling de mtime/tamanho dos exports. Um arquivo só dispara o refresh
+        quando a assinatura nova se repete na rodada seguinte (export terminou
+        de ser gravado).
+        """
+        arquivos = self.arquivos_observados()
+        vistos = {path: assinatura(path) for path in arquivos}
+        pendentes = {}
+        for path in arquivos:
+            print(f"👀 Observando {path}")
+
+        while not self.parar.wait(intervalo):
+            for path, etapa in arquivos.items():
+                atual = assinatura(path)
+                if atual == vistos[path]:
+                    pendentes.pop(path, None)
+                    continue
+                if pendentes.get(path) != atual:
+                    pendentes[path] = atual
+                    continue
+                vistos[path] = atual
+                pendentes.pop(path, None)
+                if atual is None:
+                    print(f"⚠️  {path.name} removido; nada a fazer")
+                    continue
+                print(f"🆕 Novo export detectado: {path.name}")
+                for dependente in DEPENDENTES[etapa]:
+                    self.enfileirar(dependente, origem="observador")
+
+    # --- Consulta ---
+
+    def resumo(self, job: dict) -> dict:
+        return {k: v for k, v in job.items() if k != "log"}
+
+    def status(self) -> dict:
+        import cache_etapas
+        with self.lock:
+            na_fila = [j["id"] for j in self.jobs.values() if j["status"] == "na_fila"]
+        return {
+            "pid": os.getpid(),
+            "job_atual": self.job_atual,
+            "na_fila": na_fila,
+            "etapas_em_memoria": cache_etapas.etapas_em_memoria(),
+            "observando": [str(p) for p in self.arquivos_observados()],
+        }
+
+    def listar_jobs(self) -> list:
+        with self.lock:
+            return [self.resumo(j) for j in sorted(self.jobs.values(), key=lambda j: -j["id"])]
+
+    def detalhar_job(self, job_id: int):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return None if job is None else dict(job, log=list(job["log"][-50:]))
+
+
+def assinatura(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# =====================================================================
+# --- API HTTP ---
+# =====================================================================
+
+def criar_handler(servico: Servico):
+    class Handler(BaseHTTPRequestHandler):
+        def responder(self, codigo: int, corpo):
+            dados = json.dumps(corpo, ensure_ascii=False, indent=2).encode("utf-8")
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def partes(self) -> list:
+            return [p for p in self.path.split("?")[0].split("/") if p]
+
+        def do_GET(self):
+            partes = self.partes()
+            if partes == ["status"]:
+                return self.responder(200, servico.status())
+            if partes == ["jobs"]:
+                return self.responder(200, servico.listar_jobs())
+            if len(partes) == 2 and partes[0] == "jobs" and partes[1].isdigit():
+                job = servico.detalhar_job(int(partes[1]))
+                if job is None:
+                    return self.responder(404, {"erro": f"job {partes[1]} não encontrado"})
+                return self.responder(200, job)
+            self.responder(404, {"erro": "rota não encontrada"})
+
+        def do_POST(self):
+            partes = self.partes()
+            if len(partes) == 2 and partes[0] == "jobs":
+                if partes[1] not in ETAPAS + ["todos"]:
+                    return self.responder(400, {"erro": f"etapa inválida: {partes[1]}", "etapas": ETAPAS + ["todos"]})
+                return self.responder(202, servico.enfileirar(partes[1], origem="api"))
+            self.responder(404, {"erro": "rota não encontrada"})
+
+        def log_message(self, formato, *args):
+            # O terminal do serviço fica só com o log dos jobs
+            pass
+
+    return Handler
+
+
+class ServidorUnix(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def criar_servidor(servico: Servico, socket_path: Path = None, host: str = HOST, porta: int = PORTA):
+    handler = criar_handler(servico)
+    if socket_path is None:
+        return ThreadingHTTPServer((host, porta), handler), f"http://{host}:{porta}"
+    if not hasattr(socketserver, "UnixStreamServer"):
+        print("❌ ERRO: Unix socket não disponível neste sistema. Use --porta.")
+        sys.exit(1)
+    socket_path.unlink(missing_ok=True)
+    servidor = ServidorUnix(str(socket_path), handler)
+    os.chmod(socket_path, 0o600)
+    return servidor, f"unix:{socket_path}"
+
+
+def _encerrar(signum, frame):
+    # SIGTERM (kill, systemd, Agendador de Tarefas) encerra como o Ctrl+C
+    raise KeyboardInterrupt
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço local do pipeline (fila de jobs + observador de data/ + API).")
+    parser.add_argument("--porta", type=int, default=PORTA, help=f"Porta HTTP em {HOST}. Padrão: {PORTA}.")
+    parser.add_argument("--socket", type=Path, help="Escuta em um Unix socket em vez de TCP.")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_POLLING, help="Intervalo do polling de data/ em segundos.")
+    parser.add_argument("--sem-observador", dest="observador", action="store_false", help="Não observa data/ (só API).")
+    parser.add_argument("--aquecer", action="store_true", help="Enfileira 'todos' ao iniciar (carrega as etapas na memória).")
+    parser.add_argument("--engine-exports", choices=["pandas", "polars"], default="pandas", help="Engine de Meta/Google.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("=" * 80)
+    print("🛰️  SERVIÇO DO PIPELINE - Meta / Google / HubSpot")
+    print("=" * 80)
+
+    # Os scripts de Meta/Google usam caminhos relativos à raiz do projeto
+    os.chdir(BASE_DIR)
+    saidas_por_thread()
+    servico = Servico({
+        "meta": ["--engine", args.engine_exports],
+        "google": ["--engine", args.engine_exports],
+        "hubspot": [],
+    })
+    servico.aquecer()
+
+    servidor, endereco = criar_servidor(servico, args.socket, porta=args.porta)
+    threading.Thread(target=servico.worker, name="worker", daemon=True).start()
+    if args.observador:
+        threading.Thread(target=servico.observar, args=(args.intervalo,), name="observador", daemon=True).start()
+    if args.aquecer:
+        servico.enfileirar("todos", origem="inicialização")
+
+    signal.signal(signal.SIGTERM, _encerrar)
+    print(f"🌐 API ouvindo em {endereco} (Ctrl+C para encerrar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Encerrando serviço...")
+    finally:
+        servico.parar.set()
+        servidor.server_close()
+        if args.socket is not None:
+            args.socket.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
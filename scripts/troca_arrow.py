@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+troca_arrow.py
+
+Troca de DataFrames entre etapas por arquivos Arrow IPC abertos com memory
+map, em vez de reler as abas do xlsx.
+
+Cada etapa que grava uma aba consumida por outra etapa grava também um
+arquivo ao lado do xlsx:
+
+    outputs/meta_dataset_dashboard.xlsx   -> outputs/meta_dataset_dashboard.Meta_Completo.arrow
+    outputs/google_dashboard.xlsx         -> outputs/google_dashboard.Google_Completo.arrow
+    output/dataset_geral_melhorado_*.xlsx -> output/dataset_geral_melhorado_*.Visao_Granular_Final.arrow
+
+O arquivo é Arrow IPC sem compressão, então abrir() mapeia o arquivo na
+memória e as colunas apontam direto para as páginas do arquivo: nada é
+copiado nem desserializado, e vários leitores (validação, KPIs, funil) em
+processos diferentes compartilham as mesmas páginas do cache do sistema.
+ler_df() converte para pandas (colunas numéricas sem nulos saem sem cópia;
+texto é sempre copiado).
+
+O leitor só usa o .arrow se ele for mais novo que o xlsx (atual()); caso
+contrário lê o xlsx como antes. Sem pyarrow, nada é gravado e tudo segue pelo
+xlsx.
+
+Uso:
+    python scripts/benchmark_arrow.py --linhas 300000   # tempo e RSS: xlsx x Arrow
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+from pathlib import Path
+
+from importacao_tardia import importar_tardio
+
+pd = importar_tardio("pandas")
+
+SUFIXO = ".arrow"
+_AVISO_SEM_PYARROW = []
+
+
+def disponivel() -> bool:
+    if importlib.util.find_spec("pyarrow") is not None:
+        return True
+    if not _AVISO_SEM_PYARROW:
+        _AVISO_SEM_PYARROW.append(True)
+        print("    ℹ️  pyarrow não instalado: troca entre etapas segue pelo xlsx (pip install pyarrow)")
+    return False
+
+
+def caminho(xlsx: Path, aba: str) -> Path:
+    """Arquivo Arrow da aba, ao lado do xlsx."""
+    xlsx = Path(xlsx)
+    return xlsx.with_name(f"{xlsx.stem}.{aba}{SUFIXO}")
+
+
+def atual(arrow: Path, xlsx: Path) -> bool:
+    """O .arrow existe e não é mais velho que o xlsx da mesma aba."""
+    arrow, xlsx = Path(arrow), Path(xlsx)
+    if not arrow.exists():
+        return False
+    return not xlsx.exists() or arrow.stat().st_mtime >= xlsx.stat().st_mtime
+
+
+def salvar(df: pd.DataFrame, xlsx: Path, aba: str) -> Path:
+    """Grava a aba como Arrow IPC (sem compressão) ao lado do xlsx. Retorna o caminho ou None."""
+    if not disponivel():
+        return None
+    import pyarrow as pa
+
+    path = caminho(xlsx, aba)
+    try:
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        # Coluna com tipos misturados: a etapa seguinte lê o xlsx
+        print(f"    ⚠️  '{aba}' não convertida para Arrow ({e}); seguindo só com o xlsx")
+        return None
+
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, tabela.schema) as writer:
+        writer.write_table(tabela)
+    os.replace(tmp, path)
+    print(f"    ✅ Aba '{aba}' também salva em Arrow: {path.name}")
+    return path
+
+
+def abrir(path: Path):
+    """pyarrow.Table mapeada do arquivo (sem cópia)."""
+    import pyarrow as pa
+
+    with pa.memory_map(str(path), "r") as fonte:
+        return pa.ipc.open_file(fonte).read_all()
+
+
+def ler_df(path: Path) -> pd.DataFrame:
+    """DataFrame a partir do arquivo mapeado."""
+    return abrir(path).to_pandas(split_blocks=True)
+
+
+def ler_aba(xlsx: Path, aba: str, ler_xlsx) -> pd.DataFrame:
+    """Lê a aba pelo .arrow se estiver atualizado; senão chama ler_xlsx()."""
+    arrow = caminho(xlsx, aba)
+    if atual(arrow, xlsx) and disponivel():
+        print(f"    ⚡ Lendo '{aba}' do Arrow (memory map): {arrow.name}")
+        return ler_df(arrow)
+    return ler_xlsx()
+
+
+def linhas(path: Path, resolver, tamanho_lote: int = 65_536):
+    """
+    Gera as linhas com só as colunas pedidas, em lotes, sem pandas (mesmo contrato de
+    validar_investimentos.linhas_xlsx: resolver(cabeçalho) -> índices, None = ausente).
+    """
+    tabela = abrir(path)
+    indices = resolver(tabela.column_names)
+    if None in indices:
+        raise KeyError(f"colunas não encontradas em {Path(path).name}")
+    for lote in tabela.select(indices).to_batches(max_chunksize=tamanho_lote):
+        yield from zip(*(coluna.to_pylist() for coluna in lote.columns))
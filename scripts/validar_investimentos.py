@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+validar_investimentos.py
+
+Confere o investimento das plataformas (relatórios Meta/Google) contra a
+mídia paga atribuída no blend (Midia_Paga da Visao_Granular_Final), por mês,
+por dia e por campanha.
+
+As planilhas são lidas em streaming (openpyxl read_only, só as colunas
+usadas, linha a linha) e somadas em dicionários: nem o xlsx granular nem os
+relatórios das plataformas são carregados inteiros, e o pandas não é
+importado. O blend também pode vir do esquema estrela (pasta *_estrela, ver
+saida_estrela.py), lido em lotes. Se houver o .arrow atualizado de uma aba
+(troca_arrow.py), ela é lida do arquivo mapeado em vez do xlsx.
+
+O lado das plataformas não usa a escolha de colunas do blend (find_col com
+as palavras-chave das regras): as colunas vêm de como os scripts do Meta e do
+Google gravam as abas *_Completo (Data_Datetime e a coluna numérica de
+investimento). Assim um find_col que pegue a coluna errada no blend aparece
+como diferença em vez de se repetir dos dois lados. O total de cada *_Completo
+também é conferido contra a aba *_YoY do mesmo relatório (agregado diário
+gravado pelo script da plataforma): relatório zerado com YoY cheio falha.
+
+Chaves de campanha: as mesmas do merge do blend (clean_text da campanha na
+plataforma x clean_text do Detalhamento 1 (Meta) / 2 (Google) no HubSpot).
+Investimento em dias/campanhas sem negócio não é atribuído pelo blend, então
+aparece como diferença; o blend acima da plataforma indica duplicação.
+
+Uma diferença é sinalizada quando |plataforma - blend| passa de
+max(TOLERANCIA_ABSOLUTA, TOLERANCIA_RELATIVA * plataforma). O código de saída
+é 1 se houver diferença sinalizada no nível de --bloquear (padrão: mensal),
+para a validação poder barrar o refresh.
+
+Uso:
+    python scripts/validar_investimentos.py
+    python scripts/validar_investimentos.py --blend output/dataset_geral_melhorado_20250101_120000.xlsx
+    python scripts/validar_investimentos.py --tolerancia 0.02 --bloquear diario
+    python scripts/analise_performance_hubspot.py --validar   # valida logo após o blend
+"""
+
+import argparse
+import csv
+import gzip
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+import analise_performance_hubspot as blend
+import analise_performance_meta_teste as meta
+
+TOLERANCIA_RELATIVA = 0.05
+TOLERANCIA_ABSOLUTA = 1.0  # R$
+NIVEIS = ['mensal', 'diario', 'campanha']
+MAX_LINHAS_TELA = 10
+
+# Gravado na pasta de saída do blend
+RELATORIO_NOME = "validacao_investimentos.csv"
+
+# Plataforma -> (relatório, aba, detalhamento com a campanha).
+# O canal de cada plataforma no blend vem das regras (blend.CANAL_PLATAFORMA).
+PLATAFORMAS = {
+    'meta': ('META_REPORT_FILE', 'META_SHEET_NAME', 'Detalhamento_fonte_original_1'),
+    'google': ('GOOGLE_REPORT_FILE', 'GOOGLE_SHEET_NAME', 'Detalhamento_fonte_original_2'),
+}
+# Colunas da aba *_Completo como os scripts das plataformas gravam (nomes exatos, em
+# ordem de prioridade): data convertida, investimento já numérico (parse_number) e campanha
+COLUNAS_PLATAFORMA = {
+    'meta': {'data': ['Data_Datetime'], 'investimento': meta.POSSIVEIS_NOMES_INVEST,
+             'campanha': meta.POSSIVEIS_NOMES_CAMPANHA},
+    'google': {'data': ['Data_Datetime'], 'investimento': ['Investimento_Google'], 'campanha': ['Nome_Campanha']},
+}
+# Plataforma -> (aba diária, coluna de investimento) gravadas pelo script da plataforma
+ABAS_YOY = {'meta': ('Meta_YoY', 'Investimento'), 'google': ('Google_YoY', 'Investimento_Google')}
+COLUNAS_BLEND = ['Data', 'Midia_Paga', 'Origem_Principal', 'Detalhamento_fonte_original_1', 'Detalhamento_fonte_original_2']
+
+
+class Totais:
+    """Somas por mês, dia e campanha."""
+
+    def __init__(self):
+        self.niveis = {nivel: defaultdict(float) for nivel in NIVEIS}
+        self.linhas = 0
+
+    def somar(self, dia: date, campanha: str, valor: float):
+        self.linhas += 1
+        if dia is None or not valor:
+            return
+        self.niveis['mensal'][f"{dia:%Y-%m}"] += valor
+        self.niveis['diario'][dia.isoformat()] += valor
+        self.niveis['campanha'][campanha] += valor
+
+    def total(self) -> float:
+        return sum(self.niveis['mensal'].values())
+
+
+# =====================================================================
+# --- Conversões (mesmo resultado do pandas no blend) ---
+# =====================================================================
+
+@lru_cache(maxsize=None)
+def chave_campanha(valor) -> str:
+    """clean_text do blend, calculado uma vez por valor distinto."""
+    return blend.clean_text(blend.DEFAULT_NA_TEXT if valor is None else valor)
+
+
+def para_data(valor):
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return _data_texto(str(valor).strip()) if valor is not None else None
+
+
+@lru_cache(maxsize=4096)
+def _data_texto(texto: str):
+    for formato in ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%d/%m/%Y', '%d/%m/%Y %H:%M:%S'):
+        try:
+            return datetime.strptime(texto, formato).date()
+        except ValueError:
+            continue
+    return None
+
+
+def para_numero(valor) -> float:
+    """Como pd.to_numeric(errors='coerce').fillna(0)."""
+    if isinstance(valor, (int, float)):
+        return float(valor) if valor == valor else 0.0
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# =====================================================================
+# --- Leitura em streaming ---
+# =====================================================================
+
+def linhas_xlsx(path: Path, aba: str, resolver):
+    """
+    Gera as linhas da aba com só as colunas pedidas.
+    resolver(colunas do cabeçalho) -> lista de índices (None = coluna ausente).
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[aba]
+        cabecalho = list(next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ()))
+        indices = resolver(cabecalho)
+        if None in indices:
+            raise KeyError(f"colunas não encontradas na aba '{aba}' de {path.name}")
+        ultimo = max(indices) + 1
+        for linha in ws.iter_rows(min_row=2, max_col=ultimo, values_only=True):
+            yield [linha[i] if i < len(linha) else None for i in indices]
+    finally:
+        wb.close()
+
+
+def linhas_aba(path: Path, aba: str, resolver):
+    """Linhas da aba pelo Arrow mapeado ao lado do xlsx, se estiver atualizado (ver troca_arrow.py)."""
+    import troca_arrow
+
+    arrow = troca_arrow.caminho(path, aba)
+    if troca_arrow.atual(arrow, path) and troca_arrow.disponivel():
+        return troca_arrow.linhas(arrow, resolver)
+    return linhas_xlsx(path, aba, resolver)
+
+
+def resolver_nomes(colunas: dict, campos: tuple = ('data', 'investimento', 'campanha')):
+    """resolver(cabeçalho) -> índice do primeiro nome exato de cada campo (None = ausente)."""
+    def resolver(cabecalho):
+        cabecalho = [str(c) for c in cabecalho]
+        return [next((cabecalho.index(n) for n in colunas[campo] if n in cabecalho), None) for campo in campos]
+    return resolver
+
+
+def totais_plataforma(plataforma: str) -> Totais:
+    atributo_arquivo, atributo_aba, _ = PLATAFORMAS[plataforma]
+    path = getattr(blend, atributo_arquivo)
+    # Colunas do script da plataforma, não o find_col do blend (ver docstring)
+    resolver = resolver_nomes(COLUNAS_PLATAFORMA[plataforma])
+
+    totais = Totais()
+    for dia, valor, campanha in linhas_aba(path, getattr(blend, atributo_aba), resolver):
+        totais.somar(para_data(dia), chave_campanha(campanha), para_numero(valor))
+    return totais
+
+
+def total_yoy(plataforma: str):
+    """Soma do investimento da aba *_YoY do relatório (None se a aba ou a coluna não existir)."""
+    aba, coluna = ABAS_YOY[plataforma]
+    resolver = resolver_nomes({'data': ['Data'], 'investimento': [coluna]}, ('data', 'investimento'))
+    try:
+        return sum(para_numero(valor) for _, valor in linhas_aba(getattr(blend, PLATAFORMAS[plataforma][0]), aba, resolver))
+    except KeyError:
+        return None
+
+
+def totais_blend_xlsx(path: Path) -> dict:
+    def resolver(cabecalho):
+        return [cabecalho.index(c) if c in cabecalho else None for c in COLUNAS_BLEND]
+
+    totais = {p: Totais() for p in PLATAFORMAS}
+    por_canal = {blend.CANAL_PLATAFORMA[p]: (p, COLUNAS_BLEND.index(coluna)) for p, (_, _, coluna) in PLATAFORMAS.items()}
+    for linha in linhas_aba(path, 'Visao_Granular_Final', resolver):
+        canal = por_canal.get(linha[2])
+        if canal is not None:
+            plataforma, i_campanha = canal
+            totais[plataforma].somar(para_data(linha[0]), chave_campanha(linha[i_campanha]), para_numero(linha[1]))
+    return totais
+
+
+def _linhas_tabela(pasta: Path, nome: str, colunas: list):
+    """Linhas de uma tabela do esquema estrela (csv.gz linha a linha, parquet em lotes)."""
+    parquet = pasta / f"{nome}.parquet"
+    if parquet.exists():
+        import pyarrow.parquet as pq
+
+        for lote in pq.ParquetFile(parquet).iter_batches(columns=colunas):
+            yield from zip(*(lote.column(c).to_pylist() for c in colunas))
+        return
+    with gzip.open(pasta / f"{nome}.csv.gz", "rt", encoding="utf-8", newline="") as f:
+        for registro in csv.DictReader(f):
+            yield tuple(registro[c] for c in colunas)
+
+
+def totais_blend_estrela(pasta: Path) -> dict:
+    import saida_estrela
+
+    chave_canal, _ = saida_estrela.DIMENSOES['dim_canal']
+    canais = {str(id_): origem for id_, origem in _linhas_tabela(pasta, 'dim_canal', [chave_canal, 'Origem_Principal'])}
+
+    # Detalhamento com a campanha -> (dimensão, chave na fato)
+    dim_por_coluna = {colunas[0]: (nome, chave) for nome, (chave, colunas) in saida_estrela.DIMENSOES.items()
+                      if len(colunas) == 1}
+    por_canal, chaves_camp = {}, []
+    for plataforma, (_, _, coluna) in PLATAFORMAS.items():
+        nome_dim, chave = dim_por_coluna[coluna]
+        campanhas = {str(id_): valor for id_, valor in _linhas_tabela(pasta, nome_dim, [chave, coluna])}
+        por_canal[blend.CANAL_PLATAFORMA[plataforma]] = (plataforma, len(chaves_camp), campanhas)
+        chaves_camp.append(chave)
+
+    totais = {p: Totais() for p in PLATAFORMAS}
+    colunas_fato = ['Data', 'Midia_Paga', chave_canal] + chaves_camp
+    for dia, valor, id_canal, *ids_camp in _linhas_tabela(pasta, saida_estrela.TABELA_FATO, colunas_fato):
+        canal = por_canal.get(canais.get(str(id_canal)))
+        if canal is not None:
+            plataforma, i_campanha, campanhas = canal
+            campanha = campanhas[str(ids_camp[i_campanha])]
+            totais[plataforma].somar(para_data(dia), chave_campanha(campanha), para_numero(valor))
+    return totais
+
+
+def blend_mais_recente() -> Path:
+    """Último blend gerado em output/ (xlsx ou pasta do esquema estrela)."""
+    candidatos = [p for p in blend.OUTPUT_DIR.glob(f"{blend.BLEND_BASE_NAME}_*")
+                  if p.suffix == '.xlsx' or (p.is_dir() and p.name.endswith('_estrela'))]
+    if not candidatos:
+        return None
+    return max(candidatos, key=lambda p: p.stat().st_mtime)
+
+
+# =====================================================================
+# --- Comparação ---
+# =====================================================================
+
+def comparar(plataforma: str, nivel: str, esperado: dict, atribuido: dict,
+             tolerancia: float, tolerancia_abs: float) -> list:
+    linhas = []
+    for chave in sorted(set(esperado) | set(atribuido)):
+        valor_plataforma = esperado.get(chave, 0.0)
+        valor_blend = atribuido.get(chave, 0.0)
+        diferenca = valor_plataforma - valor_blend
+        limite = max(tolerancia_abs, tolerancia * abs(valor_plataforma))
+        linhas.append({
+            'Plataforma': plataforma,
+            'Nivel': nivel,
+            'Chave': chave,
+            'Investimento_Plataforma': round(valor_plataforma, 2),
+            'Midia_Paga_Blend': round(valor_blend, 2),
+            'Diferenca': round(diferenca, 2),
+            'Fora_Tolerancia': abs(diferenca) > limite,
+        })
+    return linhas
+
+
+def salvar_relatorio(linhas: list, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(linhas[0]) if linhas else ['Plataforma'])
+        writer.writeheader()
+        writer.writerows(linhas)
+
+
+def _brl(valor: float) -> str:
+    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def validar(path_blend: Path = None, tolerancia: float = TOLERANCIA_RELATIVA,
+            tolerancia_abs: float = TOLERANCIA_ABSOLUTA, bloquear: str = 'mensal') -> int:
+    """Roda a validação e retorna o código de saída (0 ok, 1 diferença no nível 'bloquear' ou erro)."""
+    inicio = time.perf_counter()
+    path_blend = Path(path_blend) if path_blend else blend_mais_recente()
+    if path_blend is None or not path_blend.exists():
+        print(f"❌ ERRO: Nenhum blend encontrado em {blend.OUTPUT_DIR} (rode o script do HubSpot antes).")
+        return 1
+
+    print(f"\n🔎 Validando investimento: plataformas x blend ({path_blend.name})")
+    try:
+        atribuido = totais_blend_estrela(path_blend) if path_blend.is_dir() else totais_blend_xlsx(path_blend)
+    except (KeyError, OSError) as e:
+        print(f"❌ ERRO ao ler o blend: {e}")
+        return 1
+
+    linhas, erros_yoy = [], []
+    for plataforma in PLATAFORMAS:
+        path = getattr(blend, PLATAFORMAS[plataforma][0])
+        if not path.exists():
+            print(f"    ⚠️  {plataforma}: relatório {path.name} não encontrado, pulando")
+            continue
+        try:
+            esperado = totais_plataforma(plataforma)
+        except (KeyError, OSError) as e:
+            print(f"❌ ERRO ao ler o relatório de {plataforma}: {e}")
+            return 1
+
+        total, total_blend = esperado.total(), atribuido[plataforma].total()
+        cobertura = total_blend / total if total else 0.0
+        print(f"\n    📊 {plataforma}: plataforma {_brl(total)} | blend {_brl(total_blend)} ({cobertura:.1%} atribuído)")
+
+        # O relatório granular precisa bater com o diário que a própria plataforma gravou
+        yoy = total_yoy(plataforma)
+        if yoy is None:
+            print(f"       ⚠️  aba {ABAS_YOY[plataforma][0]} sem a coluna de investimento, total do relatório não conferido")
+        elif abs(total - yoy) > max(tolerancia_abs, tolerancia * abs(yoy)):
+            motivo = "relatório zerado" if not total else "total diferente"
+            print(f"       ❌ {motivo}: {getattr(blend, PLATAFORMAS[plataforma][1])} {_brl(total)} "
+                  f"x {ABAS_YOY[plataforma][0]} {_brl(yoy)}")
+            erros_yoy.append(plataforma)
+        for nivel in NIVEIS:
+            comparadas = comparar(plataforma, nivel, esperado.niveis[nivel], atribuido[plataforma].niveis[nivel],
+                                  tolerancia, tolerancia_abs)
+            fora = [l for l in comparadas if l['Fora_Tolerancia']]
+            simbolo = "✅" if not fora else ("❌" if nivel == bloquear else "⚠️ ")
+            print(f"       {simbolo} {nivel:<9} {len(comparadas):>6} chaves, {len(fora)} fora da tolerância")
+            if nivel == bloquear:
+                for l in sorted(fora, key=lambda l: -abs(l['Diferenca']))[:MAX_LINHAS_TELA]:
+                    print(f"          {l['Chave']}: plataforma {_brl(l['Investimento_Plataforma'])}"
+                          f" | blend {_brl(l['Midia_Paga_Blend'])} | diferença {_brl(l['Diferenca'])}")
+            linhas.extend(comparadas)
+
+    relatorio = blend.OUTPUT_DIR / RELATORIO_NOME
+    salvar_relatorio(linhas, relatorio)
+    bloqueantes = [l for l in linhas if l['Nivel'] == bloquear and l['Fora_Tolerancia']]
+    print(f"\n    📄 Detalhe por chave: {relatorio}")
+    print(f"    ⏱️  Validação em {time.perf_counter() - inicio:.2f}s "
+          f"(tolerância: {tolerancia:.1%} ou {_brl(tolerancia_abs)}, bloqueia no nível '{bloquear}')")
+    if erros_yoy:
+        print(f"❌ Relatório granular não bate com a aba YoY: {', '.join(erros_yoy)} (coluna de investimento errada ou vazia?)")
+        return 1
+    if bloqueantes:
+        print(f"❌ {len(bloqueantes)} diferenças de investimento no nível '{bloquear}' acima da tolerância.")
+        return 1
+    print("✅ Investimento do blend consistente com as plataformas.")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Valida o investimento Meta/Google contra a mídia paga do blend.")
+    parser.add_argument("--blend", type=Path, help="xlsx do blend ou pasta *_estrela. Padrão: o mais recente em output/.")
+    parser.add_argument(
+        "--tolerancia", type=float, default=TOLERANCIA_RELATIVA,
+        help=f"Diferença relativa aceita (fração do investimento). Padrão: {TOLERANCIA_RELATIVA}."
+    )
+    parser.add_argument(
+        "--tolerancia-abs", type=float, default=TOLERANCIA_ABSOLUTA,
+        help=f"Diferença absoluta aceita em R$ (evita alarmes em valores pequenos). Padrão: {TOLERANCIA_ABSOLUTA}."
+    )
+    parser.add_argument(
+        "--bloquear", choices=NIVEIS, default="mensal",
+        help="Nível em que uma diferença faz a validação falhar (código 1). Padrão: mensal."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sys.exit(validar(args.blend, args.tolerancia, args.tolerancia_abs, args.bloquear))
+
+
+if __name__ == "__main__":
+    main()